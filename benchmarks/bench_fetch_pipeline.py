@@ -0,0 +1,161 @@
+"""
+Offline benchmark for the fetch pipeline (NewsEngine.fetch_related_news).
+
+Google News, publishers and Mongo are replaced by local stand-ins: a fake
+GNews search, a local http server serving recorded article html
+(benchmarks/fixtures/articles, synthetic articles are generated when empty)
+and an in-memory mongo. The sentiment model defaults to a tiny randomly
+initialized BERT so the run needs no network; nltk punkt must be cached.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_fetch_pipeline.py --days 1 3 7 --per-day 20
+    python benchmarks/bench_fetch_pipeline.py --record urls.txt  # record real html fixtures
+"""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import argparse
+import asyncio
+import resource
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.common import (
+    FIXTURES,
+    ArticleServer,
+    FakeGNews,
+    StageTimer,
+    compose_cfg,
+    mock_mongo,
+    save_results,
+    tiny_model,
+)
+
+
+def record(url_file: str, directory: Path = FIXTURES / "articles") -> None:
+    """Download real article html once so later runs are offline."""
+    import requests
+
+    directory.mkdir(parents=True, exist_ok=True)
+    urls = [line.strip() for line in Path(url_file).read_text().splitlines() if line.strip()]
+    for i, url in enumerate(urls):
+        response = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        (directory / f"recorded-{i:03d}.html").write_text(response.text)
+        print(f"recorded {url}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    from newspaper import Article as ArticleNews
+
+    from src.engine.news_engine import NewsEngine
+    from src.schema.database.article_schema import GoogleNews
+
+    model = args.model or str(tiny_model())
+    # every repeat measures live searches
+    cfg = compose_cfg([f"engine.model.pretrained={model}", "engine.gnews.search_cache.enabled=false"])
+    engine = NewsEngine(cfg)
+    await mock_mongo()
+
+    timer = StageTimer()
+    originals = {
+        "download": ArticleNews.download,
+        "parse": ArticleNews.parse,
+        "nlp": ArticleNews.nlp,
+    }
+    if engine.scheduler.enabled:
+        # the scheduler downloads, newspaper only parses the html
+        engine.scheduler.fetch_html = timer.wrap("download", engine.scheduler.fetch_html)
+    else:
+        ArticleNews.download = timer.wrap("download", ArticleNews.download)
+    ArticleNews.parse = timer.wrap("parse", ArticleNews.parse)
+    ArticleNews.nlp = timer.wrap("nlp", ArticleNews.nlp)
+    engine.store = timer.wrap_async("store", engine.store)
+    engine.search = timer.wrap("search", engine.search)
+    engine.classify = timer.wrap("classify", engine.classify)
+
+    results = []
+    try:
+        with ArticleServer(latency=args.server_latency) as server:
+            engine.google_news = FakeGNews(server.urls(), latency=args.search_latency)
+            # queue workers call the pipeline steps without an open trace
+            untraced = await engine.canonicalize([{"url": url} for url in server.urls()[:2]])
+            assert [news["url"] for news in untraced] == server.urls()[:2], "canonicalize failed without a trace"
+            for days in args.days:
+                for repeat in range(args.repeat):
+                    await GoogleNews.delete_all()
+                    timer.stages.clear()
+                    start_date = date(2024, 1, 1)
+
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    news = await engine.fetch_related_news(
+                        query=args.query,
+                        limit_per_day=args.per_day,
+                        start_date=start_date,
+                        end_date=start_date + timedelta(days=days),
+                    )
+                    total = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    result = {
+                        "days": days,
+                        "per_day": args.per_day,
+                        "repeat": repeat,
+                        "articles": len(news),
+                        "seconds": round(total, 3),
+                        "articles_per_sec": round(len(news) / total, 3) if total else 0.0,
+                        "peak_traced_mb": round(peak / 2**20, 3),
+                        "max_rss_mb": round(
+                            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 3
+                        ),
+                        "stages": timer.summary(),
+                    }
+                    results.append(result)
+                    print(
+                        f"days={days} repeat={repeat} articles={result['articles']} "
+                        f"{result['articles_per_sec']} articles/s "
+                        f"peak={result['peak_traced_mb']}MB"
+                    )
+    finally:
+        ArticleNews.download = originals["download"]
+        ArticleNews.parse = originals["parse"]
+        ArticleNews.nlp = originals["nlp"]
+
+    params = {k: v for k, v in vars(args).items() if k != "record"}
+    params["model"] = model
+    path = save_results("fetch_pipeline", params, results, args.output)
+    print(f"results saved to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 3], help="range sizes in days")
+    parser.add_argument("--per-day", type=int, default=10, help="search results per day")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per range size")
+    parser.add_argument("--query", default="pilpres", help="search keyword")
+    parser.add_argument("--model", default=None, help="model path, defaults to a tiny random BERT")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="fake search delay (s)")
+    parser.add_argument("--server-latency", type=float, default=0.0, help="article server delay (s)")
+    parser.add_argument("--output", default=None, help="result json path")
+    parser.add_argument("--record", default=None, help="url file to record as html fixtures")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+HTTP load test for the FastAPI app built by src.api.main_api.create_app.
+
+Mongo is replaced by an in-memory mongo seeded with users and news, GNews
+by a fake search and newspaper by a canned article (or a local article
+server with --real-newspaper). Workers send login, register, list, detail
+and fetch requests in configurable ratios, using pre-issued JWTs, for each
+concurrency level, either in-process (ASGI transport) or over localhost.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_http_load.py --concurrency 1 8 32 --duration 10
+    python benchmarks/bench_http_load.py --transport localhost --mix list=5,detail=5,fetch=1
+"""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import argparse
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from benchmarks.common import (
+    ArticleServer,
+    FakeGNews,
+    MockMongodb,
+    compose_cfg,
+    save_results,
+    summarize,
+    synthetic_text,
+    tiny_model,
+)
+
+DEFAULT_MIX = "login=1,register=1,list=4,detail=10,fetch=1"
+PASSWORD = "superstrong"
+
+
+class RouteStats:
+    """Latency, status and error counters for a single route."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Dict[str, int] = defaultdict(int)
+
+    def record(self, elapsed_ms: float, status: str, ok: bool) -> None:
+        self.latencies.append(elapsed_ms)
+        self.statuses[status] += 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, seconds: float) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "rps": round(count / seconds, 3) if seconds else 0.0,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": dict(self.statuses),
+            "latency": summarize(self.latencies),
+        }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse route ratios.
+
+    Examples:
+        >>> parse_mix("list=4,detail=1")
+        {'list': 4.0, 'detail': 1.0}
+    """
+    ratios = {}
+    for item in mix.split(","):
+        route, ratio = item.split("=")
+        ratios[route.strip()] = float(ratio)
+    return ratios
+
+
+class LoadContext:
+    """Seeded users, tokens and news ids shared by the workers."""
+
+    def __init__(self, users: List[str], tokens: List[str], news_ids: List[str]) -> None:
+        self.users = users
+        self.tokens = tokens
+        self.news_ids = news_ids
+        self.counter = itertools.count()
+
+    def headers(self, rng: random.Random) -> dict:
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+
+async def request_login(client, ctx: LoadContext, rng: random.Random):
+    return await client.post(
+        "/api/user/login", data={"username": rng.choice(ctx.users), "password": PASSWORD}
+    )
+
+
+async def request_register(client, ctx: LoadContext, rng: random.Random):
+    username = f"load_{time.time_ns()}_{next(ctx.counter)}"
+    return await client.post(
+        "/api/user/register",
+        json={"username": username, "email": f"{username}@mail.com", "password": PASSWORD},
+    )
+
+
+async def request_list(client, ctx: LoadContext, rng: random.Random):
+    return await client.get("/api/news/list", headers=ctx.headers(rng))
+
+
+async def request_detail(client, ctx: LoadContext, rng: random.Random):
+    return await client.request(
+        "GET", "/api/news", data={"news_id": rng.choice(ctx.news_ids)}, headers=ctx.headers(rng)
+    )
+
+
+async def request_fetch(client, ctx: LoadContext, rng: random.Random):
+    day = date(2024, 1, 1) + timedelta(days=rng.randint(0, 30))
+    return await client.post(
+        "/api/news/fetch",
+        data={
+            "query": "pilpres",
+            "limit_per_day": 2,
+            "start_date": day.isoformat(),
+            "end_date": (day + timedelta(days=1)).isoformat(),
+        },
+        headers=ctx.headers(rng),
+    )
+
+
+ROUTES = {
+    "login": request_login,
+    "register": request_register,
+    "list": request_list,
+    "detail": request_detail,
+    "fetch": request_fetch,
+}
+
+
+async def seed(cfg, users: int, news: int, seed: int) -> LoadContext:
+    """Insert users and news into the in-memory mongo and issue tokens."""
+    from src.engine.news_engine import publisher_from_url
+    from src.schema.database.article_schema import Article, GoogleNews, Sentiment
+    from src.schema.user.user_schema import UserRegister
+    from src.utils.auth import Authentication
+
+    rng = random.Random(seed)
+    auth = Authentication(**cfg.api.auth.bearer)
+    password_hash = await auth.get_password_hash(PASSWORD)
+
+    usernames, tokens = [], []
+    for i in range(users):
+        username = f"user_{i}"
+        user = UserRegister(username=username, email=f"{username}@mail.com", password=password_hash)
+        await user.to_user_schema().insert()
+        usernames.append(username)
+        tokens.append(await auth.create_access_token(data={"sub": username}))
+
+    news_objs = []
+    for i in range(news):
+        url = f"http://publisher-{i % 10}.local/berita/{i}"
+        text = synthetic_text(rng, rng.randint(200, 600))
+        news_objs.append(
+            GoogleNews(
+                title=synthetic_text(rng, 8),
+                description=synthetic_text(rng, 20),
+                published_date=datetime(2024, 1, 1) + timedelta(days=i % 30),
+                url=url,
+                publisher=publisher_from_url(url),
+                article=Article(
+                    title=synthetic_text(rng, 8),
+                    text=text,
+                    summary=text[:300],
+                    keywords=["pilpres"],
+                    sentiment=rng.choice(list(Sentiment)),
+                ),
+            )
+        )
+    news_ids = []
+    for news_obj in news_objs:
+        await news_obj.insert()
+        news_ids.append(str(news_obj.id))
+    return LoadContext(usernames, tokens, news_ids)
+
+
+async def run_level(
+    client, ctx: LoadContext, mix: Dict[str, float], concurrency: int, duration: float, seed: int
+) -> dict:
+    """Run workers for duration seconds and summarize per route."""
+    stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+    routes, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            route = rng.choices(routes, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await ROUTES[route](client, ctx, rng)
+                status, ok = str(response.status_code), response.status_code < 400
+            except Exception as e:
+                status, ok = type(e).__name__, False
+            stats[route].record((time.perf_counter() - start) * 1000, status, ok)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    total = sum(len(s.latencies) for s in stats.values())
+    errors = sum(s.errors for s in stats.values())
+    return {
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "requests": total,
+        "rps": round(total / seconds, 3) if seconds else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "routes": {route: s.summary(seconds) for route, s in sorted(stats.items())},
+    }
+
+
+def stub_engine(app, server: ArticleServer = None) -> None:
+    """Replace GNews with a fake search and newspaper with a canned article."""
+    engine = app.state.pilpres_api.engine
+    if server is not None:
+        engine.google_news = FakeGNews(server.urls())
+        return
+
+    rng = random.Random(0)
+    text = synthetic_text(rng, 400)
+    engine.google_news = FakeGNews(["http://publisher.local/berita"])
+    # nothing to download, the canned article replaces the scrape
+    engine.scheduler.enabled = False
+    engine.scrape = lambda url, html=None: {
+        "title": "Berita pilpres",
+        "text": text,
+        "summary": text[:300],
+        "publish_date": None,
+        "keywords": ["pilpres"],
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+    import uvicorn
+
+    from src.api.main_api import create_app
+
+    cfg = compose_cfg(
+        [
+            f"engine.model.pretrained={args.model or tiny_model()}",
+            "api.auth.bearer.secret=load-test-secret",
+            "api.auth.basic.username=admin",
+            "api.auth.basic.password=admin",
+            f"api.port={args.port}",
+        ]
+    )
+    mix = parse_mix(args.mix)
+    app = create_app(cfg, mongodb=MockMongodb())
+
+    server = ArticleServer() if args.real_newspaper else None
+    if server is not None:
+        server.__enter__()
+    stub_engine(app, server)
+
+    results = []
+    try:
+        if args.transport == "inprocess":
+            async with app.router.lifespan_context(app):
+                ctx = await seed(cfg, args.users, args.news, args.seed)
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+                    for concurrency in args.concurrency:
+                        results.append(
+                            await run_level(client, ctx, mix, concurrency, args.duration, args.seed)
+                        )
+                        print_level(results[-1])
+        else:
+            uv_server = uvicorn.Server(
+                uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+            )
+            thread = threading.Thread(target=uv_server.run, daemon=True)
+            thread.start()
+            while not uv_server.started:
+                await asyncio.sleep(0.05)
+            try:
+                ctx = await seed(cfg, args.users, args.news, args.seed)
+                limits = httpx.Limits(max_connections=max(args.concurrency))
+                async with httpx.AsyncClient(
+                    base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60
+                ) as client:
+                    for concurrency in args.concurrency:
+                        results.append(
+                            await run_level(client, ctx, mix, concurrency, args.duration, args.seed)
+                        )
+                        print_level(results[-1])
+            finally:
+                uv_server.should_exit = True
+                thread.join()
+    finally:
+        if server is not None:
+            server.__exit__(None, None, None)
+
+    params = vars(args).copy()
+    path = save_results("http_load", params, results, args.output)
+    print(f"results saved to {path}")
+
+
+def print_level(result: dict) -> None:
+    print(
+        f"concurrency={result['concurrency']:<4d} {result['rps']:>9.2f} req/s "
+        f"errors={result['error_rate']:.2%}"
+    )
+    for route, summary in result["routes"].items():
+        latency = summary["latency"]
+        print(
+            f"    {route:9s} {summary['rps']:>9.2f} req/s  p50={latency['p50_ms']}ms "
+            f"p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms errors={summary['error_rate']:.2%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["inprocess", "localhost"], default="inprocess")
+    parser.add_argument("--port", type=int, default=8765, help="localhost port")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"route ratios, default {DEFAULT_MIX}")
+    parser.add_argument("--users", type=int, default=20, help="seeded users")
+    parser.add_argument("--news", type=int, default=500, help="seeded news")
+    parser.add_argument("--model", default=None, help="model path, defaults to a tiny random BERT")
+    parser.add_argument("--real-newspaper", action="store_true", help="parse html from a local server")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="result json path")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Offline throughput and latency benchmark for the sentiment path.
+
+Measures the sentiment analyzer used by NewsEngine.classify (and
+PilpresAPI.get_sentimen_from_news) over a sweep of batch sizes, torch
+thread counts, input lengths and backends:
+
+    pipeline  transformers sentiment-analysis pipeline (production path)
+    eager     tokenizer + model forward under torch.inference_mode
+    int8      eager with dynamic int8 quantized linear layers
+
+The model defaults to a tiny randomly initialized BERT with the production
+architecture; pass --model with a locally cached model to size real nodes.
+
+Usage:
+    python benchmarks/bench_inference.py --batch-sizes 1 8 32 --threads 1 4 --lengths 64 256
+    HF_HUB_OFFLINE=1 python benchmarks/bench_inference.py --model mdhugol/indonesia-bert-sentiment-classification
+"""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from benchmarks.common import save_results, summarize, synthetic_text, tiny_model
+
+BACKENDS = ["pipeline", "eager", "int8"]
+
+
+def build_backend(name: str, model_path: str) -> Callable[[List[str], int], list]:
+    """
+    Build a classify(texts, batch_size) callable for a backend.
+
+    Args:
+        name (str): backend name, one of BACKENDS.
+        model_path (str): model id or local path.
+
+    Returns:
+        Callable: classify function returning one label per text.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model.eval()
+
+    if name == "pipeline":
+        analyzer = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+        return lambda texts, batch_size: analyzer(texts, batch_size=batch_size, truncation=True)
+
+    if name == "int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif name != "eager":
+        raise ValueError(f"Unknown backend: {name}, choose from {BACKENDS}")
+
+    def classify(texts: List[str], batch_size: int) -> list:
+        labels = []
+        with torch.inference_mode():
+            for i in range(0, len(texts), batch_size):
+                inputs = tokenizer(
+                    texts[i : i + batch_size],
+                    padding=True,
+                    truncation=True,
+                    return_tensors="pt",
+                )
+                logits = model(**inputs).logits
+                labels += [model.config.id2label[j] for j in logits.argmax(-1).tolist()]
+        return labels
+
+    return classify
+
+
+def bench(classify: Callable, texts: List[str], batch_size: int, warmup: int) -> dict:
+    """
+    Run texts through classify one batch at a time.
+
+    The latency of a document is the latency of its batch divided by the
+    batch size, one sample per document.
+
+    Returns:
+        dict: docs/sec, per batch and per document latency percentiles.
+    """
+    for i in range(warmup):
+        classify(texts[:batch_size], batch_size)
+
+    latencies = []
+    doc_latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i : i + batch_size]
+        batch_start = time.perf_counter()
+        classify(batch, batch_size)
+        latency = (time.perf_counter() - batch_start) * 1000
+        latencies.append(latency)
+        doc_latencies += [latency / len(batch)] * len(batch)
+    total = time.perf_counter() - start
+    return {
+        "docs": len(texts),
+        "seconds": round(total, 3),
+        "docs_per_sec": round(len(texts) / total, 3) if total else 0.0,
+        "batch_latency": summarize(latencies),
+        "doc_latency": summarize(doc_latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[64, 256], help="input words")
+    parser.add_argument("--docs", type=int, default=128, help="documents per configuration")
+    parser.add_argument("--warmup", type=int, default=2, help="warmup batches")
+    parser.add_argument("--model", default=None, help="model path, defaults to a tiny random BERT")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="result json path")
+    args = parser.parse_args()
+
+    import torch
+
+    model = args.model or str(tiny_model())
+    rng = random.Random(args.seed)
+    corpus = {length: [synthetic_text(rng, length) for _ in range(args.docs)] for length in args.lengths}
+
+    results = []
+    for backend in args.backends:
+        classify = build_backend(backend, model)
+        for threads in args.threads:
+            torch.set_num_threads(threads)
+            for length in args.lengths:
+                for batch_size in args.batch_sizes:
+                    result = {
+                        "backend": backend,
+                        "threads": threads,
+                        "length": length,
+                        "batch_size": batch_size,
+                        **bench(classify, corpus[length], batch_size, args.warmup),
+                    }
+                    results.append(result)
+                    latency, doc_latency = result["batch_latency"], result["doc_latency"]
+                    print(
+                        f"{backend:8s} threads={threads:<3d} length={length:<5d} batch={batch_size:<4d} "
+                        f"{result['docs_per_sec']:>9.2f} docs/s  batch p50={latency['p50_ms']}ms "
+                        f"p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms  "
+                        f"doc p50={doc_latency['p50_ms']}ms p95={doc_latency['p95_ms']}ms "
+                        f"p99={doc_latency['p99_ms']}ms"
+                    )
+
+    params = vars(args).copy()
+    params["model"] = model
+    path = save_results("inference", params, results, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
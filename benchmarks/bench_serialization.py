@@ -0,0 +1,127 @@
+"""
+Per document cost of serializing news list responses.
+
+Compares the model path (GoogleNews.parse_obj -> NewsResult -> response
+model -> FastAPI jsonable_encoder + json.dumps) with the raw path used by
+the routes (raw motor document -> serializer.news_result -> orjson).
+
+Usage:
+    python benchmarks/bench_serialization.py --docs 100 1000 5000 --repeat 5
+"""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+import src.utils.serializer as serializer
+from benchmarks.common import mock_mongo, save_results, summarize, synthetic_text
+from src.schema.database.article_schema import GoogleNews
+from src.schema.services.pilpres_api import GetListNewsResponse, NewsResult
+
+
+def raw_documents(count: int, words: int, seed: int) -> List[dict]:
+    """Build raw motor documents shaped like the GoogleNews collection."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    docs = []
+    for i in range(count):
+        published = start + timedelta(minutes=i)
+        docs.append({
+            "_id": ObjectId(),
+            "title": synthetic_text(rng, 10),
+            "description": synthetic_text(rng, 25),
+            "published_date": published,
+            "url": f"https://news.example.com/{i}",
+            "publisher": {"href": "https://news.example.com", "title": "Example News"},
+            "article": {
+                "title": synthetic_text(rng, 10),
+                "text": synthetic_text(rng, words),
+                "summary": synthetic_text(rng, 60),
+                "publish_date": published,
+                "keywords": synthetic_text(rng, 8).split(),
+                "sentiment": rng.choice(["positive", "neutral", "negative"]),
+            },
+        })
+    return docs
+
+
+def model_path(docs: List[dict]) -> bytes:
+    news_result = [GoogleNews.parse_obj(doc) for doc in docs]
+    news_result = [NewsResult(id=str(news.id),
+                              title=news.title,
+                              description=news.description,
+                              published_date=news.published_date,
+                              url=news.url,
+                              publisher=news.publisher,
+                              article=news.article) for news in news_result]
+    response = GetListNewsResponse(received_at=datetime.now(), result=news_result)
+    return json.dumps(jsonable_encoder(response)).encode()
+
+
+def raw_path(docs: List[dict]) -> bytes:
+    return serializer.news_response([serializer.news_result(doc) for doc in docs]).body
+
+
+PATHS = {"model": model_path, "raw": raw_path}
+
+
+def bench(func: Callable, docs: List[dict], repeat: int) -> dict:
+    func(docs[:10])
+    latencies = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(func(docs))
+        latencies.append((time.perf_counter() - start) * 1000)
+    latency = summarize(latencies)
+    return {
+        "bytes": size,
+        "latency": latency,
+        "us_per_doc": round(latency["p50_ms"] * 1000 / len(docs), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--words", type=int, default=400, help="article text words")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="result json path")
+    args = parser.parse_args()
+
+    # beanie documents can only be built once their collection is initialized
+    asyncio.run(mock_mongo())
+    results = []
+    for count in args.docs:
+        docs = raw_documents(count, args.words, args.seed)
+        for name, func in PATHS.items():
+            result = {"path": name, "docs": count, **bench(func, docs, args.repeat)}
+            results.append(result)
+            print(
+                f"{name:6s} docs={count:<6d} {result['us_per_doc']:>9.2f} us/doc  "
+                f"p50={result['latency']['p50_ms']}ms bytes={result['bytes']}"
+            )
+
+    path = save_results("serialization", vars(args), results, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Offline stand-ins and helpers shared by the benchmarks."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import json
+import platform
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from hydra import compose, initialize
+from hydra.core.global_hydra import GlobalHydra
+from omegaconf import DictConfig
+
+import src.utils.timer as t
+
+FIXTURES = ROOT / "benchmarks/fixtures"
+RESULTS = ROOT / "benchmarks/results"
+
+WORDS = (
+    "pemilu presiden calon debat kampanye rakyat suara partai koalisi survei "
+    "elektabilitas program ekonomi pendidikan kesehatan jakarta indonesia pemerintah "
+    "menteri dukungan relawan wilayah pemilih kebijakan pembangunan infrastruktur "
+    "anies prabowo ganjar baswedan subianto pranowo mahfud gibran muhaimin"
+).split()
+
+
+def compose_cfg(overrides: Optional[List[str]] = None) -> DictConfig:
+    """
+    Compose the main hydra config outside of a hydra app.
+
+    Args:
+        overrides (List[str], optional): hydra overrides, e.g. ["engine.model.batch_size=8"].
+
+    Returns:
+        DictConfig: main config.
+    """
+    GlobalHydra.instance().clear()
+    with initialize(config_path="../configs", version_base=None):
+        return compose(config_name="main", overrides=overrides or [])
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Get the q-th percentile (0-100) with linear interpolation.
+
+    Examples:
+        >>> percentile([1, 2, 3, 4], 50)
+        2.5
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * q / 100
+    f = int(k)
+    c = min(f + 1, len(values) - 1)
+    return values[f] + (values[c] - values[f]) * (k - f)
+
+
+def summarize(latencies: List[float]) -> dict:
+    """Summarize latencies (ms) as count, mean and p50/p95/p99."""
+    return {
+        "count": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+class StageTimer:
+    """Collect per-stage latencies in milliseconds."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage].append((time.perf_counter() - start) * 1000)
+
+    def wrap(self, stage: str, func):
+        """Wrap a sync function so each call is recorded under stage."""
+
+        def wrapper(*args, **kwargs):
+            with self.span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def wrap_async(self, stage: str, func):
+        """Wrap a coroutine function so each call is recorded under stage."""
+
+        async def wrapper(*args, **kwargs):
+            with self.span(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    def summary(self) -> dict:
+        return {stage: summarize(values) for stage, values in self.stages.items()}
+
+
+def git_commit() -> str:
+    """Get current git commit, or unknown outside a git checkout."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def save_results(name: str, params: dict, results: list, output: Optional[str] = None) -> Path:
+    """
+    Save benchmark results as json for comparison across commits.
+
+    Args:
+        name (str): benchmark name.
+        params (dict): benchmark parameters.
+        results (list): benchmark results.
+        output (str, optional): output file. Defaults to benchmarks/results/<name>-<commit>.json.
+
+    Returns:
+        Path: written file.
+    """
+    commit = git_commit()
+    path = Path(output) if output else RESULTS / f"{name}-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "benchmark": name,
+                "commit": commit,
+                "created_at": t.now(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "params": params,
+                "results": results,
+            },
+            indent=2,
+            default=str,
+        )
+    )
+    return path
+
+
+def tiny_model(path: Path = ROOT / "tmp/tiny-indobert", seed: int = 42) -> Path:
+    """
+    Create a tiny randomly initialized BERT sequence classifier.
+
+    Same architecture and labels as the production sentiment model
+    (BertForSequenceClassification, 3 labels), small enough to build offline.
+
+    Args:
+        path (Path, optional): model directory, reused when it exists.
+        seed (int, optional): random seed for the weights.
+
+    Returns:
+        Path: model directory usable as engine.model.pretrained.
+    """
+    path = Path(path)
+    if (path / "config.json").exists():
+        return path
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    path.mkdir(parents=True, exist_ok=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += sorted(set(WORDS)) + list("abcdefghijklmnopqrstuvwxyz0123456789.,")
+    vocab += [f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz"]
+    (path / "vocab.txt").write_text("\n".join(vocab))
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=128,
+        max_position_embeddings=512,
+        num_labels=3,
+    )
+    BertForSequenceClassification(config).save_pretrained(path)
+    BertTokenizerFast(
+        vocab_file=str(path / "vocab.txt"), do_lower_case=True, model_max_length=512
+    ).save_pretrained(path)
+    return path
+
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    """Generate deterministic pseudo Indonesian text with the given word count."""
+    sentences, sentence = [], []
+    for _ in range(words):
+        sentence.append(rng.choice(WORDS))
+        if len(sentence) >= rng.randint(8, 16):
+            sentences.append(" ".join(sentence).capitalize() + ".")
+            sentence = []
+    if sentence:
+        sentences.append(" ".join(sentence).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def article_fixtures(directory: Path = FIXTURES / "articles", count: int = 50, seed: int = 42) -> List[str]:
+    """
+    Get recorded article html fixtures, generating a synthetic set when empty.
+
+    Args:
+        directory (Path, optional): fixture directory with *.html files.
+        count (int, optional): number of synthetic articles to generate.
+        seed (int, optional): random seed for the synthetic articles.
+
+    Returns:
+        List[str]: fixture file names.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    names = sorted(p.name for p in directory.glob("*.html"))
+    if names:
+        return names
+
+    rng = random.Random(seed)
+    for i in range(count):
+        title = synthetic_text(rng, 8).rstrip(".")
+        paragraphs = "".join(
+            f"<p>{synthetic_text(rng, rng.randint(40, 90))}</p>" for _ in range(rng.randint(5, 12))
+        )
+        (directory / f"synthetic-{i:03d}.html").write_text(
+            "<html><head>"
+            f"<title>{title}</title>"
+            f'<meta property="article:published_time" content="2024-01-{i % 28 + 1:02d}T08:00:00+07:00">'
+            "</head><body>"
+            f"<h1>{title}</h1><article>{paragraphs}</article>"
+            "</body></html>"
+        )
+    return sorted(p.name for p in directory.glob("*.html"))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class ArticleServer:
+    """Local http server serving recorded article html."""
+
+    def __init__(self, directory: Path = FIXTURES / "articles", latency: float = 0.0) -> None:
+        """
+        Initialize article server.
+
+        Args:
+            directory (Path, optional): directory to serve.
+            latency (float, optional): artificial response delay in seconds.
+        """
+        self.directory = Path(directory)
+        self.latency = latency
+        self.names = article_fixtures(self.directory)
+        latency = self.latency
+
+        class Handler(_QuietHandler):
+            def do_GET(self):
+                if latency:
+                    time.sleep(latency)
+                super().do_GET()
+
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(Handler, directory=str(self.directory))
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def urls(self) -> List[str]:
+        return [f"{self.base_url}/{name}" for name in self.names]
+
+    def __enter__(self) -> "ArticleServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeGNews:
+    """GNews stand-in returning local article urls, with the same attributes."""
+
+    def __init__(self, urls: List[str], latency: float = 0.0) -> None:
+        """
+        Initialize fake GNews.
+
+        Args:
+            urls (List[str]): article urls to cycle through.
+            latency (float, optional): artificial search delay in seconds.
+        """
+        self.urls = urls
+        self.latency = latency
+        self.max_results = 100
+        self.start_date = None
+        self.period = None
+        self.calls = 0
+
+    def get_news(self, key: str) -> List[dict]:
+        if self.latency:
+            time.sleep(self.latency)
+        day = date(*self.start_date) if self.start_date else date.today()
+        offset = self.calls * self.max_results
+        self.calls += 1
+        results = []
+        for i in range(self.max_results):
+            url = self.urls[(offset + i) % len(self.urls)]
+            results.append(
+                {
+                    "title": f"{key} {day.isoformat()} #{i}",
+                    "description": f"{key} news",
+                    "published date": day.strftime("%a, %d %b %Y 08:00:00 GMT"),
+                    "url": f"{url}?q={key}&d={day.isoformat()}&i={i}",
+                    "publisher": {"href": self.urls[0].rsplit("/", 1)[0], "title": "local"},
+                }
+            )
+        return results
+
+
+async def mock_mongo(db: str = "benchmark"):
+    """
+    Initialize beanie on an in-memory mongo (mongomock-motor).
+
+    Returns:
+        AsyncMongoMockClient: in-memory client.
+    """
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError as e:
+        raise ImportError(
+            "Benchmarks need mongomock-motor: pip install -r benchmarks/requirements.txt"
+        ) from e
+    from beanie import init_beanie
+
+    from src.schema.database.article_schema import ArticleBody, GoogleNews
+    from src.schema.database.compression_schema import CompressionDictionary
+    from src.schema.database.crawler_schema import CrawlQuery
+    from src.schema.database.flight_schema import FetchFlight
+    from src.schema.database.feed_schema import RssFeed
+    from src.schema.database.queue_schema import CrawlTask
+    from src.schema.database.redirect_schema import ResolvedUrl
+    from src.schema.database.search_schema import SearchResult
+    from src.schema.database.skipped_schema import SkippedArticle
+    from src.schema.database.trace_schema import FetchTrace
+    from src.schema.user.user_schema import User
+
+    client = AsyncMongoMockClient()
+    await init_beanie(
+        database=client[db],
+        document_models=[
+            User,
+            GoogleNews,
+            ArticleBody,
+            FetchTrace,
+            CompressionDictionary,
+            CrawlQuery,
+            CrawlTask,
+            FetchFlight,
+            SearchResult,
+            ResolvedUrl,
+            RssFeed,
+            SkippedArticle,
+        ],
+    )
+    return client
+
+
+class MockMongodb:
+    """MongodbBase stand-in backed by an in-memory mongo."""
+
+    def __init__(self, db: str = "benchmark") -> None:
+        self.host = "mock"
+        self.port = 0
+        self.db = db
+        self.client = None
+
+    async def connect(self) -> None:
+        self.client = await mock_mongo(self.db)
+
+    def heavy_read(self, document):
+        return document.get_motor_collection()
+
+    async def readiness(self) -> dict:
+        return {"ready": True, "ping_ms": 0.0, "pool": {}}
+
+    async def disconnect(self) -> None:
+        self.client.close()
@@ -13,7 +13,8 @@ import secrets
 import asyncio
 import re
 
-from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi import APIRouter, Depends, FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.security import (
     HTTPBasic,
     HTTPBasicCredentials,
@@ -23,8 +24,10 @@ from fastapi.security import (
 from omegaconf import DictConfig
 
 import src.utils.exceptions as exceptions
+import src.utils.metrics as metrics
 import src.utils.timer as t
 from src.schema.auth.auth_schema import CurrentUser, Token
+from src.api.middleware import TimedRoute
 from src.database.mongodb_base import MongodbBase
 from src.schema.user.user_schema import User, UserRegister, UserRegisterResponse
 from src.utils.auth import Authentication
@@ -44,7 +47,7 @@ class BaseAPI:
         """Initialize base api module."""
         self.cfg = cfg
         self.app = app
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=TimedRoute)
         self.auth = Authentication(**self.cfg.api.auth.bearer)
 
         # database
@@ -114,7 +117,7 @@ class BaseAPI:
             log.log(
                 21, f"Register request from: {user.username} - {request.client.host}"
             )
-            req_start = t.now()
+            req_start = t.monotonic()
 
             # check username
             pattern = re.compile(r'^[a-zA-Z0-9_.]+$')
@@ -123,16 +126,19 @@ class BaseAPI:
             user.username = user.username.lower()
             
             # hashing password
-            user.password = await self.auth.get_password_hash(user.password)
+            with t.span("auth"):
+                user.password = await self.auth.get_password_hash(user.password)
 
             # check if user already exists
-            user_exists = await User.find_one(User.username == user.username)
+            with t.span("mongo"):
+                user_exists = await User.find_one(User.username == user.username)
             if user_exists:
                 raise exceptions.BadRequest("Username already exists")
 
             # insert user
             user: User = user.to_user_schema()
-            await user.insert()
+            with t.span("mongo"):
+                await user.insert()
             log.log(25, f"User registered: {user.username} - {t.elapsed(req_start)}")
 
             return UserRegisterResponse(
@@ -142,6 +148,58 @@ class BaseAPI:
                 elapsed=t.elapsed(req_start),
             )
 
+        @self.router.get(
+            "/api/health/live",
+            tags=["Monitoring"],
+            description="Liveness probe",
+        )
+        async def get_liveness() -> dict:
+            """
+            Liveness probe, the worker is able to serve requests.
+
+            Returns:
+                dict: status.
+            """
+            return {"status": "alive"}
+
+        @self.router.get(
+            "/api/health/ready",
+            tags=["Monitoring"],
+            description="Readiness probe with database ping and pool saturation",
+            responses={
+                200: {"description": "Ready"},
+                503: {"description": "Database is not reachable"},
+            },
+        )
+        async def get_readiness() -> Response:
+            """
+            Readiness probe.
+
+            Returns:
+                Response: database ping latency and connection pool saturation,
+                    status 503 when the database is not reachable.
+            """
+            readiness = await self.mongodb.readiness()
+            return JSONResponse(
+                content=readiness, status_code=200 if readiness["ready"] else 503
+            )
+
+        @self.router.get(
+            "/metrics",
+            tags=["Monitoring"],
+            description="Prometheus metrics of every worker",
+            include_in_schema=False,
+        )
+        async def get_metrics() -> Response:
+            """
+            Prometheus metrics.
+
+            Returns:
+                Response: metrics in Prometheus text format.
+            """
+            payload, content_type = metrics.render()
+            return Response(content=payload, media_type=content_type)
+
         self.app.include_router(self.router)
 
     async def authenticate_user(self, username: str, password: str) -> User:
@@ -158,11 +216,14 @@ class BaseAPI:
         Raises:
             exceptions.Unauthorized: if user is not found
         """
-        user = await User.find_one(User.username == username)
+        with t.span("mongo"):
+            user = await User.find_one(User.username == username)
         if user is None:
             raise exceptions.Unauthorized("Invalid username or password")
         log.debug(f"Authenticating user: {user.username}")
-        if not await self.auth.verify_password(password, user.password):
+        with t.span("auth"):
+            verified = await self.auth.verify_password(password, user.password)
+        if not verified:
             raise exceptions.Unauthorized("Invalid username or password")
 
         return user
@@ -182,12 +243,13 @@ class BaseAPI:
         Raises:
             exceptions.Unauthorized: if user is not found
         """
-        correct_username = secrets.compare_digest(
-            credentials.username, self.cfg.api.auth.basic.username
-        )
-        correct_password = secrets.compare_digest(
-            credentials.password, self.cfg.api.auth.basic.password
-        )
+        with t.span("auth"):
+            correct_username = secrets.compare_digest(
+                credentials.username, self.cfg.api.auth.basic.username
+            )
+            correct_password = secrets.compare_digest(
+                credentials.password, self.cfg.api.auth.basic.password
+            )
         if not (correct_username and correct_password):
             raise exceptions.Unauthorized("Invalid username or password")
 
@@ -205,6 +267,7 @@ class BaseAPI:
             exceptions.Unauthorized: if token is invalid
         """
         try:
-            return await self.auth.decode_access_token(token)
+            with t.span("auth"):
+                return await self.auth.decode_access_token(token)
         except Exception as e:
             exceptions.Unauthorized("Invalid token")
\ No newline at end of file
@@ -18,32 +18,43 @@ from contextlib import asynccontextmanager
 
 log = get_logger()
 
-def main_api(cfg: DictConfig) -> None:
-    """Main function for the API."""
-    import asyncio
+def create_app(cfg: DictConfig, mongodb=None):
+    """
+    Create the FastAPI application.
+
+    Args:
+        cfg (DictConfig): main config.
+        mongodb (MongodbBase, optional): database, defaults to one built from cfg.database.
+
+    Returns:
+        FastAPI: application with every router and middleware registered.
+    """
     from fastapi import FastAPI
-    from fastapi.staticfiles import StaticFiles
     from fastapi.middleware.cors import CORSMiddleware
-    from src.api.runner import GunicornRunner, UvicornRunner
+    from src.database.cache import cache
     from src.database.mongodb_base import MongodbBase
     from src.api.base_api import BaseAPI
+    from src.api.middleware import MetricsMiddleware, TimingMiddleware
 
+    from src.api.services.admin_api import AdminAPI
     from src.api.services.pilpres_api import PilpresAPI
-    
-    log.info(f"Starting API server at {cfg.api.host}:{cfg.api.port}...")
-    
-    mongodb = MongodbBase(**cfg.database.mongodb)
+
+    if mongodb is None:
+        mongodb = MongodbBase(**cfg.database.mongodb)
     @asynccontextmanager
     async def lifespan(app: FastAPI):  # type: ignore
         await mongodb.connect()
+        await cache.connect(**cfg.database.cache)
         print("Startup complete")
         yield
+        await cache.disconnect()
         await mongodb.disconnect()
         print("Shutdown complete")
     
     # API service
     base_api = BaseAPI(cfg, mongodb)
-    pilpres_api = PilpresAPI(cfg)
+    pilpres_api = PilpresAPI(cfg, mongodb)
+    admin_api = AdminAPI(cfg)
     
     app = FastAPI(
         title=f"Pilpres 2024 Sentiment Analysis REST API",
@@ -54,6 +65,8 @@ def main_api(cfg: DictConfig) -> None:
         lifespan=lifespan,
         
     )
+    app.state.mongodb = mongodb
+    app.state.pilpres_api = pilpres_api
     app.add_middleware(
         CORSMiddleware,
         allow_origins=cfg.api.middleware.cors.allow_origins,
@@ -61,9 +74,27 @@ def main_api(cfg: DictConfig) -> None:
         allow_methods=cfg.api.middleware.cors.allow_methods,
         allow_headers=cfg.api.middleware.cors.allow_headers,
     )
+    app.add_middleware(MetricsMiddleware, routes=app.routes)
+    if cfg.api.middleware.timing.enabled:
+        app.add_middleware(
+            TimingMiddleware, access_log=cfg.api.middleware.timing.access_log
+        )
     
     app.include_router(base_api.router)
     app.include_router(pilpres_api.router)
+    app.include_router(admin_api.router)
+    return app
+
+
+def main_api(cfg: DictConfig) -> None:
+    """Main function for the API."""
+    import src.utils.metrics as metrics
+    from src.api.runner import GunicornRunner, UvicornRunner
+    
+    # clear samples of previous runs once, before any worker starts
+    metrics.reset()
+    log.info(f"Starting API server at {cfg.api.host}:{cfg.api.port}...")
+    app = create_app(cfg)
     
     # setup runner
     runner = UvicornRunner(
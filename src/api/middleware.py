@@ -0,0 +1,145 @@
+"""ASGI middlewares and route classes for the API."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import functools
+import time
+from typing import Callable, List
+
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute, Match
+
+import src.utils.metrics as metrics
+import src.utils.timer as t
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def route_path(routes: List[BaseRoute], scope: dict) -> str:
+    """
+    Get the route template (e.g. /api/news/list) matching a request scope.
+
+    Args:
+        routes (List[BaseRoute]): application routes.
+        scope (dict): ASGI scope.
+
+    Returns:
+        str: route path, or "unmatched" for unknown paths.
+    """
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record latency and in-progress requests of every route."""
+
+    def __init__(self, app, routes: List[BaseRoute]) -> None:
+        """
+        Initialize metrics middleware.
+
+        Args:
+            app (ASGIApp): next ASGI application.
+            routes (List[BaseRoute]): application routes (app.routes), used as route label.
+        """
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_path(self.routes, scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_progress = metrics.HTTP_IN_PROGRESS.labels(method=method, route=route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            metrics.HTTP_LATENCY.labels(
+                method=method, route=route, status=str(status["code"])
+            ).observe(time.perf_counter() - start)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that opens a serialization span when the endpoint returns.
+
+    The span is closed by TimingMiddleware when the response starts, so it
+    covers response model validation and json encoding.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            result = await endpoint(*args, **kw)
+            timing = t.current_timing()
+            if timing is not None:
+                timing.begin("serialization")
+            return result
+
+        super().__init__(path, timed_endpoint, **kwargs)
+
+
+class TimingMiddleware:
+    """Emit request and sub-span timings as Server-Timing header and access log."""
+
+    def __init__(self, app, access_log: bool = True) -> None:
+        """
+        Initialize timing middleware.
+
+        Args:
+            app (ASGIApp): next ASGI application.
+            access_log (bool, optional): log timings of every request. Defaults to True.
+        """
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = t.start_timing()
+        status = {"code": 500, "header": ""}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                timing.end("serialization")
+                status["code"] = message["status"]
+                status["header"] = timing.header()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", status["header"].encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.access_log:
+                client = scope.get("client") or ("-", 0)
+                log.log(
+                    25,
+                    f"{client[0]} {scope['method']} {scope['path']} {status['code']} "
+                    f"- {timing.total():.2f}ms [{status['header']}]",
+                )
@@ -9,9 +9,12 @@ ROOT = pyrootutils.setup_root(
     dotenv=True,
 )
 
+import os
+
 import uvicorn
 from gunicorn.app import base
 
+import src.utils.metrics as metrics
 from src.utils.logger import get_logger
 
 log = get_logger()
@@ -52,6 +55,7 @@ class GunicornRunner:
             "worker_class": "uvicorn.workers.UvicornWorker",
             "loglevel": self.log_level,
             "timeout": 120,
+            "child_exit": lambda server, worker: metrics.mark_process_dead(worker.pid),
         }
         GunicornApp(self.app, options).run()
 
@@ -65,9 +69,13 @@ class UvicornRunner:
 
     def run(self):
         log.info(f"Starting uvicorn server on {self.host}:{self.port}...")
-        uvicorn.run(
-            self.app,
-            host=self.host,
-            port=self.port,
-            log_level=self.log_level,
-        )
\ No newline at end of file
+        try:
+            uvicorn.run(
+                self.app,
+                host=self.host,
+                port=self.port,
+                log_level=self.log_level,
+            )
+        finally:
+            # uvicorn has no child_exit hook, drop the live gauges of this process on shutdown
+            metrics.mark_process_dead(os.getpid())
\ No newline at end of file
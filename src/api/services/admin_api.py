@@ -0,0 +1,141 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Request, Response
+from omegaconf import DictConfig
+
+import src.utils.exceptions as exceptions
+from src.api.base_api import BaseAPI
+from src.api.middleware import TimedRoute
+from src.engine.crawler_engine import register_query
+from src.schema.database.crawler_schema import CrawlQuery
+from src.schema.services.admin_api import *
+from src.utils.auth import Authentication
+from src.utils.logger import get_logger
+from src.utils.profiler import session as profiler
+
+log = get_logger()
+
+class AdminAPI(BaseAPI):
+    """Admin only routes, protected by basic auth."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        self.cfg = cfg
+        self.router = APIRouter(route_class=TimedRoute)
+        self.auth = Authentication(**self.cfg.api.auth.bearer)
+
+        self.setup()
+
+    def setup(self) -> None:
+        "Setup routes"
+
+        @self.router.post(
+            "/api/admin/profiler/start",
+            tags=["Admin"],
+            description="Start profiling this worker for N seconds",
+            dependencies=[Depends(self.basic_auth)],
+            response_model=ProfilerStatusResponse,
+        )
+        async def start_profiler(
+            request: Request,
+            form: StartProfilerRequest = Depends(),
+        ) -> ProfilerStatusResponse:
+            log.log(25, f"Start profiler request from: {request.client.host}")
+            if not 0 < form.seconds <= self.cfg.api.profiler.max_seconds:
+                raise exceptions.BadRequest(
+                    f"seconds must be between 0 and {self.cfg.api.profiler.max_seconds}"
+                )
+            if form.interval < self.cfg.api.profiler.min_interval:
+                raise exceptions.BadRequest(
+                    f"interval must be at least {self.cfg.api.profiler.min_interval}"
+                )
+            try:
+                profiler.start(form.mode.value, form.seconds, form.interval)
+            except ValueError as e:
+                raise exceptions.Conflict(str(e))
+            return ProfilerStatusResponse(
+                received_at=datetime.now(), result=ProfilerStatus(**profiler.status())
+            )
+
+        @self.router.post(
+            "/api/admin/profiler/stop",
+            tags=["Admin"],
+            description="Stop profiling this worker",
+            dependencies=[Depends(self.basic_auth)],
+            response_model=ProfilerStatusResponse,
+        )
+        async def stop_profiler(request: Request) -> ProfilerStatusResponse:
+            log.log(25, f"Stop profiler request from: {request.client.host}")
+            profiler.stop()
+            return ProfilerStatusResponse(
+                received_at=datetime.now(), result=ProfilerStatus(**profiler.status())
+            )
+
+        @self.router.get(
+            "/api/admin/profiler",
+            tags=["Admin"],
+            description="Profiler status of this worker",
+            dependencies=[Depends(self.basic_auth)],
+            response_model=ProfilerStatusResponse,
+        )
+        async def get_profiler_status(request: Request) -> ProfilerStatusResponse:
+            return ProfilerStatusResponse(
+                received_at=datetime.now(), result=ProfilerStatus(**profiler.status())
+            )
+
+        @self.router.get(
+            "/api/admin/profiler/result",
+            tags=["Admin"],
+            description="Download profile: collapsed stacks (sampling) or cProfile dump (cprofile)",
+            dependencies=[Depends(self.basic_auth)],
+        )
+        async def get_profiler_result(request: Request) -> Response:
+            if profiler.running:
+                raise exceptions.Conflict("Profiler is still running")
+            if profiler.data is None:
+                raise exceptions.NotFound("No profile recorded on this worker")
+            media_type = "text/plain" if profiler.mode == "sampling" else "application/octet-stream"
+            return Response(
+                content=profiler.data,
+                media_type=media_type,
+                headers={"Content-Disposition": f'attachment; filename="{profiler.filename()}"'},
+            )
+
+        @self.router.post(
+            "/api/admin/crawler/queries",
+            tags=["Admin"],
+            description="Register a query for the scheduled crawler (mode=crawler), or update it",
+            dependencies=[Depends(self.basic_auth)],
+            response_model=CrawlQueryResponse,
+        )
+        async def register_crawl_query(
+            request: Request,
+            form: RegisterCrawlQueryRequest = Depends(),
+        ) -> CrawlQueryResponse:
+            log.log(25, f"Register crawl query request from: {request.client.host}")
+            crawl_query = await register_query(
+                form.query,
+                form.limit_per_day or self.cfg.crawler.limit_per_day,
+                form.start_date,
+                form.enabled,
+            )
+            return CrawlQueryResponse(received_at=datetime.now(), result=crawl_query)
+
+        @self.router.get(
+            "/api/admin/crawler/queries",
+            tags=["Admin"],
+            description="Registered crawl queries with their watermark and last run",
+            dependencies=[Depends(self.basic_auth)],
+            response_model=CrawlQueryListResponse,
+        )
+        async def get_crawl_queries(request: Request) -> CrawlQueryListResponse:
+            crawl_queries = await CrawlQuery.find_all().to_list()
+            return CrawlQueryListResponse(received_at=datetime.now(), result=crawl_queries)
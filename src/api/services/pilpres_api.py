@@ -15,41 +15,29 @@ import os
 from bson import ObjectId
 from datetime import datetime, date, timedelta
 from pathlib import Path
+import src.utils.compression as compression
 import src.utils.exceptions as exceptions
+import src.utils.pagination as pagination
+import src.utils.serializer as serializer
 import src.utils.timer as t
 import time
 
 from src.schema.auth.auth_schema import CurrentUser, Token
+from src.database.article_body import article_bodies
+from src.database.fetch_flight import fetch_flights, flight_key
 from src.database.mongodb_base import MongodbBase
+from src.database.news_partitions import news_partitions
 from src.utils.auth import Authentication
 from src.utils.logger import get_logger
 from src.api.base_api import BaseAPI
+from src.api.middleware import TimedRoute
 from fastapi.middleware.cors import CORSMiddleware
-from newspaper import Article as ArticleNews
-from newspaper.article import ArticleException
 
-from src.schema.database.article_schema import (
-    GoogleNews,
-    Article,
-    Sentiment
-)
-from newspaper import Config
+from src.schema.database.article_schema import GoogleNews
+from src.schema.database.skipped_schema import SkippedArticle
+from src.schema.database.trace_schema import FetchTrace
 from src.schema.services.pilpres_api import *
-from src.utils.services.fetch_news import fetch_related_news
-
-import warnings
-warnings.filterwarnings("ignore")  
-
-import nltk
-from gnews import GNews
-from datetime import datetime, date, timedelta
-from transformers import pipeline
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from src.engine.news_engine import NewsEngine
 
 app = FastAPI()
 
@@ -64,22 +52,17 @@ app.add_middleware(
 log = get_logger()
 
 class PilpresAPI(BaseAPI):
-    def __init__(self, cfg: DictConfig) -> None:
+    def __init__(self, cfg: DictConfig, mongodb: MongodbBase) -> None:
         self.cfg = cfg
         self.app = app
-        self.router = APIRouter()
+        self.mongodb = mongodb
+        self.router = APIRouter(route_class=TimedRoute)
         self.auth = Authentication(**self.cfg.api.auth.bearer)
 
-        user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_5) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/50.0.2661.102 Safari/537.36'
-        self.config = Config()
-        self.config.browser_user_agent = user_agent
-
-        self.google_news = GNews(language="id", country="ID")
-        self.pretrained= "mdhugol/indonesia-bert-sentiment-classification"
-        self.model = AutoModelForSequenceClassification.from_pretrained(self.pretrained)
-        self.tokenizer = AutoTokenizer.from_pretrained(self.pretrained)
-        self.sentiment_analyzer = pipeline("sentiment-analysis", model=self.model, tokenizer=self.tokenizer)
-        self.label = {'LABEL_0': 'positive', 'LABEL_1': 'neutral', 'LABEL_2': 'negative'}
+        self.engine = NewsEngine(cfg)
+        self.sentiment_analyzer = self.engine.sentiment_analyzer
+        self.label = self.engine.label
+        fetch_flights.configure(**self.cfg.api.fetch_flight)
 
         # engine
         self.setup()
@@ -91,7 +74,8 @@ class PilpresAPI(BaseAPI):
             "/api/news/fetch",
             tags=["Google News"],
             description="Fetch Google News Based on Keyword",
-            dependencies=[Depends(self.bearer_auth)]
+            dependencies=[Depends(self.bearer_auth)],
+            response_model=FetchNewsResponse,
         )
         async def fetch_news(
             request: Request,
@@ -99,48 +83,102 @@ class PilpresAPI(BaseAPI):
             current_user: CurrentUser = Depends(self.bearer_auth)
         ):
             log.log(25, f"Fetch news request from: {current_user.username} - {request.client.host}")
+            deadline_seconds = self.deadline_seconds(form.deadline_seconds)
+            skipped = []
+            partial = False
+
+            async def fetch(job_id: str) -> list:
+                nonlocal partial
+                start = t.monotonic()
+                news_result = await self.fetch_related_news(query=form.query,
+                                                            limit_per_day=form.limit_per_day,
+                                                            start_date=form.start_date,
+                                                            end_date=form.end_date,
+                                                            job_id=job_id,
+                                                            deadline_seconds=deadline_seconds,
+                                                            skipped=skipped)
+                partial = deadline_seconds is not None and t.elapsed(start) >= deadline_seconds * 1000
+                with t.span("serialization"):
+                    return [serializer.news_result_from_model(news) for news in news_result]
+
+            # identical concurrent requests share one job
+            key = flight_key(form.query, form.start_date, form.end_date, form.limit_per_day, deadline_seconds)
+            job_id, news_result, coalesced = await fetch_flights.run(key, fetch)
+            if coalesced:
+                # skipped articles of the job that ran
+                with t.span("mongo"):
+                    skipped = await SkippedArticle.get_motor_collection().find(
+                        {"job_id": job_id}, {"_id": 0, "url": 1, "domain": 1, "reason": 1, "error": 1}
+                    ).to_list(None)
+            partial = partial or any(item["reason"] == "deadline" for item in skipped)
+            with t.span("serialization"):
+                return serializer.news_response(
+                    news_result, job_id=job_id, coalesced=coalesced, partial=partial, skipped=skipped
+                )
 
-            news_result = await self.fetch_related_news(query=form.query, 
-                                                        limit_per_day=form.limit_per_day,
-                                                        start_date=form.start_date,
-                                                        end_date=form.end_date)
-            news_result = [NewsResult(id=str(news.id),
-                                      title=news.title,
-                                      description=news.description,
-                                      published_date=news.published_date,
-                                      url=news.url,
-                                      publisher=news.publisher,
-                                      article=news.article) for news in news_result]
-            response = FetchNewsResponse(received_at=datetime.now(), result=news_result)
-            return response
+        @self.router.get(
+            "/api/news/fetch/trace",
+            tags=["Google News"],
+            description="Get Trace of a Slow Fetch Job",
+            dependencies=[Depends(self.bearer_auth)]
+        )
+        async def get_fetch_trace(
+            request: Request,
+            form: GetFetchTraceRequest = Depends(),
+            current_user: CurrentUser = Depends(self.bearer_auth)
+        ):
+            log.log(25, f"Get fetch trace request from: {current_user.username} - {request.client.host}")
+            with t.span("mongo"):
+                trace = await FetchTrace.find_one(FetchTrace.job_id == form.job_id)
+            if trace is None:
+                raise exceptions.NotFound(f"No trace for job {form.job_id}, it was faster than the threshold or expired")
+            return GetFetchTraceResponse(received_at=datetime.now(), result=trace)
         
         @self.router.get(
             "/api/news/list",
             tags=["Google News"],
             description="Get List of Google News",
-            dependencies=[Depends(self.bearer_auth)]
+            dependencies=[Depends(self.bearer_auth)],
+            response_model=GetListNewsResponse,
         )
         async def get_list_of_news(
             request: Request,
+            form: GetListNewsRequest = Depends(),
             current_user: CurrentUser = Depends(self.bearer_auth)
         ):
             log.log(25, f"Get list of news request from: {current_user.username} - {request.client.host}")
-            news_result = await GoogleNews.find_all().to_list()
-            news_result = [NewsResult(id=str(news.id),
-                                      title=news.title,
-                                      description=news.description,
-                                      published_date=news.published_date,
-                                      url=news.url,
-                                      publisher=news.publisher,
-                                      article=news.article) for news in news_result]
-            response = GetListNewsResponse(received_at=datetime.now(), result=news_result)
-            return response      
+            query = self.list_filter(form)
+            cursor = pagination.decode_cursor(form.cursor) if form.cursor else None
+            with t.span("mongo"):
+                news_result = await news_partitions.find(
+                    self.mongodb.heavy_read(GoogleNews),
+                    query,
+                    serializer.NEWS_PROJECTION,
+                    form.limit + 1,
+                    start_date=form.start_date,
+                    end_date=form.end_date,
+                    cursor=cursor,
+                )
+            next_cursor = None
+            if len(news_result) > form.limit:
+                news_result = news_result[:form.limit]
+                next_cursor = pagination.encode_cursor(news_result[-1])
+            with t.span("mongo"):
+                # bodies in ArticleBodies are loaded on explicit request only
+                if form.include_body:
+                    await article_bodies.attach(news_result)
+                else:
+                    await compression.bodies.prepare(news_result)
+            with t.span("serialization"):
+                news_result = [serializer.news_result(doc) for doc in news_result]
+                return serializer.news_response(news_result, next_cursor=next_cursor)
         
         @self.router.get(
             "/api/news",
             tags=["Google News"],
             description="Get News Detail",
-            dependencies=[Depends(self.bearer_auth)]
+            dependencies=[Depends(self.bearer_auth)],
+            response_model=GetNewsDetailsResponse,
         )
         async def get_news_detail(
             request: Request,
@@ -148,56 +186,68 @@ class PilpresAPI(BaseAPI):
             current_user: CurrentUser = Depends(self.bearer_auth)
         ):
             log.log(25, f"Get news detail request from: {current_user.username} - {request.client.host}")
-            news = await GoogleNews.find_one(
-                    GoogleNews.id == ObjectId(form.news_id)
-                )
-            return GetNewsDetailsResponse(
-                received_at=datetime.now(),
-                result=NewsResult(id=str(news.id),
-                                title=news.title,
-                                description=news.description,
-                                published_date=news.published_date,
-                                url=news.url,
-                                publisher=news.publisher,
-                                article=news.article)
-            )
+            if not ObjectId.is_valid(form.news_id):
+                raise exceptions.BadRequest(f"Invalid news id: {form.news_id}")
+            with t.span("mongo"):
+                news = await news_partitions.find_one(
+                        {"_id": ObjectId(form.news_id)}, serializer.NEWS_PROJECTION
+                    )
+            if news is None:
+                raise exceptions.NotFound(f"News not found: {form.news_id}")
+            with t.span("mongo"):
+                await article_bodies.attach([news])
+            with t.span("serialization"):
+                return serializer.news_response(serializer.news_result(news))
     
+    def list_filter(self, form: GetListNewsRequest) -> dict:
+        """
+        Build the mongo filter of a news list request.
+
+        Args:
+            form (GetListNewsRequest): date range, sentiment, publisher and cursor.
+
+        Returns:
+            dict: mongo filter served by the (published_date, _id) indexes,
+                applied to every partition the date range routes to.
+        """
+        if form.start_date and form.end_date and form.start_date > form.end_date:
+            raise exceptions.BadRequest("start_date must not be after end_date")
+        conditions = []
+        if form.sentiment:
+            conditions.append({"article.sentiment": form.sentiment.value})
+        if form.publisher:
+            conditions.append({"publisher.title": form.publisher})
+        date_filter = pagination.date_filter(form.start_date, form.end_date)
+        if date_filter:
+            conditions.append(date_filter)
+        if form.cursor:
+            conditions.append(pagination.after_filter(form.cursor))
+        if not conditions:
+            return {}
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
     async def get_sentimen_from_news(self, text):
-        result = self.sentiment_analyzer(text)
-        sentimen = self.label[result[0]['label']]
-        return sentimen
+        sentimen = self.engine.classify([text])[0]
+        return sentimen.value
 
     async def fetch_related_news(self, query: str,
                                     limit_per_day: int, 
                                     start_date: date,
-                                    end_date: date):
-        scrapped_news = []
-        self.google_news.max_results = limit_per_day
-        while start_date < end_date:
-            self.google_news.start_date = (start_date.year, start_date.month, start_date.day)
-            self.google_news.period = "1d"
-
-            news_result = self.google_news.get_news(key=query)
-            for news in news_result:
-                try:
-                    article_result = ArticleNews(url=news['url'])
-                    article_result.build()
-                    article_dict = {
-                        "title": article_result.title,
-                        "text": article_result.text,
-                        "summary": article_result.summary,
-                        "publish_date": article_result.publish_date,
-                        "keywords": article_result.keywords
-                    }
-                    sentimen = await self.get_sentimen_from_news(article_dict['summary'])
-                    article = Article(**article_dict, sentiment=Sentiment[sentimen])
-                    news_obj = GoogleNews(**news, article=article)
-                    await news_obj.insert()
-
-                    scrapped_news.append(news_obj)
-                except AttributeError as e:
-                    log.error(str(e))
-                except ArticleException as ae:
-                    pass
-            start_date += timedelta(days=1)
-        return scrapped_news
\ No newline at end of file
+                                    end_date: date,
+                                    job_id: str = None,
+                                    deadline_seconds: float = None,
+                                    skipped: list = None):
+        return await self.engine.fetch_related_news(query=query,
+                                                    limit_per_day=limit_per_day,
+                                                    start_date=start_date,
+                                                    end_date=end_date,
+                                                    job_id=job_id,
+                                                    deadline_seconds=deadline_seconds,
+                                                    skipped=skipped)
+
+    def deadline_seconds(self, requested: float = None) -> float:
+        """Get the deadline of a fetch, the requested one capped by api.fetch_deadline.max_seconds."""
+        seconds = requested if requested is not None else self.cfg.api.fetch_deadline.default_seconds
+        if seconds is None:
+            return None
+        return min(seconds, self.cfg.api.fetch_deadline.max_seconds)
@@ -0,0 +1,116 @@
+"""Separate storage of article bodies (ArticleBodies collection keyed by news id)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from typing import List, Optional, Tuple
+
+import src.utils.compression as compression
+from src.schema.database.article_schema import Article, ArticleBody, GoogleNews
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+BODY_FIELDS = ("text", "summary", "compressed")
+
+
+class ArticleBodyStore:
+    """
+    Split article bodies out of GoogleNews documents and load them back.
+
+    With the separate layout GoogleNews keeps only metadata (title, dates,
+    publisher, keywords, sentiment), so scans and aggregations over it read
+    a fraction of the bytes. Bodies are loaded by the detail route, or by
+    the list route on explicit request, with one _id lookup per page.
+    """
+
+    def __init__(self) -> None:
+        self.separate = False
+        self.fields: List[str] = ["text"]
+
+    def configure(self, separate: bool = False, summary: bool = False) -> None:
+        """
+        Configure the storage layout of new documents.
+
+        Args:
+            separate (bool, optional): store bodies in ArticleBodies. Defaults to False.
+            summary (bool, optional): move the summary too. Defaults to False.
+        """
+        self.separate = separate
+        self.fields = ["text", "summary"] if summary else ["text"]
+        if separate:
+            log.log(22, f"Article bodies stored in {ArticleBody.Settings.name}: {', '.join(self.fields)}")
+
+    def split_article(self, article: dict, separate: Optional[bool] = None) -> Tuple[dict, Optional[dict]]:
+        """
+        Split a plain raw article into the stored article and body.
+
+        Bodies are compressed when body compression is enabled, in the body
+        document with the separate layout, inline otherwise.
+
+        Args:
+            article (dict): plain raw article (not compressed nor detached).
+            separate (bool, optional): override the configured layout, e.g. to archive old text.
+
+        Returns:
+            Tuple[dict, Optional[dict]]: article and body fields, body is None
+                with the inline layout.
+        """
+        if not (self.separate if separate is None else separate):
+            compressed = compression.bodies.compress_article(article) if compression.bodies.enabled else None
+            if compressed is not None:
+                article = {**article, "text": "", "summary": "", "compressed": compressed}
+            return article, None
+
+        body = {field: article.get(field) or "" for field in self.fields}
+        article = {key: value for key, value in article.items() if key != "compressed"}
+        article.update({field: "" for field in self.fields}, detached=list(self.fields))
+        compressed = compression.bodies.compress_article(body) if compression.bodies.enabled else None
+        if compressed is not None:
+            body = {"compressed": compressed}
+        return article, body
+
+    def split_news(self, news: GoogleNews) -> Tuple[GoogleNews, Optional[ArticleBody]]:
+        """
+        Copy of a GoogleNews document in the configured layout, for inserts.
+
+        The in memory document keeps the plain body so responses built from
+        it need neither a second lookup nor decompression.
+
+        Args:
+            news (GoogleNews): GoogleNews document with an id.
+
+        Returns:
+            Tuple[GoogleNews, Optional[ArticleBody]]: stored copy and body document.
+        """
+        if not self.separate:
+            return compression.bodies.compress_news(news), None
+        article, body = self.split_article(news.article.dict())
+        return news.copy(update={"article": Article(**article)}), ArticleBody(id=news.id, **body)
+
+    async def attach(self, docs: List[dict]) -> None:
+        """
+        Load detached bodies into raw GoogleNews documents (in place) and the
+        codecs of compressed bodies, ready for serializer.news_result.
+
+        Args:
+            docs (List[dict]): raw GoogleNews documents with article.detached.
+        """
+        detached = {doc["_id"]: doc for doc in docs if (doc.get("article") or {}).get("detached")}
+        if detached:
+            collection = ArticleBody.get_motor_collection()
+            async for body in collection.find({"_id": {"$in": list(detached)}}):
+                article = detached[body["_id"]]["article"]
+                for field in BODY_FIELDS:
+                    if body.get(field) is not None:
+                        article[field] = body[field]
+        await compression.bodies.prepare(docs)
+
+
+article_bodies = ArticleBodyStore()
@@ -0,0 +1,338 @@
+"""Shared cache tier (in-memory or Redis backend) with namespaced TTL keys."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+import src.utils.metrics as metrics
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+BACKENDS = ("memory", "redis")
+
+
+class MemoryBackend:
+    """Per-process LRU backend, for development, tests and single worker deployments."""
+
+    def __init__(self, max_items: int = 100000) -> None:
+        """
+        Initialize memory backend.
+
+        Args:
+            max_items (int, optional): least recently used keys are dropped
+                past this size. Defaults to 100000.
+        """
+        self.max_items = max_items
+        self.items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        item = self.items.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.items[key]
+            return None
+        self.items.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        self.items[key] = (value, time.monotonic() + ttl if ttl else None)
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, bytes], ttl: Optional[float]) -> None:
+        for key, value in items.items():
+            self._set(key, value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if self._get(key) is not None:
+            return False
+        self._set(key, value, ttl)
+        return True
+
+    async def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self.items.pop(key, None)
+
+    async def ping(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        self.items.clear()
+
+
+class RedisBackend:
+    """Redis protocol backend (Redis, Valkey, KeyDB, fakeredis), shared by every worker and node."""
+
+    def __init__(self, url: str, client: Optional[redis.Redis] = None, **options) -> None:
+        """
+        Initialize redis backend.
+
+        Args:
+            url (str): redis url, e.g. redis://localhost:6379/0.
+            client (redis.Redis, optional): client to use instead, e.g. a
+                fakeredis client. Defaults to a new pooled client.
+            **options: redis client options, e.g. socket_timeout, max_connections.
+        """
+        self.url = url
+        self.client = client or redis.Redis.from_url(url, **options)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self.client.mget(keys)
+
+    async def set_many(self, items: Dict[str, bytes], ttl: Optional[float]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, px=int(ttl * 1000) if ttl else None)
+            await pipe.execute()
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self.client.set(key, value, px=int(ttl * 1000), nx=True))
+
+    async def delete(self, keys: List[str]) -> None:
+        await self.client.delete(*keys)
+
+    async def ping(self) -> None:
+        await self.client.ping()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class Cache:
+    """
+    Namespaced TTL cache over a memory or redis backend.
+
+    Keys are stored as {prefix}:{namespace}:{key} and values are pickled,
+    so any worker can read what another worker cached. Backend errors are
+    logged and treated as misses, the cache never fails a request.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.prefix = "pilpres"
+        self.namespaces: Dict[str, float] = {}
+        self.default_ttl = 300.0
+        self.lock_seconds = 30.0
+        self.poll_seconds = 0.1
+        self.backend = MemoryBackend()
+        self.inflight: Dict[str, asyncio.Task] = {}
+
+    async def connect(
+        self,
+        enabled: bool = False,
+        backend: str = "memory",
+        url: Optional[str] = None,
+        prefix: str = "pilpres",
+        default_ttl: float = 300,
+        namespaces: Optional[dict] = None,
+        lock_seconds: float = 30,
+        poll_seconds: float = 0.1,
+        max_items: int = 100000,
+        options: Optional[dict] = None,
+        client: Optional[redis.Redis] = None,
+    ) -> None:
+        """
+        Configure the cache and connect to its backend.
+
+        Args:
+            enabled (bool, optional): cache lookups, every lookup misses otherwise. Defaults to False.
+            backend (str, optional): memory or redis. Defaults to "memory".
+            url (str, optional): redis url.
+            prefix (str, optional): key prefix of this deployment. Defaults to "pilpres".
+            default_ttl (float, optional): TTL of namespaces not configured. Defaults to 300.
+            namespaces (dict, optional): TTL in seconds per namespace.
+            lock_seconds (float, optional): longest wait for a value another worker is loading. Defaults to 30.
+            poll_seconds (float, optional): poll interval of that wait. Defaults to 0.1.
+            max_items (int, optional): size of the memory backend. Defaults to 100000.
+            options (dict, optional): redis client options.
+            client (redis.Redis, optional): redis client, e.g. fakeredis in tests.
+
+        Raises:
+            ValueError: unknown backend.
+            RedisError: redis is not reachable.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown cache backend: {backend}, choose from {BACKENDS}")
+        self.enabled = enabled
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.namespaces = dict(namespaces or {})
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        if backend == "redis":
+            self.backend = RedisBackend(url, client, **dict(options or {}))
+        else:
+            self.backend = MemoryBackend(max_items)
+        if not enabled:
+            return
+        try:
+            await self.backend.ping()
+        except RedisError as e:
+            log.error(f"Error connecting to cache: {e}")
+            raise
+        log.log(21, f"Connected to cache: {url if backend == 'redis' else backend}")
+
+    async def disconnect(self) -> None:
+        """Close the backend connections."""
+        await self.backend.close()
+        if self.enabled:
+            log.log(21, "Disconnected from cache")
+
+    def key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def ttl(self, namespace: str) -> float:
+        return self.namespaces.get(namespace, self.default_ttl)
+
+    async def get_many(self, namespace: str, keys: List[str]) -> List[Any]:
+        """
+        Get values, None for misses.
+
+        Args:
+            namespace (str): namespace, e.g. search, sentiment.
+            keys (List[str]): keys in the namespace.
+
+        Returns:
+            List[Any]: values in the order of keys.
+        """
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        try:
+            values = await self.backend.get_many([self.key(namespace, key) for key in keys])
+        except RedisError as e:
+            log.error(f"Cache get failed ({namespace}): {e}")
+            values = [None] * len(keys)
+        for value in values:
+            metrics.cache_result(namespace, value is not None)
+        return [pickle.loads(value) if value is not None else None for value in values]
+
+    async def get(self, namespace: str, key: str) -> Any:
+        """Get a value, None for a miss."""
+        return (await self.get_many(namespace, [key]))[0]
+
+    async def set_many(self, namespace: str, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Set values in one round trip.
+
+        Args:
+            namespace (str): namespace.
+            items (Dict[str, Any]): values by key, None values are not cached.
+            ttl (float, optional): TTL in seconds. Defaults to the namespace TTL.
+        """
+        items = {
+            self.key(namespace, key): pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            for key, value in items.items()
+            if value is not None
+        }
+        if not self.enabled or not items:
+            return
+        try:
+            await self.backend.set_many(items, self.ttl(namespace) if ttl is None else ttl)
+        except RedisError as e:
+            log.error(f"Cache set failed ({namespace}): {e}")
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value."""
+        await self.set_many(namespace, {key: value}, ttl)
+
+    async def delete(self, namespace: str, keys: List[str]) -> None:
+        """Delete values."""
+        if not self.enabled or not keys:
+            return
+        try:
+            await self.backend.delete([self.key(namespace, key) for key in keys])
+        except RedisError as e:
+            log.error(f"Cache delete failed ({namespace}): {e}")
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Get a value or load and cache it, loading each key once at a time.
+
+        Concurrent misses in a worker await the same load, misses in other
+        workers wait for the worker holding the key lock, up to lock_seconds,
+        before loading it themselves.
+
+        Args:
+            namespace (str): namespace.
+            key (str): key.
+            loader (Callable[[], Awaitable[Any]]): loads the value on a miss.
+            ttl (float, optional): TTL in seconds. Defaults to the namespace TTL.
+
+        Returns:
+            Any: cached or loaded value.
+        """
+        value = await self.get(namespace, key)
+        if value is not None or not self.enabled:
+            return value if value is not None else await loader()
+        full_key = self.key(namespace, key)
+        task = self.inflight.get(full_key)
+        if task is None:
+            task = asyncio.create_task(self.load(namespace, key, loader, ttl))
+            self.inflight[full_key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(full_key, None))
+        return await asyncio.shield(task)
+
+    async def load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Load a value holding the key lock, or wait for the worker holding it."""
+        lock = self.key("lock", f"{namespace}:{key}")
+        try:
+            locked = await self.backend.add(lock, b"1", self.lock_seconds)
+        except RedisError as e:
+            log.error(f"Cache lock failed ({namespace}): {e}")
+            locked = True
+        if not locked:
+            deadline = time.monotonic() + self.lock_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_seconds)
+                try:
+                    value = (await self.backend.get_many([self.key(namespace, key)]))[0]
+                except RedisError:
+                    break
+                if value is not None:
+                    return pickle.loads(value)
+        try:
+            value = await loader()
+            await self.set(namespace, key, value, ttl)
+            return value
+        finally:
+            if locked:
+                try:
+                    await self.backend.delete([lock])
+                except RedisError:
+                    pass
+
+
+cache = Cache()
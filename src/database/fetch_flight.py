@@ -0,0 +1,263 @@
+"""Single-flight coalescing of identical fetch jobs across workers (FetchFlights collection)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import os
+import socket
+import time
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+import src.utils.exceptions as exceptions
+import src.utils.metrics as metrics
+import src.utils.serializer as serializer
+from src.database.article_body import article_bodies
+from src.database.news_partitions import news_partitions
+from src.schema.database.flight_schema import FetchFlight
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+RUNNING, DONE, ERROR = "running", "done", "error"
+
+
+def flight_key(
+    query: str, start_date: date, end_date: date, limit_per_day: int, deadline_seconds: Optional[float] = None
+) -> str:
+    """
+    Get the key of a fetch job, identical jobs share a key.
+
+    Jobs with a deadline only share a key with jobs with the same deadline,
+    a waiter must not get the partial result of a shorter job.
+
+    Examples:
+        >>> flight_key(" Anies  Baswedan", date(2024, 1, 1), date(2024, 1, 2), 20)
+        'anies baswedan|2024-01-01|2024-01-02|20'
+        >>> flight_key("anies", date(2024, 1, 1), date(2024, 1, 2), 20, 10.0)
+        'anies|2024-01-01|2024-01-02|20|10'
+    """
+    query = " ".join(query.lower().split())
+    key = f"{query}|{start_date.isoformat()}|{end_date.isoformat()}|{limit_per_day}"
+    return key if deadline_seconds is None else f"{key}|{deadline_seconds:g}"
+
+
+class FetchFlights:
+    """
+    Run identical concurrent fetch jobs once.
+
+    The first caller of a key takes a lease on its FetchFlights document and
+    runs the job; callers in the same worker await the same task, callers in
+    other workers poll the document until the leader stores the ids of the
+    stored news. A leader that dies stops renewing its lease and the next
+    waiter takes over.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.lease_seconds = 60.0
+        self.poll_seconds = 1.0
+        self.result_seconds = 60.0
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.local: Dict[str, asyncio.Task] = {}
+
+    def configure(
+        self,
+        enabled: bool = False,
+        lease_seconds: float = 60,
+        poll_seconds: float = 1,
+        result_seconds: float = 60,
+    ) -> None:
+        """
+        Configure fetch coalescing.
+
+        Args:
+            enabled (bool, optional): coalesce identical fetch jobs. Defaults to False.
+            lease_seconds (float, optional): lease of a running job, renewed every third of it. Defaults to 60.
+            poll_seconds (float, optional): poll interval of waiters in other workers. Defaults to 1.
+            result_seconds (float, optional): how long waiters can still read a finished job. Defaults to 60.
+        """
+        self.enabled = enabled
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.result_seconds = result_seconds
+
+    @property
+    def collection(self):
+        return FetchFlight.get_motor_collection()
+
+    async def acquire(self, key: str, job_id: str) -> bool:
+        """Take the lease of a key unless a live job holds it."""
+        now = datetime.now()
+        try:
+            await self.collection.update_one(
+                {"key": key, "$or": [{"status": {"$ne": RUNNING}}, {"lease_until": {"$lt": now}}]},
+                {
+                    "$set": {
+                        "job_id": job_id,
+                        "owner": self.owner,
+                        "status": RUNNING,
+                        "lease_until": now + timedelta(seconds=self.lease_seconds),
+                        "result_ids": [],
+                        "error": None,
+                        "expires_at": now + timedelta(seconds=self.lease_seconds + self.result_seconds),
+                    }
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def heartbeat(self, key: str, job_id: str, work: asyncio.Task) -> bool:
+        """
+        Renew the lease of a running job until it is cancelled.
+
+        Failed renewals are retried while the lease is still valid; when the
+        lease is lost, or would expire before the next renewal, the work is
+        cancelled so that two workers never run the same key.
+
+        Returns:
+            bool: True when the work was cancelled because the lease was lost.
+        """
+        lease_until = time.monotonic() + self.lease_seconds
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            now = datetime.now()
+            try:
+                result = await self.collection.update_one(
+                    {"key": key, "job_id": job_id},
+                    {
+                        "$set": {
+                            "lease_until": now + timedelta(seconds=self.lease_seconds),
+                            "expires_at": now + timedelta(seconds=self.lease_seconds + self.result_seconds),
+                        }
+                    },
+                )
+            except Exception as e:
+                log.error(f"Fetch {key} lease renewal failed: {e}")
+                if time.monotonic() + self.lease_seconds / 3 < lease_until:
+                    continue
+            else:
+                if result.matched_count:
+                    lease_until = time.monotonic() + self.lease_seconds
+                    continue
+            log.error(f"Fetch {key} lost its lease, job {job_id} cancelled")
+            work.cancel()
+            return True
+
+    async def release(self, key: str, job_id: str, result: Optional[List[dict]], error: Optional[str]) -> None:
+        """Store the result ids (or error) of a finished job for the waiters."""
+        await self.collection.update_one(
+            {"key": key, "job_id": job_id},
+            {
+                "$set": {
+                    "status": ERROR if error else DONE,
+                    "result_ids": [news["_id"] for news in result or []],
+                    "error": error,
+                    "expires_at": datetime.now() + timedelta(seconds=self.result_seconds),
+                }
+            },
+        )
+
+    async def lead(self, key: str, job_id: str, fetch: Callable[[str], Awaitable[List[dict]]]) -> List[dict]:
+        """Run a job holding the lease of its key."""
+        work = asyncio.create_task(fetch(job_id))
+        heartbeat = asyncio.create_task(self.heartbeat(key, job_id, work))
+        try:
+            result = await work
+        except BaseException as e:
+            work.cancel()
+            heartbeat.cancel()
+            await self.release(key, job_id, None, repr(e))
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                exceptions.InternalServerError(f"Fetch job {job_id} lost its lease")
+            raise
+        heartbeat.cancel()
+        await self.release(key, job_id, result, None)
+        return result
+
+    async def wait(self, key: str) -> Optional[Tuple[str, List[dict]]]:
+        """
+        Wait for the job of another worker.
+
+        Returns:
+            Optional[Tuple[str, List[dict]]]: job id and news results, None
+                when the lease of the job expired.
+
+        Raises:
+            HTTPException: the job failed.
+        """
+        while True:
+            flight = await self.collection.find_one({"key": key})
+            if flight is None:
+                return None
+            if flight["status"] == ERROR:
+                exceptions.InternalServerError(f"Fetch job {flight['job_id']} failed: {flight['error']}")
+            if flight["status"] == DONE:
+                break
+            if flight["lease_until"] < datetime.now():
+                return None
+            await asyncio.sleep(self.poll_seconds)
+        docs = await news_partitions.find_ids(
+            [ObjectId(news_id) for news_id in flight["result_ids"]], serializer.NEWS_PROJECTION
+        )
+        await article_bodies.attach(docs)
+        return flight["job_id"], [serializer.news_result(doc) for doc in docs]
+
+    async def run(
+        self, key: str, fetch: Callable[[str], Awaitable[List[dict]]]
+    ) -> Tuple[str, List[dict], bool]:
+        """
+        Run a fetch job, or attach to the identical job already running.
+
+        Args:
+            key (str): job key, see flight_key.
+            fetch (Callable[[str], Awaitable[List[dict]]]): runs the job for a
+                job id and returns the news results.
+
+        Returns:
+            Tuple[str, List[dict], bool]: job id, news results and whether
+                the caller attached to another job.
+        """
+        if not self.enabled:
+            job_id = uuid4().hex
+            return job_id, await fetch(job_id), False
+
+        task = self.local.get(key)
+        if task is not None:
+            metrics.cache_result("fetch_flight", True)
+            job_id, result, _ = await asyncio.shield(task)
+            return job_id, result, True
+
+        task = asyncio.create_task(self.coalesce(key, fetch))
+        self.local[key] = task
+        task.add_done_callback(lambda _: self.local.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def coalesce(self, key: str, fetch: Callable[[str], Awaitable[List[dict]]]) -> Tuple[str, List[dict], bool]:
+        """Lead the job of a key, or wait for the worker leading it and take over when it fails."""
+        while True:
+            job_id = uuid4().hex
+            if await self.acquire(key, job_id):
+                metrics.cache_result("fetch_flight", False)
+                return job_id, await self.lead(key, job_id, fetch), False
+            waited = await self.wait(key)
+            if waited is not None:
+                metrics.cache_result("fetch_flight", True)
+                log.log(22, f"Fetch {key} coalesced with job {waited[0]}")
+                return (*waited, True)
+
+
+fetch_flights = FetchFlights()
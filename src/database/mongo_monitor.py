@@ -0,0 +1,249 @@
+"""MongoDB command monitoring (latency, documents, bytes, slow and scan log)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from typing import Dict, List, Optional, Set
+
+import bson
+from pymongo import monitoring
+
+import src.utils.metrics as metrics
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# commands whose first argument is the collection name
+READ_COMMANDS = {"find", "aggregate", "count", "distinct", "getMore"}
+WRITE_COMMANDS = {"insert", "update", "delete", "findAndModify"}
+
+
+def command_filter(command_name: str, command: dict) -> Optional[dict]:
+    """
+    Get the query filter of a read command.
+
+    Args:
+        command_name (str): command name, e.g. find.
+        command (dict): command document.
+
+    Returns:
+        Optional[dict]: filter, None for commands without one.
+    """
+    if command_name == "find":
+        return command.get("filter", {})
+    if command_name in ("count", "distinct"):
+        return command.get("query", {})
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline", [])
+        if pipeline and "$match" in pipeline[0]:
+            return pipeline[0]["$match"]
+        return {}
+    return None
+
+
+def command_sort(command_name: str, command: dict) -> Optional[dict]:
+    """
+    Get the sort of a find command, or of the first $sort stage of an aggregate.
+
+    Args:
+        command_name (str): command name, e.g. find.
+        command (dict): command document.
+
+    Returns:
+        Optional[dict]: sort, None for unsorted commands.
+    """
+    if command_name == "find":
+        return command.get("sort")
+    if command_name == "aggregate":
+        for stage in command.get("pipeline", []):
+            if "$sort" in stage:
+                return stage["$sort"]
+    return None
+
+
+def returned_documents(reply: dict) -> int:
+    """Count documents returned by a command reply."""
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "values" in reply:
+        return len(reply["values"])
+    return 0
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """pymongo command listener registered on the motor client at connect()."""
+
+    def __init__(
+        self,
+        slow_ms: float = 100,
+        scan_collections: Optional[List[str]] = None,
+        measure_bytes: bool = False,
+    ) -> None:
+        """
+        Initialize command monitor.
+
+        Args:
+            slow_ms (float, optional): log commands slower than this. Defaults to 100.
+            scan_collections (List[str], optional): collections checked for collection scans.
+            measure_bytes (bool, optional): record the reply size of every command in
+                pilpres_mongo_reply_bytes_total (re-encodes replies), otherwise only
+                slow and scan logs measure it. Defaults to False.
+        """
+        self.slow_ms = slow_ms
+        self.scan_collections = set(scan_collections or [])
+        self.measure_bytes = measure_bytes
+        self.indexed_fields: Dict[str, Set[str]] = {}
+        self._started: Dict[int, tuple] = {}
+
+    async def load_indexes(self, database) -> None:
+        """
+        Cache leading index fields of the watched collections.
+
+        Args:
+            database (AsyncIOMotorDatabase): database with the watched collections.
+        """
+        for name in self.scan_collections:
+            information = await database[name].index_information()
+            self.indexed_fields[name] = {index["key"][0][0] for index in information.values()}
+
+    def is_indexed(self, query: dict, indexed: Set[str]) -> bool:
+        """
+        Check whether a filter constrains the leading field of an index.
+
+        A clause of $and is enough, every branch of $or (e.g. a keyset
+        cursor) must be indexed.
+        """
+        if {field for field in query if not field.startswith("$")} & indexed:
+            return True
+        if any(self.is_indexed(clause, indexed) for clause in query.get("$and", [])):
+            return True
+        branches = query.get("$or", [])
+        return bool(branches) and all(self.is_indexed(clause, indexed) for clause in branches)
+
+    def is_collection_scan(self, collection: str, query: Optional[dict], sort: Optional[dict] = None) -> bool:
+        """
+        Guess whether a query scans the whole collection.
+
+        A query is flagged when neither its filter nor its sort uses the
+        leading field of an index of the collection, e.g. an empty filter
+        sorted on an indexed field walks the index and is not flagged.
+        """
+        if collection not in self.scan_collections or query is None:
+            return False
+        indexed = self.indexed_fields.get(collection, {"_id"})
+        if sort and next(iter(sort)) in indexed:
+            return False
+        return not self.is_indexed(query, indexed)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in READ_COMMANDS | WRITE_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        query = command_filter(event.command_name, event.command)
+        sort = command_sort(event.command_name, event.command)
+        self._started[event.request_id] = (str(collection), query, sort)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        started = self._started.pop(event.request_id, None)
+        if started is None:
+            return
+        collection, query, sort = started
+        elapsed_ms = event.duration_micros / 1000
+        documents = returned_documents(event.reply)
+        size = len(bson.encode(event.reply)) if self.measure_bytes else None
+
+        metrics.MONGO_LATENCY.labels(command=event.command_name, collection=collection).observe(
+            elapsed_ms / 1000
+        )
+        metrics.MONGO_DOCUMENTS.labels(command=event.command_name, collection=collection).inc(documents)
+        if size is not None:
+            metrics.MONGO_BYTES.labels(command=event.command_name, collection=collection).inc(size)
+
+        scan = self.is_collection_scan(collection, query, sort)
+        if scan:
+            metrics.MONGO_SCANS.labels(collection=collection).inc()
+        if elapsed_ms >= self.slow_ms or scan:
+            if size is None:
+                # only logged commands pay the re-encoding
+                size = len(bson.encode(event.reply))
+            log.log(
+                22,
+                f"{'Collection scan' if scan else 'Slow command'}: {event.command_name} "
+                f"{collection} filter={query} - {elapsed_ms:.2f}ms, "
+                f"{documents} documents, {size} bytes",
+            )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        started = self._started.pop(event.request_id, None)
+        if started is None:
+            return
+        collection, _, _ = started
+        metrics.MONGO_FAILURES.labels(command=event.command_name, collection=collection).inc()
+        log.log(
+            22,
+            f"Failed command: {event.command_name} {collection} - "
+            f"{event.duration_micros / 1000:.2f}ms: {event.failure}",
+        )
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool listener tracking open, checked out and waiting connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.wait_timeouts = 0
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "checked_out": self.checked_out,
+            "waiting": self.waiting,
+            "wait_timeouts": self.wait_timeouts,
+        }
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self.connections += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self.connections -= 1
+
+    def connection_check_out_started(self, event) -> None:
+        self.waiting += 1
+
+    def connection_check_out_failed(self, event) -> None:
+        self.waiting -= 1
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self.wait_timeouts += 1
+
+    def connection_checked_out(self, event) -> None:
+        self.waiting -= 1
+        self.checked_out += 1
+
+    def connection_checked_in(self, event) -> None:
+        self.checked_out -= 1
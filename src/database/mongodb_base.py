@@ -9,20 +9,61 @@ ROOT = pyrootutils.setup_root(
     dotenv=True,
 )
 
-from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import List, Type
 
+from beanie import Document, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ReadPreference
+
+import src.utils.compression as compression
+import src.utils.timer as t
+from src.database.mongo_monitor import CommandMonitor, PoolMonitor
 from src.schema.user.user_schema import User
 from src.utils.logger import get_logger
-from src.schema.database.article_schema import GoogleNews
+from src.database.article_body import article_bodies
+from src.database.news_partitions import news_partitions
+from src.schema.database.article_schema import ArticleBody, GoogleNews
+from src.schema.database.trace_schema import FetchTrace
+from src.schema.database.compression_schema import CompressionDictionary
+from src.schema.database.crawler_schema import CrawlQuery
+from src.schema.database.flight_schema import FetchFlight
+from src.schema.database.feed_schema import RssFeed
+from src.schema.database.queue_schema import CrawlTask
+from src.schema.database.redirect_schema import ResolvedUrl
+from src.schema.database.search_schema import SearchResult
+from src.schema.database.skipped_schema import SkippedArticle
 
 log = get_logger()
 
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
 
 class MongodbBase:
     """Mongodb base/parent class."""
 
-    def __init__(self, host: str, port: int, user: str, password: str, db: str):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        db: str,
+        trace_size_mb: int = 64,
+        monitoring: dict = None,
+        pool: dict = None,
+        compressors: List[str] = None,
+        read_preference: str = "primary",
+        heavy_read_preference: str = "primary",
+        body_compression: dict = None,
+        body_storage: dict = None,
+        partitioning: dict = None,
+    ):
         """
         Initialize the mongodb base class.
 
@@ -32,31 +73,139 @@ class MongodbBase:
             user (str): The user of the mongodb server.
             password (str): The password of the mongodb server.
             db (str): The database of the mongodb server.
+            trace_size_mb (int): Size of the capped FetchTraces collection.
+            monitoring (dict): Command monitoring options (enabled, slow_ms,
+                scan_collections, measure_bytes).
+            pool (dict): Connection pool options (max_pool_size, min_pool_size,
+                max_idle_time_ms, wait_queue_timeout_ms, server_selection_timeout_ms).
+            compressors (List[str]): Wire compressors in order of preference (zstd, zlib).
+            read_preference (str): Default read preference.
+            heavy_read_preference (str): Read preference of heavy list and export reads.
+            body_compression (dict): Article body compression options (enabled, codec,
+                level, min_length, dictionary_size, sample_size).
+            body_storage (dict): Article body layout options (separate, summary).
+            partitioning (dict): GoogleNews monthly partitioning options (enabled, refresh_seconds).
         """
         self.host = host
         self.port = port
         self.user = user
         self.password = password
         self.db = db
+        self.trace_size_mb = trace_size_mb
+        self.monitoring = dict(monitoring or {})
+        self.monitor = None
+        self.pool = dict(pool or {})
+        self.compressors = list(compressors or [])
+        self.read_preference = read_preference
+        self.heavy_read_preference = heavy_read_preference
+        self.body_compression = dict(body_compression or {})
+        self.body_storage = dict(body_storage or {})
+        self.partitioning = dict(partitioning or {})
+        self.pool_monitor = PoolMonitor()
 
     async def connect(self) -> None:
-        """Connect to mongodb server."""
+        """
+        Connect to mongodb server.
+
+        Raises:
+            Exception: if the server is not reachable, so the API does not
+                start without a database.
+        """
         try:
+            event_listeners = [self.pool_monitor]
+            options = dict(self.monitoring)
+            if options.pop("enabled", False):
+                self.monitor = CommandMonitor(**options)
+                event_listeners.append(self.monitor)
+            client_options = {
+                "maxPoolSize": self.pool.get("max_pool_size", 100),
+                "minPoolSize": self.pool.get("min_pool_size", 0),
+                "maxIdleTimeMS": self.pool.get("max_idle_time_ms"),
+                "waitQueueTimeoutMS": self.pool.get("wait_queue_timeout_ms"),
+                "serverSelectionTimeoutMS": self.pool.get("server_selection_timeout_ms", 1000),
+                "compressors": ",".join(self.compressors) or None,
+                "readPreference": self.read_preference,
+            }
             self.client = AsyncIOMotorClient(
                 f"mongodb://{self.user}:{self.password}@{self.host}:{self.port}",
-                serverSelectionTimeoutMS=1000,
+                event_listeners=event_listeners,
+                **{key: value for key, value in client_options.items() if value is not None},
+            )
+            await self.client.server_info()
+            await self.create_capped_collection(
+                FetchTrace.Settings.name, self.trace_size_mb * 2**20
             )
-            self.client.server_info()
             await init_beanie(
                 database=self.client[self.db],
                 document_models=[
                     User,
-                    GoogleNews
+                    GoogleNews,
+                    ArticleBody,
+                    FetchTrace,
+                    CompressionDictionary,
+                    CrawlQuery,
+                    CrawlTask,
+                    FetchFlight,
+                    SearchResult,
+                    ResolvedUrl,
+                    RssFeed,
+                    SkippedArticle,
                 ],
             )
+            await compression.bodies.configure(**self.body_compression)
+            article_bodies.configure(**self.body_storage)
+            await news_partitions.configure(**self.partitioning)
+            if self.monitor is not None:
+                await self.monitor.load_indexes(self.client[self.db])
             log.log(22, f"Connected to mongodb: {self.host}:{self.port}/{self.db}")
         except Exception as e:
             log.error(f"Error connecting to mongodb: {e}")
+            raise
+
+    async def create_capped_collection(self, name: str, size: int) -> None:
+        """
+        Create a capped collection when it does not exist yet.
+
+        Args:
+            name (str): Collection name.
+            size (int): Maximum size in bytes, oldest documents are dropped first.
+        """
+        database = self.client[self.db]
+        if name not in await database.list_collection_names():
+            await database.create_collection(name, capped=True, size=size)
+            log.log(22, f"Created capped collection: {name} ({size} bytes)")
+
+    def heavy_read(self, document: Type[Document]) -> AsyncIOMotorCollection:
+        """
+        Get the collection of a document model for heavy list and export reads.
+
+        Args:
+            document (Type[Document]): Beanie document model.
+
+        Returns:
+            AsyncIOMotorCollection: collection using heavy_read_preference.
+        """
+        return document.get_motor_collection().with_options(
+            read_preference=READ_PREFERENCES[self.heavy_read_preference]
+        )
+
+    async def readiness(self) -> dict:
+        """
+        Check database readiness and connection pool saturation.
+
+        Returns:
+            dict: ready flag, ping latency and pool statistics.
+        """
+        max_pool_size = self.pool.get("max_pool_size", 100)
+        pool = self.pool_monitor.stats()
+        pool["max_pool_size"] = max_pool_size
+        pool["saturation"] = round(pool["checked_out"] / max_pool_size, 4) if max_pool_size else 0.0
+        try:
+            start = t.monotonic()
+            await self.client.admin.command("ping")
+            return {"ready": True, "ping_ms": t.elapsed(start), "pool": pool}
+        except Exception as e:
+            return {"ready": False, "error": str(e), "pool": pool}
 
     async def disconnect(self) -> None:
         """Disconnect from mongodb server."""
@@ -0,0 +1,334 @@
+"""Monthly time partitioning of GoogleNews (GoogleNews_YYYY_MM collections)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import re
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from beanie.odm.utils.encoder import Encoder
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.schema.database.article_schema import GoogleNews
+from src.utils.logger import get_logger
+from src.utils.pagination import NEWS_SORT
+
+log = get_logger()
+
+PARTITION_PATTERN = re.compile(r"^GoogleNews_(\d{4})_(\d{2})$")
+
+
+def partition_name(published_date: Optional[date]) -> Optional[str]:
+    """
+    Get the partition of a published date.
+
+    Examples:
+        >>> partition_name(datetime(2024, 2, 14, 8))
+        'GoogleNews_2024_02'
+    """
+    if published_date is None:
+        return None
+    return f"GoogleNews_{published_date.year:04d}_{published_date.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Get the first day of the month of a partition, None for other collections."""
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class NewsPartitions:
+    """
+    Route GoogleNews reads and writes to monthly partitions by published_date.
+
+    Every partition has the GoogleNews indexes, so the hot partition of the
+    current month keeps small indexes as the corpus grows. Documents without
+    published_date stay in the GoogleNews collection, which sorts after every
+    partition (null is the lowest published_date).
+
+    Partitions created by other workers and processes (mode=partition,
+    crawler, queue, rss) are picked up by reloading the partition names
+    every refresh_seconds, and right away when a lookup by _id misses.
+
+    Until mode=partition has moved every dated document out of GoogleNews
+    (migrated), list queries read GoogleNews with every partition and merge
+    the pages in sort order.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.migrated = True
+        self.names: set = set()
+        self.refresh_seconds = 30.0
+        self.refreshed_at = 0.0
+
+    async def configure(self, enabled: bool = False, refresh_seconds: float = 30) -> None:
+        """
+        Configure partitioning and load existing partitions, call after init_beanie.
+
+        Args:
+            enabled (bool, optional): write new documents to monthly partitions. Defaults to False.
+            refresh_seconds (float, optional): how often partition names are reloaded. Defaults to 30.
+        """
+        self.enabled = enabled
+        self.refresh_seconds = refresh_seconds
+        await self.refresh(force=True)
+        if enabled:
+            log.log(22, f"GoogleNews partitioned by month: {len(self.names)} partitions")
+            if not self.migrated:
+                log.log(22, "GoogleNews still holds dated documents, list queries merge every collection until mode=partition")
+
+    async def refresh(self, force: bool = False) -> set:
+        """
+        Reload partition names (and the migration state) when they are older than refresh_seconds.
+
+        Args:
+            force (bool, optional): reload now. Defaults to False.
+
+        Returns:
+            set: partitions that were not known before.
+        """
+        if not force and time.monotonic() - self.refreshed_at < self.refresh_seconds:
+            return set()
+        base = GoogleNews.get_motor_collection()
+        names = {name for name in await base.database.list_collection_names() if PARTITION_PATTERN.match(name)}
+        self.migrated = await base.find_one({"published_date": {"$ne": None}}, {"_id": 1}) is None
+        self.refreshed_at = time.monotonic()
+        new = names - self.names
+        self.names = names
+        return new
+
+    def partitions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        before: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Get partitions overlapping a date range, newest first.
+
+        Args:
+            start_date (date, optional): first day.
+            end_date (date, optional): last day.
+            before (datetime, optional): skip partitions newer than this (keyset cursor).
+
+        Returns:
+            List[str]: partition names.
+        """
+        first = date(start_date.year, start_date.month, 1) if start_date else None
+        last = end_date
+        if before is not None:
+            last = min(last, before.date()) if last else before.date()
+        names = []
+        for name in sorted(self.names, reverse=True):
+            month = partition_month(name)
+            if first and month < first:
+                continue
+            if last and month > last:
+                continue
+            names.append(name)
+        return names
+
+    def route(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[tuple] = None,
+    ) -> List[str]:
+        """
+        Get the collections a list query has to read, in sort order.
+
+        Args:
+            start_date (date, optional): first day.
+            end_date (date, optional): last day.
+            cursor (tuple, optional): decoded keyset cursor (published_date, _id).
+
+        Returns:
+            List[str]: partitions newest first, then GoogleNews unless a date
+                range excludes undated documents (and every dated document
+                was migrated).
+        """
+        base = GoogleNews.get_motor_collection().name
+        if not self.names:
+            return [base]
+        if cursor is not None and cursor[0] is None:
+            return [base]
+        names = self.partitions(start_date, end_date, cursor[0] if cursor else None)
+        if not (start_date or end_date) or not self.migrated:
+            names.append(base)
+        return names
+
+    def collection(self, base: AsyncIOMotorCollection, name: str) -> AsyncIOMotorCollection:
+        """Get a partition with the options (read preference) of the base collection."""
+        if name == base.name:
+            return base
+        return base.database.get_collection(
+            name,
+            codec_options=base.codec_options,
+            read_preference=base.read_preference,
+            write_concern=base.write_concern,
+            read_concern=base.read_concern,
+        )
+
+    async def ensure(self, name: str) -> None:
+        """Create a partition with the GoogleNews indexes when it does not exist yet."""
+        if name in self.names:
+            return
+        collection = GoogleNews.get_motor_collection().database[name]
+        await collection.create_indexes(GoogleNews.Settings.indexes)
+        self.names.add(name)
+        log.log(22, f"Created partition: {name}")
+
+    async def insert(self, news_objs: List[GoogleNews]) -> None:
+        """
+        Insert GoogleNews documents into their partitions.
+
+        Args:
+            news_objs (List[GoogleNews]): documents with ids.
+        """
+        if not self.enabled:
+            await GoogleNews.insert_many(news_objs)
+            return
+        groups: Dict[Optional[str], list] = {}
+        for news in news_objs:
+            groups.setdefault(partition_name(news.published_date), []).append(news)
+        base = GoogleNews.get_motor_collection()
+        for name, group in groups.items():
+            if name is None:
+                await GoogleNews.insert_many(group)
+                continue
+            await self.ensure(name)
+            encoder = Encoder(to_db=True)
+            await base.database[name].insert_many([encoder.encode(news) for news in group])
+
+    async def find(
+        self,
+        base: AsyncIOMotorCollection,
+        query: dict,
+        projection: dict,
+        limit: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[tuple] = None,
+    ) -> List[dict]:
+        """
+        Read a page sorted on (published_date, _id) across partitions.
+
+        Partitions are read newest first and reading stops once the page is
+        full, so a page of recent news touches only the current partition.
+
+        Args:
+            base (AsyncIOMotorCollection): GoogleNews collection with the read options to use.
+            query (dict): filter, applied to every partition.
+            projection (dict): projection.
+            limit (int): page size.
+            start_date (date, optional): first day of the filter.
+            end_date (date, optional): last day of the filter.
+            cursor (tuple, optional): decoded keyset cursor (published_date, _id).
+
+        Returns:
+            List[dict]: raw documents.
+        """
+        await self.refresh()
+        if not self.migrated:
+            # dated documents left in GoogleNews interleave with the partitions
+            pages = await asyncio.gather(
+                *[
+                    self.collection(base, name).find(query, projection).sort(NEWS_SORT).limit(limit).to_list(None)
+                    for name in self.route(start_date, end_date, cursor)
+                ]
+            )
+            docs = [doc for page in pages for doc in page]
+            # newest first, undated documents last (null is the lowest published_date)
+            docs.sort(
+                key=lambda doc: (
+                    doc.get("published_date") is not None,
+                    doc.get("published_date") or datetime.min,
+                    doc["_id"],
+                ),
+                reverse=True,
+            )
+            return docs[:limit]
+        docs = []
+        for name in self.route(start_date, end_date, cursor):
+            collection = self.collection(base, name)
+            docs += await collection.find(query, projection).sort(NEWS_SORT).limit(limit - len(docs)).to_list(None)
+            if len(docs) >= limit:
+                break
+        return docs
+
+    async def find_one(self, query: dict, projection: Optional[dict] = None) -> Optional[dict]:
+        """
+        Find a document in any partition (e.g. by _id), partitions are queried concurrently.
+
+        Args:
+            query (dict): filter.
+            projection (dict, optional): projection.
+
+        Returns:
+            Optional[dict]: raw document.
+        """
+        await self.refresh()
+        base = GoogleNews.get_motor_collection()
+        names = [base.name, *sorted(self.names, reverse=True)]
+        while names:
+            results = await asyncio.gather(
+                *[base.database[name].find_one(query, projection) for name in names]
+            )
+            doc = next((doc for doc in results if doc is not None), None)
+            if doc is not None:
+                return doc
+            # the document may be in a partition another process created since the last refresh
+            names = sorted(await self.refresh(force=True), reverse=True)
+        return None
+
+    async def find_ids(self, ids: List[ObjectId], projection: Optional[dict] = None) -> List[dict]:
+        """
+        Find documents by _id in any partition, in the order of ids.
+
+        Args:
+            ids (List[ObjectId]): document ids.
+            projection (dict, optional): projection.
+
+        Returns:
+            List[dict]: raw documents found.
+        """
+        if not ids:
+            return []
+        await self.refresh()
+        base = GoogleNews.get_motor_collection()
+        names = [base.name, *self.names]
+        docs = {}
+        while names:
+            missing = [_id for _id in ids if _id not in docs]
+            results = await asyncio.gather(
+                *[base.database[name].find({"_id": {"$in": missing}}, projection).to_list(None) for name in names]
+            )
+            docs.update({doc["_id"]: doc for found in results for doc in found})
+            if len(docs) == len(set(ids)):
+                break
+            names = list(await self.refresh(force=True))
+        return [docs[_id] for _id in ids if _id in docs]
+
+    async def distinct(self, field: str, query: dict) -> set:
+        """Distinct values of a field over every partition."""
+        await self.refresh()
+        base = GoogleNews.get_motor_collection()
+        names = [base.name, *self.names]
+        results = await asyncio.gather(*[base.database[name].distinct(field, query) for name in names])
+        return {value for values in results for value in values}
+
+
+news_partitions = NewsPartitions()
@@ -0,0 +1,214 @@
+"""Article body compression migration engine."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import json
+from typing import List
+
+import bson
+from omegaconf import DictConfig
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+import src.utils.compression as compression
+import src.utils.timer as t
+from src.schema.database.article_schema import GoogleNews
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+BODY_FIELDS = ("text", "summary", "compressed")
+BODY_PROJECTION = {f"article.{field}": 1 for field in BODY_FIELDS}
+
+
+def body_size(article: dict) -> int:
+    """BSON size of the body fields of an article (text, summary, compressed)."""
+    return len(bson.encode({key: article[key] for key in BODY_FIELDS if key in article}))
+
+
+async def collection_stats(collection) -> dict:
+    """
+    Get size statistics of a collection.
+
+    Args:
+        collection (AsyncIOMotorCollection): collection.
+
+    Returns:
+        dict: count, data size, average document size, storage and index size in bytes.
+    """
+    try:
+        stats = await collection.database.command("collStats", collection.name)
+    except OperationFailure:
+        # the collection does not exist yet
+        stats = {}
+    return {
+        "count": stats.get("count", 0),
+        "size": stats.get("size", 0),
+        "avg_obj_size": stats.get("avgObjSize", 0),
+        "storage_size": stats.get("storageSize", 0),
+        "total_index_size": stats.get("totalIndexSize", 0),
+    }
+
+
+class CompressEngine:
+    """Compress or decompress article bodies of existing GoogleNews documents."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        """
+        Initialize compress engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the compress group and
+                database.mongodb.body_compression.
+        """
+        self.cfg = cfg
+        self.options = cfg.database.mongodb.body_compression
+        self.collection = GoogleNews.get_motor_collection()
+
+    async def collection_stats(self) -> dict:
+        """Get size statistics of the GoogleNews collection."""
+        return await collection_stats(self.collection)
+
+    async def train(self) -> str:
+        """
+        Train a dictionary on a sample of uncompressed bodies and make it active.
+
+        Returns:
+            str: dictionary id.
+        """
+        samples: List[bytes] = []
+        cursor = self.collection.aggregate(
+            [
+                {"$match": {"article.compressed": None, "article.text": {"$gt": ""}}},
+                {"$sample": {"size": self.options.sample_size}},
+                {"$project": BODY_PROJECTION},
+            ]
+        )
+        async for doc in cursor:
+            article = doc["article"]
+            samples += [article[field].encode() for field in compression.BODY_FIELDS if article.get(field)]
+        data = compression.train_dictionary(self.options.codec, samples, self.options.dictionary_size)
+        dictionary = await compression.bodies.add_dictionary(self.options.codec, data, len(samples))
+        log.log(
+            22,
+            f"Trained {self.options.codec} dictionary {dictionary.dict_id}: "
+            f"{len(data)} bytes, {len(samples)} samples",
+        )
+        return dictionary.dict_id
+
+    async def compress(self, collection=None) -> dict:
+        """
+        Compress bodies of documents stored uncompressed.
+
+        Args:
+            collection (AsyncIOMotorCollection, optional): GoogleNews or a partition.
+                Defaults to GoogleNews.
+
+        Returns:
+            dict: documents, skipped and body bytes before and after.
+        """
+        collection = collection if collection is not None else self.collection
+        report = {"documents": 0, "skipped": 0, "body_bytes_before": 0, "body_bytes_after": 0}
+        requests = []
+        async for doc in collection.find({"article.compressed": None}, BODY_PROJECTION):
+            article = doc.get("article") or {}
+            compressed = compression.bodies.compress_article(article)
+            if compressed is None:
+                report["skipped"] += 1
+                continue
+            report["documents"] += 1
+            report["body_bytes_before"] += body_size(article)
+            report["body_bytes_after"] += body_size({"text": "", "summary": "", "compressed": compressed})
+            requests.append(
+                UpdateOne(
+                    {"_id": doc["_id"], "article.compressed": None},
+                    {"$set": {"article.text": "", "article.summary": "", "article.compressed": compressed}},
+                )
+            )
+            if len(requests) >= self.cfg.compress.batch_size:
+                await collection.bulk_write(requests, ordered=False)
+                requests = []
+        if requests:
+            await collection.bulk_write(requests, ordered=False)
+        return report
+
+    async def decompress(self) -> dict:
+        """
+        Restore plain bodies of compressed documents.
+
+        Returns:
+            dict: documents, skipped and body bytes before and after.
+        """
+        report = {"documents": 0, "skipped": 0, "body_bytes_before": 0, "body_bytes_after": 0}
+        requests = []
+        async for doc in self.collection.find({"article.compressed": {"$ne": None}}, BODY_PROJECTION):
+            await compression.bodies.prepare([doc])
+            try:
+                article = compression.bodies.expand(doc["article"])
+            except KeyError:
+                report["skipped"] += 1
+                continue
+            report["documents"] += 1
+            report["body_bytes_before"] += body_size(doc["article"])
+            report["body_bytes_after"] += body_size(article)
+            requests.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {"article.text": article["text"], "article.summary": article["summary"]},
+                        "$unset": {"article.compressed": ""},
+                    },
+                )
+            )
+            if len(requests) >= self.cfg.compress.batch_size:
+                await self.collection.bulk_write(requests, ordered=False)
+                requests = []
+        if requests:
+            await self.collection.bulk_write(requests, ordered=False)
+        return report
+
+    async def run(self) -> dict:
+        """
+        Run the configured action and write the size report.
+
+        Returns:
+            dict: size report.
+        """
+        action = self.cfg.compress.action
+        start = t.monotonic()
+        report = {"action": action, "codec": self.options.codec, "collection_before": await self.collection_stats()}
+        if action == "compress":
+            if self.cfg.compress.train:
+                report["dict_id"] = await self.train()
+            else:
+                report["dict_id"] = compression.bodies.active.dict_id
+            report.update(await self.compress())
+        elif action == "decompress":
+            report.update(await self.decompress())
+        elif action != "report":
+            raise ValueError(f"Unknown compress action: {action}, choose from compress, decompress, report")
+        report["collection_after"] = await self.collection_stats()
+        if report.get("body_bytes_after"):
+            report["ratio"] = round(report["body_bytes_before"] / report["body_bytes_after"], 3)
+        report["elapsed_ms"] = t.elapsed(start)
+
+        path = ROOT / self.cfg.compress.report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        before, after = report["collection_before"], report["collection_after"]
+        log.log(
+            22,
+            f"Compress {action}: {report.get('documents', 0)} documents, "
+            f"body {report.get('body_bytes_before', 0)} -> {report.get('body_bytes_after', 0)} bytes, "
+            f"collection size {before['size']} -> {after['size']} bytes, "
+            f"storage {before['storage_size']} -> {after['storage_size']} bytes "
+            f"(storage shrinks after compact), report saved to {path}",
+        )
+        return report
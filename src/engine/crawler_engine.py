@@ -0,0 +1,179 @@
+"""Incremental scheduled crawler engine (per-query watermarks)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from omegaconf import DictConfig
+
+import src.utils.timer as t
+from src.engine.news_engine import NewsEngine
+from src.schema.database.crawler_schema import CrawlQuery
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def pending_days(crawl_query: CrawlQuery, today: date, backfill_days: int) -> List[date]:
+    """
+    Get the days a query still has to fetch, up to and including today.
+
+    Args:
+        crawl_query (CrawlQuery): registered query.
+        today (date): current day.
+        backfill_days (int): days fetched on the first run without start_date.
+
+    Returns:
+        List[date]: days after the watermark, today included.
+
+    Examples:
+        >>> pending_days(CrawlQuery(query="q", watermark=date(2024, 1, 1)), date(2024, 1, 3), 7)
+        [datetime.date(2024, 1, 2), datetime.date(2024, 1, 3)]
+    """
+    if crawl_query.watermark is not None:
+        day = crawl_query.watermark + timedelta(days=1)
+    elif crawl_query.start_date is not None:
+        day = crawl_query.start_date
+    else:
+        day = today - timedelta(days=backfill_days)
+    days = []
+    while day <= today:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+async def register_query(
+    query: str,
+    limit_per_day: int,
+    start_date: Optional[date] = None,
+    enabled: bool = True,
+) -> CrawlQuery:
+    """
+    Register a query or update its settings, the watermark is kept.
+
+    Args:
+        query (str): search keyword.
+        limit_per_day (int): results per day.
+        start_date (date, optional): first day to crawl when there is no watermark yet.
+        enabled (bool, optional): crawl on schedule. Defaults to True.
+
+    Returns:
+        CrawlQuery: registered query.
+    """
+    crawl_query = await CrawlQuery.find_one(CrawlQuery.query == query)
+    if crawl_query is None:
+        crawl_query = CrawlQuery(query=query)
+    crawl_query.limit_per_day = limit_per_day
+    crawl_query.start_date = start_date or crawl_query.start_date
+    crawl_query.enabled = enabled
+    await crawl_query.save()
+    return crawl_query
+
+
+class CrawlerEngine:
+    """
+    Run registered queries on an interval, fetching only the days since the
+    last successful run.
+
+    The watermark of a query advances after each completed day. Today is
+    never complete, so it is fetched again on every run with already stored
+    urls skipped.
+    """
+
+    def __init__(self, cfg: DictConfig, engine: Optional[NewsEngine] = None) -> None:
+        """
+        Initialize crawler engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the crawler and engine groups.
+            engine (NewsEngine, optional): news engine. Defaults to a new one.
+        """
+        self.cfg = cfg
+        self.engine = engine or NewsEngine(cfg)
+        self.semaphore = asyncio.Semaphore(cfg.crawler.concurrency)
+
+    async def crawl(self, crawl_query: CrawlQuery, today: Optional[date] = None) -> int:
+        """
+        Fetch pending days of a query, one fetch job per day.
+
+        Args:
+            crawl_query (CrawlQuery): registered query.
+            today (date, optional): Defaults to today.
+
+        Returns:
+            int: number of stored documents.
+        """
+        # jitter before taking a slot, a sleeping query must not hold one
+        await asyncio.sleep(random.uniform(0, self.cfg.crawler.jitter_seconds))
+        async with self.semaphore:
+            today = today or date.today()
+            stored = 0
+            start = t.monotonic()
+            try:
+                for day in pending_days(crawl_query, today, self.cfg.crawler.backfill_days):
+                    news_result = await self.engine.fetch_related_news(
+                        crawl_query.query,
+                        crawl_query.limit_per_day,
+                        day,
+                        day + timedelta(days=1),
+                        skip_stored=True,
+                    )
+                    stored += len(news_result)
+                    if day < today:
+                        crawl_query.watermark = day
+                        await crawl_query.save()
+                crawl_query.last_status = "success"
+                crawl_query.last_error = None
+            except Exception as e:
+                log.error(f"Crawl {crawl_query.query} failed at watermark {crawl_query.watermark}: {e}")
+                crawl_query.last_status = "error"
+                crawl_query.last_error = repr(e)
+            crawl_query.last_run_at = datetime.now()
+            crawl_query.last_stored = stored
+            await crawl_query.save()
+            log.log(
+                24,
+                f"Crawled {crawl_query.query}: {stored} new documents, watermark "
+                f"{crawl_query.watermark} - {t.elapsed(start)}ms",
+            )
+            return stored
+
+    async def run_once(self) -> int:
+        """
+        Crawl every enabled query, at most crawler.concurrency at a time.
+
+        Returns:
+            int: number of stored documents.
+        """
+        crawl_queries = await CrawlQuery.find(CrawlQuery.enabled == True).to_list()  # noqa: E712
+        results = await asyncio.gather(*[self.crawl(crawl_query) for crawl_query in crawl_queries])
+        return sum(results)
+
+    async def run(self) -> None:
+        """Register configured queries then crawl every crawler.interval_minutes."""
+        for item in self.cfg.crawler.queries:
+            start_date = item.get("start_date")
+            await register_query(
+                item.query,
+                item.get("limit_per_day", self.cfg.crawler.limit_per_day),
+                date.fromisoformat(str(start_date)) if start_date else None,
+            )
+        while True:
+            start = t.monotonic()
+            stored = await self.run_once()
+            if self.cfg.crawler.once:
+                break
+            wait = max(0.0, self.cfg.crawler.interval_minutes * 60 - t.elapsed(start) / 1000)
+            log.log(24, f"Crawl run stored {stored} documents, next run in {wait:.0f}s")
+            await asyncio.sleep(wait)
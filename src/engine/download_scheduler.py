@@ -0,0 +1,489 @@
+"""Polite article download scheduler (per-host keep-alive sessions, per-domain caps, round-robin, hedging)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+import tldextract
+from newspaper.article import ArticleException
+from requests.adapters import HTTPAdapter
+
+import src.utils.metrics as metrics
+import src.utils.tracing as tracing
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# bundled public suffix list, no download at runtime
+_extract = tldextract.TLDExtract(suffix_list_urls=())
+
+
+def domain_of(url: str) -> str:
+    """
+    Get the registered domain of an url, politeness limits apply per domain.
+
+    Examples:
+        >>> domain_of("https://news.detik.com/berita/d-1")
+        'detik.com'
+    """
+    extracted = _extract(url)
+    return extracted.registered_domain or urlparse(url).netloc.lower()
+
+
+def round_robin(items: List[Any], key: Callable[[Any], str]) -> List[int]:
+    """
+    Order items so consecutive items belong to different groups where possible.
+
+    Args:
+        items (List[Any]): items.
+        key (Callable[[Any], str]): group of an item, e.g. its domain.
+
+    Returns:
+        List[int]: item indexes, one per group in turn.
+
+    Examples:
+        >>> round_robin(["a1", "a2", "b1"], key=lambda item: item[0])
+        [0, 2, 1]
+    """
+    groups: "OrderedDict[str, deque]" = OrderedDict()
+    for i, item in enumerate(items):
+        groups.setdefault(key(item), deque()).append(i)
+    order = []
+    while groups:
+        for group in list(groups):
+            order.append(groups[group].popleft())
+            if not groups[group]:
+                del groups[group]
+    return order
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Get the q-th percentile (nearest rank) of values.
+
+    Examples:
+        >>> percentile([100, 200, 300, 400], 0.75)
+        300
+    """
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q * len(ordered))) - 1))]
+
+
+class CircuitOpen(ArticleException):
+    """The circuit breaker of the article domain is open, the download was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    Failure and latency breaker of one domain.
+
+    The breaker opens when enough of the recent downloads failed or were
+    slow. While open, downloads are refused for cooldown_seconds, then a
+    single probe is let through (half open): a success closes the breaker,
+    a failure opens it again for twice as long, up to max_cooldown_seconds.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_requests: int = 5,
+        failure_rate: float = 0.5,
+        slow_ms: float = 5000,
+        slow_rate: float = 0.8,
+        cooldown_seconds: float = 300,
+        max_cooldown_seconds: float = 3600,
+    ) -> None:
+        self.outcomes: deque = deque(maxlen=window)
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.slow_ms = slow_ms
+        self.slow_rate = slow_rate
+        self.base_cooldown = cooldown_seconds
+        self.max_cooldown = max_cooldown_seconds
+        self.cooldown = cooldown_seconds
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Check whether a download may start, taking the probe slot when half open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back the probe slot of a cancelled probe, nothing is recorded."""
+        self.probing = False
+
+    def record(self, ok: bool, latency_ms: float, probe: bool = False) -> Optional[str]:
+        """
+        Record a download outcome.
+
+        Args:
+            ok (bool): the download succeeded.
+            latency_ms (float): download latency.
+            probe (bool, optional): the download was the half open probe. Defaults to False.
+
+        Returns:
+            Optional[str]: opened or closed when the state changed.
+        """
+        if probe:
+            self.probing = False
+            if ok and latency_ms < self.slow_ms:
+                self.opened_at, self.cooldown = None, self.base_cooldown
+                self.outcomes.clear()
+                return "closed"
+            self.opened_at = time.monotonic()
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            return "opened"
+        if self.opened_at is not None:
+            return None
+        self.outcomes.append((ok, latency_ms))
+        if len(self.outcomes) < self.min_requests:
+            return None
+        failures = sum(1 for ok, _ in self.outcomes if not ok)
+        slow = sum(1 for ok, latency_ms in self.outcomes if ok and latency_ms >= self.slow_ms)
+        if failures / len(self.outcomes) >= self.failure_rate or slow / len(self.outcomes) >= self.slow_rate:
+            self.opened_at = time.monotonic()
+            return "opened"
+        return None
+
+
+class DomainLimiter:
+    """Concurrency and request rate cap of one domain."""
+
+    def __init__(self, concurrency: int, rate: float, breaker: Optional[CircuitBreaker] = None) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1 / rate if rate else 0.0
+        self.next_at = 0.0
+        self.breaker = breaker
+        self.latencies: deque = deque(maxlen=100)
+
+    async def wait(self) -> None:
+        """Wait for the next request slot of the domain."""
+        now = time.monotonic()
+        start_at = max(now, self.next_at)
+        self.next_at = start_at + self.interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+class DownloadScheduler:
+    """
+    Download articles over keep-alive sessions without overloading any publisher.
+
+    Every host gets its own pooled session, so consecutive articles of a
+    publisher reuse the TLS connection. Every domain gets a concurrency cap,
+    a request rate cap and a circuit breaker, and batches are started
+    round-robin across domains, so many publishers are downloaded in
+    parallel while none of them sees more than per_domain requests at a
+    time and failing publishers are skipped without waiting for timeouts.
+
+    A download slower than the latency percentile of its domain is hedged:
+    a second attempt is started when a slot of the domain is free, the
+    first attempt to succeed wins and the other one is dropped.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        concurrency: int = 8,
+        per_domain: int = 2,
+        per_domain_rate: float = 1.0,
+        breaker: Optional[dict] = None,
+        hedge: Optional[dict] = None,
+        user_agent: Optional[str] = None,
+        timeout: float = 7,
+    ) -> None:
+        """
+        Initialize download scheduler.
+
+        Args:
+            enabled (bool, optional): download through the scheduler, newspaper
+                downloads one article at a time otherwise. Defaults to True.
+            concurrency (int, optional): articles processed at the same time per batch. Defaults to 8.
+            per_domain (int, optional): downloads at the same time per domain. Defaults to 2.
+            per_domain_rate (float, optional): downloads started per second per domain, 0 for no cap. Defaults to 1.0.
+            breaker (dict, optional): circuit breaker options (enabled, window, min_requests,
+                failure_rate, slow_ms, slow_rate, cooldown_seconds, max_cooldown_seconds).
+            hedge (dict, optional): hedged download options (enabled, percentile,
+                min_samples, min_delay_ms).
+            user_agent (str, optional): browser user agent.
+            timeout (float, optional): download timeout in seconds. Defaults to 7.
+        """
+        self.enabled = enabled
+        self.concurrency = concurrency if enabled else 1
+        self.per_domain = per_domain
+        self.per_domain_rate = per_domain_rate
+        self.breaker = dict(breaker or {})
+        self.breaker_enabled = self.breaker.pop("enabled", False)
+        hedge = dict(hedge or {})
+        self.hedge_enabled = hedge.get("enabled", False)
+        self.hedge_percentile = hedge.get("percentile", 0.95)
+        self.hedge_min_samples = hedge.get("min_samples", 20)
+        self.hedge_min_delay_ms = hedge.get("min_delay_ms", 200)
+        self.latencies: deque = deque(maxlen=1000)
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.limiters: Dict[str, DomainLimiter] = {}
+        self.sessions: Dict[str, requests.Session] = {}
+        self.sessions_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(thread_name_prefix="download")
+
+    def limiter(self, domain: str) -> DomainLimiter:
+        if domain not in self.limiters:
+            breaker = CircuitBreaker(**self.breaker) if self.breaker_enabled else None
+            self.limiters[domain] = DomainLimiter(self.per_domain, self.per_domain_rate, breaker)
+        return self.limiters[domain]
+
+    def session(self, host: str) -> requests.Session:
+        """Get the keep-alive session of a host, sessions are shared by download threads."""
+        with self.sessions_lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_domain)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if self.user_agent:
+                    session.headers["User-Agent"] = self.user_agent
+                self.sessions[host] = session
+            return self.sessions[host]
+
+    def fetch_html(self, url: str) -> str:
+        """
+        Download the html of an article (blocking).
+
+        Raises:
+            ArticleException: the download failed or did not return 2XX.
+        """
+        try:
+            response = self.session(urlparse(url).netloc.lower()).get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise ArticleException(f"Download failed for {url}: {e}")
+        if not 200 <= response.status_code < 300:
+            raise ArticleException(f"{response.status_code} for url: {url}")
+        if "charset" not in response.headers.get("Content-Type", ""):
+            response.encoding = response.apparent_encoding
+        return response.text
+
+    def hedge_delay(self, limiter: DomainLimiter) -> Optional[float]:
+        """
+        Get how long to wait (seconds) before hedging a download of a domain.
+
+        The latency percentile of the domain is used once it has min_samples
+        downloads, the percentile of every domain before that.
+
+        Returns:
+            Optional[float]: delay, None when hedging is disabled or there are not enough samples.
+        """
+        if not self.hedge_enabled:
+            return None
+        if len(limiter.latencies) >= self.hedge_min_samples:
+            latencies = limiter.latencies
+        elif len(self.latencies) >= self.hedge_min_samples:
+            latencies = self.latencies
+        else:
+            return None
+        return max(percentile(list(latencies), self.hedge_percentile), self.hedge_min_delay_ms) / 1000
+
+    def start(self, url: str, limiter: DomainLimiter) -> asyncio.Future:
+        """
+        Download in a thread that holds a slot of the domain (already acquired) until it finishes.
+
+        Cancelling the returned future drops the result, a thread already
+        running keeps its slot until its request ends, so the per-domain cap
+        counts every open request.
+        """
+        loop = asyncio.get_running_loop()
+
+        def release(_) -> None:
+            try:
+                loop.call_soon_threadsafe(limiter.semaphore.release)
+            except RuntimeError:
+                # the loop is closed, nothing waits for the slot anymore
+                pass
+
+        try:
+            future = self.executor.submit(self.fetch_html, url)
+        except RuntimeError:
+            # the scheduler was closed
+            limiter.semaphore.release()
+            raise
+        future.add_done_callback(release)
+        return asyncio.wrap_future(future)
+
+    async def acquire(self, limiter: DomainLimiter) -> None:
+        """Wait for a concurrency slot and then a rate slot of the domain."""
+        await limiter.semaphore.acquire()
+        try:
+            await limiter.wait()
+        except BaseException:
+            limiter.semaphore.release()
+            raise
+
+    async def hedge(self, url: str, domain: str, limiter: DomainLimiter) -> str:
+        """Second attempt of a slow download, within the concurrency and rate caps of the domain."""
+        await self.acquire(limiter)
+        metrics.HEDGED_DOWNLOADS.labels(domain=domain).inc()
+        return await self.start(url, limiter)
+
+    async def fetch_hedged(self, url: str, domain: str, limiter: DomainLimiter) -> str:
+        """
+        Download the html of an article, hedged when it is slower than usual.
+
+        A slot of the domain must be acquired, it is released when the
+        download thread finishes. Dropped attempts finish their request in
+        the background, their result is ignored.
+
+        Raises:
+            ArticleException: every attempt failed.
+        """
+        attempts = [self.start(url, limiter)]
+        try:
+            delay = self.hedge_delay(limiter)
+            if delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=delay)
+                # polite: hedge only when the domain has a free slot
+                if not done and not limiter.semaphore.locked():
+                    attempts.append(asyncio.ensure_future(self.hedge(url, domain, limiter)))
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+            raise attempts[0].exception()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def download(self, url: str) -> Optional[str]:
+        """
+        Download the html of an article within the limits of its domain.
+
+        Args:
+            url (str): article url.
+
+        Returns:
+            Optional[str]: html, None when the scheduler is disabled (newspaper downloads it).
+
+        Raises:
+            CircuitOpen: the breaker of the domain is open.
+            ArticleException: the download failed.
+        """
+        if not self.enabled:
+            return None
+        domain = domain_of(url)
+        limiter = self.limiter(domain)
+        breaker = limiter.breaker
+        attempted = probe = ok = cancelled = False
+        start = time.monotonic()
+        try:
+            if breaker is not None:
+                probe = breaker.state == "half_open"
+                if not breaker.allow():
+                    metrics.BREAKER_REJECTIONS.labels(domain=domain).inc()
+                    raise CircuitOpen(f"Circuit open for {domain}: {url}")
+            attempted = True
+            await self.acquire(limiter)
+            start = time.monotonic()
+            with metrics.timed("download"), tracing.span("download", url=url):
+                html = await self.fetch_hedged(url, domain, limiter)
+            ok = True
+            return html
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            latency_ms = (time.monotonic() - start) * 1000
+            if ok:
+                limiter.latencies.append(latency_ms)
+                self.latencies.append(latency_ms)
+            if attempted and breaker is not None:
+                if cancelled:
+                    # a cancelled download (deadline) says nothing about the publisher
+                    if probe:
+                        breaker.release()
+                else:
+                    change = breaker.record(ok, latency_ms, probe)
+                    if change == "opened":
+                        log.log(24, f"Circuit opened for {domain}, next probe in {breaker.cooldown:.0f}s")
+                    elif change == "closed":
+                        log.log(24, f"Circuit closed for {domain}")
+
+    async def map(
+        self,
+        items: List[dict],
+        process: Callable[[dict], Awaitable[Any]],
+        deadline: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Process search results concurrently, started round-robin across domains.
+
+        Args:
+            items (List[dict]): search results with an url.
+            process (Callable[[dict], Awaitable[Any]]): processes one result.
+            deadline (float, optional): time.monotonic() at which the results
+                still processing are cancelled. Defaults to no deadline.
+
+        Returns:
+            List[Any]: results in the order of items, None for cancelled
+                results and the exception for failed ones, so one failure does
+                not drop the results already processed.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(item: dict) -> Any:
+            async with semaphore:
+                return await process(item)
+
+        order = round_robin(items, key=lambda item: domain_of(item["url"]))
+        tasks = {i: asyncio.create_task(run(items[i])) for i in order}
+        if not tasks:
+            return []
+        try:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            await asyncio.wait(tasks.values(), timeout=timeout)
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return [
+            None if tasks[i].cancelled() else tasks[i].exception() or tasks[i].result()
+            for i in range(len(items))
+        ]
+
+    def close(self) -> None:
+        """Close every session, download threads still running finish in the background."""
+        self.executor.shutdown(wait=False)
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
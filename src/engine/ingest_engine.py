@@ -0,0 +1,262 @@
+"""Offline batch ingestion engine."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from gnews import GNews
+from newspaper import Config
+from newspaper.article import ArticleException
+from omegaconf import DictConfig, OmegaConf
+
+import src.utils.timer as t
+from src.engine.news_engine import (
+    NewsEngine,
+    newspaper_config,
+    publisher_from_url,
+    scrape_article,
+    search_news,
+)
+from src.database.news_partitions import news_partitions
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# per worker process state, set by _init_worker
+_config: Optional[Config] = None
+_google_news: Optional[GNews] = None
+_period: str = "1d"
+
+
+def _init_worker(engine_cfg: dict) -> None:
+    """Initialize newspaper and GNews clients once per worker process."""
+    global _config, _google_news, _period
+    _config = newspaper_config(engine_cfg["user_agent"], engine_cfg["request_timeout"])
+    _google_news = GNews(
+        language=engine_cfg["gnews"]["language"],
+        country=engine_cfg["gnews"]["country"],
+    )
+    _period = engine_cfg["gnews"]["period"]
+
+
+def scrape_unit(unit: dict) -> dict:
+    """
+    Scrape a single work unit in a worker process.
+
+    A query unit searches Google News for one day and scrapes every result,
+    an url unit scrapes a chunk of urls from the url file.
+
+    Args:
+        unit (dict): work unit built by IngestEngine.units.
+
+    Returns:
+        dict: unit key, scraped (news, article) items, failed count and error.
+    """
+    items, failed = [], 0
+    try:
+        if unit["type"] == "query":
+            news_result = search_news(
+                _google_news,
+                unit["query"],
+                date.fromisoformat(unit["day"]),
+                unit["limit"],
+                _period,
+            )
+        else:
+            news_result = [{"url": url} for url in unit["urls"]]
+
+        for news in news_result:
+            try:
+                items.append((news, scrape_article(news["url"], _config)))
+            except (ArticleException, AttributeError):
+                failed += 1
+    except Exception as e:
+        return {"key": unit["key"], "items": [], "failed": failed, "error": repr(e)}
+    return {"key": unit["key"], "items": items, "failed": failed, "error": None}
+
+
+class Checkpoint:
+    """Completed work units persisted as json, so ingestion can be restarted."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize checkpoint.
+
+        Args:
+            path (Path): checkpoint json file, created on first save.
+        """
+        self.path = Path(path)
+        self.done = set()
+        if self.path.exists():
+            self.done = set(json.loads(self.path.read_text()).get("done", []))
+
+    def is_done(self, key: str) -> bool:
+        """Check whether a work unit is already completed."""
+        return key in self.done
+
+    def mark(self, key: str) -> None:
+        """Mark a work unit as completed and persist the checkpoint."""
+        self.done.add(key)
+        self.save()
+
+    def save(self) -> None:
+        """Write checkpoint atomically (write temp file then rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"updated_at": t.now(), "done": sorted(self.done)})
+        )
+        os.replace(tmp_path, self.path)
+
+
+class IngestEngine:
+    """Batch scrape -> parse -> classify -> store over all cores."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        """
+        Initialize ingest engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the engine and ingest groups.
+        """
+        self.cfg = cfg
+        self.engine = NewsEngine(cfg)
+        self.checkpoint = Checkpoint(ROOT / cfg.ingest.checkpoint)
+        self.workers = cfg.ingest.workers or os.cpu_count()
+
+    def units(self) -> List[dict]:
+        """
+        Build work units from configured queries and url file.
+
+        Returns:
+            List[dict]: one unit per (query, day) and per url chunk.
+        """
+        units = []
+        for item in self.cfg.ingest.queries:
+            day = date.fromisoformat(str(item.start_date))
+            end_date = date.fromisoformat(str(item.end_date))
+            while day < end_date:
+                units.append(
+                    {
+                        "type": "query",
+                        "key": f"query:{item.query}:{day.isoformat()}",
+                        "query": item.query,
+                        "day": day.isoformat(),
+                        "limit": item.get("limit_per_day", self.cfg.ingest.limit_per_day),
+                    }
+                )
+                day += timedelta(days=1)
+
+        if self.cfg.ingest.url_file:
+            url_file = Path(self.cfg.ingest.url_file)
+            if not url_file.is_absolute():
+                url_file = ROOT / url_file
+            urls = [
+                line.strip()
+                for line in url_file.read_text().splitlines()
+                if line.strip() and not line.startswith("#")
+            ]
+            size = self.cfg.ingest.chunk_size
+            for i in range(0, len(urls), size):
+                chunk = urls[i : i + size]
+                units.append(
+                    {
+                        "type": "url",
+                        "key": f"url:{url_file.name}:{i}:{i + len(chunk)}",
+                        "urls": chunk,
+                    }
+                )
+        return units
+
+    async def store(self, result: dict) -> int:
+        """
+        Classify and store scraped items of a work unit.
+
+        Already stored urls are skipped, so a unit interrupted after
+        insertion does not produce duplicates when it is retried.
+
+        Args:
+            result (dict): result of scrape_unit.
+
+        Returns:
+            int: number of stored documents.
+        """
+        items = [(news, article) for news, article in result["items"] if news.get("url")]
+        if not items:
+            return 0
+
+        urls = [news["url"] for news, _ in items]
+        stored_urls = await news_partitions.distinct("url", {"url": {"$in": urls}})
+        items = [(news, article) for news, article in items if news["url"] not in stored_urls]
+
+        sentiments = await self.engine.classify_cached([article["summary"] for _, article in items])
+        news_objs = []
+        for (news, article), sentiment in zip(items, sentiments):
+            if "title" not in news:
+                news = {
+                    "title": article["title"],
+                    "url": news["url"],
+                    "published_date": article["publish_date"],
+                    "publisher": publisher_from_url(news["url"]),
+                }
+            news_objs.append(self.engine.build(news, article, sentiment))
+        await self.engine.store(news_objs)
+        return len(news_objs)
+
+    async def run(self) -> None:
+        """Run every pending work unit, checkpointing after each one."""
+        units = self.units()
+        pending = [unit for unit in units if not self.checkpoint.is_done(unit["key"])]
+        log.log(
+            24,
+            f"Ingesting {len(pending)} work units ({len(units) - len(pending)} already done) "
+            f"with {self.workers} workers",
+        )
+        if not pending:
+            return
+
+        start = t.now()
+        stored, failed, errors = 0, 0, 0
+        engine_cfg = OmegaConf.to_container(self.cfg.engine, resolve=True)
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(engine_cfg,),
+        ) as pool:
+            futures = [loop.run_in_executor(pool, scrape_unit, unit) for unit in pending]
+            for done, future in enumerate(asyncio.as_completed(futures), start=1):
+                result = await future
+                failed += result["failed"]
+                if result["error"]:
+                    errors += 1
+                    log.error(f"Work unit {result['key']} failed: {result['error']}")
+                    continue
+                stored += await self.store(result)
+                self.checkpoint.mark(result["key"])
+                log.log(
+                    24,
+                    f"[{done}/{len(pending)}] {result['key']} - stored: {stored}, "
+                    f"failed articles: {failed}",
+                )
+
+        log.log(
+            24,
+            f"Ingestion finished - stored: {stored}, failed articles: {failed}, "
+            f"failed units: {errors} - {t.elapsed(start)}",
+        )
@@ -0,0 +1,36 @@
+"""Main module for the article body compression migration."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from omegaconf import DictConfig
+
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def main_compress(cfg: DictConfig) -> None:
+    """Main function for the article body compression migration."""
+    import asyncio
+    from src.database.mongodb_base import MongodbBase
+    from src.engine.compress_engine import CompressEngine
+
+    log.info(f"Starting article body {cfg.compress.action}...")
+
+    mongodb = MongodbBase(**cfg.database.mongodb)
+
+    async def run() -> None:
+        await mongodb.connect()
+        try:
+            await CompressEngine(cfg).run()
+        finally:
+            await mongodb.disconnect()
+
+    asyncio.run(run())
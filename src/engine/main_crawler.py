@@ -0,0 +1,39 @@
+"""Main module for the scheduled crawler."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from omegaconf import DictConfig
+
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def main_crawler(cfg: DictConfig) -> None:
+    """Main function for the scheduled crawler."""
+    import asyncio
+    from src.database.cache import cache
+    from src.database.mongodb_base import MongodbBase
+    from src.engine.crawler_engine import CrawlerEngine
+
+    log.info("Starting scheduled crawler...")
+
+    mongodb = MongodbBase(**cfg.database.mongodb)
+
+    async def run() -> None:
+        await mongodb.connect()
+        await cache.connect(**cfg.database.cache)
+        try:
+            await CrawlerEngine(cfg).run()
+        finally:
+            await cache.disconnect()
+            await mongodb.disconnect()
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+"""Main module for the offline batch ingestion."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from omegaconf import DictConfig
+
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def main_ingest(cfg: DictConfig) -> None:
+    """Main function for the batch ingestion."""
+    import asyncio
+    from src.database.cache import cache
+    from src.database.mongodb_base import MongodbBase
+    from src.engine.ingest_engine import IngestEngine
+
+    log.info("Starting batch ingestion...")
+
+    mongodb = MongodbBase(**cfg.database.mongodb)
+    ingest_engine = IngestEngine(cfg)
+
+    async def run() -> None:
+        await mongodb.connect()
+        await cache.connect(**cfg.database.cache)
+        try:
+            await ingest_engine.run()
+        finally:
+            await cache.disconnect()
+            await mongodb.disconnect()
+
+    asyncio.run(run())
@@ -0,0 +1,36 @@
+"""Main module for the GoogleNews partition migration and archival."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from omegaconf import DictConfig
+
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def main_partition(cfg: DictConfig) -> None:
+    """Main function for the GoogleNews partition migration and archival."""
+    import asyncio
+    from src.database.mongodb_base import MongodbBase
+    from src.engine.partition_engine import PartitionEngine
+
+    log.info(f"Starting GoogleNews {cfg.partition.action}...")
+
+    mongodb = MongodbBase(**cfg.database.mongodb)
+
+    async def run() -> None:
+        await mongodb.connect()
+        try:
+            await PartitionEngine(cfg).run()
+        finally:
+            await mongodb.disconnect()
+
+    asyncio.run(run())
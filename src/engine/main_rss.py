@@ -0,0 +1,39 @@
+"""Main module for the RSS ingestion."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from omegaconf import DictConfig
+
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+def main_rss(cfg: DictConfig) -> None:
+    """Main function for the RSS ingestion."""
+    import asyncio
+    from src.database.cache import cache
+    from src.database.mongodb_base import MongodbBase
+    from src.engine.rss_engine import RssEngine
+
+    log.info("Starting RSS ingestion...")
+
+    mongodb = MongodbBase(**cfg.database.mongodb)
+
+    async def run() -> None:
+        await mongodb.connect()
+        await cache.connect(**cfg.database.cache)
+        try:
+            await RssEngine(cfg).run()
+        finally:
+            await cache.disconnect()
+            await mongodb.disconnect()
+
+    asyncio.run(run())
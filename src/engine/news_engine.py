@@ -0,0 +1,639 @@
+"""News engine module (scrape -> parse -> classify -> store)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import hashlib
+import threading
+import time
+import warnings
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Union
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import nltk
+from beanie import PydanticObjectId
+from gnews import GNews
+from newspaper import Article as ArticleNews
+from newspaper import Config
+from newspaper.article import ArticleDownloadState, ArticleException
+from omegaconf import DictConfig
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+import src.utils.metrics as metrics
+import src.utils.timer as t
+import src.utils.tracing as tracing
+from src.database.article_body import article_bodies
+from src.database.cache import cache
+from src.database.news_partitions import news_partitions
+from src.engine.download_scheduler import CircuitOpen, DownloadScheduler, domain_of
+from src.engine.redirect_resolver import RedirectResolver
+from src.schema.database.article_schema import Article, ArticleBody, GoogleNews, Sentiment
+from src.schema.database.search_schema import SearchResult
+from src.schema.database.skipped_schema import SkippedArticle
+from src.schema.database.trace_schema import FetchTrace
+from src.utils.logger import get_logger
+
+warnings.filterwarnings("ignore")
+
+try:
+    nltk.data.find("tokenizers/punkt")
+except LookupError:
+    nltk.download("punkt")
+
+log = get_logger()
+
+
+def newspaper_config(user_agent: str, request_timeout: int) -> Config:
+    """
+    Create newspaper config.
+
+    Args:
+        user_agent (str): Browser user agent.
+        request_timeout (int): Download timeout in seconds.
+
+    Returns:
+        Config: newspaper config object.
+    """
+    config = Config()
+    config.browser_user_agent = user_agent
+    config.request_timeout = request_timeout
+    return config
+
+
+def search_news(
+    google_news: GNews, query: str, day: date, limit: int, period: str = "1d"
+) -> List[dict]:
+    """
+    Search Google News for a single day.
+
+    Args:
+        google_news (GNews): GNews client.
+        query (str): Search keyword.
+        day (date): Day to search.
+        limit (int): Maximum results.
+        period (str, optional): Search window. Defaults to "1d".
+
+    Returns:
+        List[dict]: GNews results (title, description, url, publisher, ...).
+    """
+    google_news.max_results = limit
+    google_news.start_date = (day.year, day.month, day.day)
+    google_news.period = period
+    with metrics.timed("search"):
+        return google_news.get_news(key=query)
+
+
+def scrape_article(url: str, config: Config, html: Optional[str] = None) -> dict:
+    """
+    Download, parse and summarize a single article.
+
+    Args:
+        url (str): Article url.
+        config (Config): newspaper config.
+        html (str, optional): Article html already downloaded (download scheduler).
+
+    Returns:
+        dict: Article fields for the Article schema (without sentiment).
+
+    Raises:
+        ArticleException: if the article can not be downloaded or parsed.
+    """
+    article_result = ArticleNews(url=url, config=config)
+    if html is not None:
+        article_result.download(input_html=html)
+    else:
+        with metrics.timed("download"), tracing.span("download"):
+            article_result.download()
+            if article_result.download_state != ArticleDownloadState.SUCCESS:
+                raise ArticleException(article_result.download_exception_msg)
+    with metrics.timed("parse"), tracing.span("parse"):
+        article_result.parse()
+    with metrics.timed("nlp"), tracing.span("nlp"):
+        article_result.nlp()
+    return {
+        "title": article_result.title,
+        "text": article_result.text,
+        "summary": article_result.summary,
+        "publish_date": article_result.publish_date,
+        "keywords": article_result.keywords,
+    }
+
+
+def publisher_from_url(url: str) -> dict:
+    """
+    Build a GNews-like publisher from an article url.
+
+    Args:
+        url (str): Article url.
+
+    Returns:
+        dict: publisher with href and title.
+
+    Examples:
+        >>> publisher_from_url("https://news.detik.com/berita/d-1")
+        {'href': 'https://news.detik.com', 'title': 'news.detik.com'}
+    """
+    parsed = urlparse(url)
+    return {"href": f"{parsed.scheme}://{parsed.netloc}", "title": parsed.netloc}
+
+
+def published_date(news: dict, article_dict: dict) -> Optional[datetime]:
+    """
+    Get the published date of a search result (naive UTC).
+
+    GNews returns it as an RFC 822 string ("published date"), feed entries
+    as a datetime (published_date). The date newspaper parsed from the
+    article is used when the result has none.
+
+    Args:
+        news (dict): GNews result, or a result in the same shape.
+        article_dict (dict): Scraped article fields.
+
+    Returns:
+        Optional[datetime]: published date, None when unknown.
+
+    Examples:
+        >>> published_date({"published date": "Mon, 01 Jan 2024 08:00:00 GMT"}, {})
+        datetime.datetime(2024, 1, 1, 8, 0)
+    """
+    value = news.get("published_date")
+    if value is None and news.get("published date"):
+        try:
+            value = parsedate_to_datetime(news["published date"])
+        except (TypeError, ValueError):
+            value = None
+    if value is None:
+        value = article_dict.get("publish_date")
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def skipped_article(news: dict, reason: str, error: Union[Exception, str]) -> dict:
+    """
+    Describe a search result that was not stored.
+
+    Args:
+        news (dict): GNews result.
+        reason (str): circuit_open, download, parse, deadline or error.
+        error (Union[Exception, str]): cause.
+
+    Returns:
+        dict: url, domain, reason and error.
+    """
+    return {
+        "url": news["url"],
+        "domain": domain_of(news["url"]),
+        "reason": reason,
+        "error": str(error)[:500],
+    }
+
+
+def publisher_title(news: dict) -> Optional[str]:
+    """Get the publisher title of a GNews result."""
+    publisher = news.get("publisher")
+    if isinstance(publisher, dict):
+        return publisher.get("title")
+    return publisher
+
+
+class NewsEngine:
+    """News scrape, parse, classify and store engine."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        """
+        Initialize news engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the engine group.
+        """
+        self.cfg = cfg
+        self.config = newspaper_config(
+            cfg.engine.user_agent, cfg.engine.request_timeout
+        )
+
+        self.google_news = GNews(
+            language=cfg.engine.gnews.language, country=cfg.engine.gnews.country
+        )
+        self.pretrained = cfg.engine.model.pretrained
+        self.model = AutoModelForSequenceClassification.from_pretrained(self.pretrained)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.pretrained)
+        self.sentiment_analyzer = pipeline(
+            "sentiment-analysis", model=self.model, tokenizer=self.tokenizer
+        )
+        self.label = dict(cfg.engine.model.label)
+        self.search_lock = threading.Lock()
+        self.redirects = RedirectResolver(
+            **cfg.engine.redirects, user_agent=cfg.engine.user_agent
+        )
+        self.scheduler = DownloadScheduler(
+            **cfg.engine.scheduler,
+            user_agent=cfg.engine.user_agent,
+            timeout=cfg.engine.request_timeout,
+        )
+
+    def search(self, query: str, day: date, limit: int) -> List[dict]:
+        """Search Google News for a single day."""
+        # the GNews client keeps the search window as attributes
+        with self.search_lock:
+            return search_news(
+                self.google_news, query, day, limit, self.cfg.engine.gnews.period
+            )
+
+    def search_key(self, query: str, day: date, limit: int) -> str:
+        """
+        Get the cache key of a search, results depend on the GNews edition and window.
+
+        Examples:
+            >>> engine.search_key("Anies  Baswedan", date(2024, 1, 2), 20)
+            'id:ID:1d:20:2024-01-02:anies baswedan'
+        """
+        gnews = self.cfg.engine.gnews
+        query = " ".join(query.lower().split())
+        return f"{gnews.language}:{gnews.country}:{gnews.period}:{limit}:{day.isoformat()}:{query}"
+
+    def search_ttl(self, day: date) -> float:
+        """Results of recent days still change, older days are effectively frozen."""
+        search_cache = self.cfg.engine.gnews.search_cache
+        if (date.today() - day).days < search_cache.settle_days:
+            return search_cache.recent_ttl
+        return search_cache.settled_ttl
+
+    async def search_cached(self, query: str, day: date, limit: int) -> List[dict]:
+        """
+        Search Google News for a single day, reusing recent results.
+
+        Results are cached in the shared cache and persisted in SearchResults
+        (so they survive restarts), with a short TTL for recent days and a
+        long TTL for settled ones. Live searches run in a worker thread.
+
+        Args:
+            query (str): Search keyword.
+            day (date): Day to search.
+            limit (int): Maximum results.
+
+        Returns:
+            List[dict]: GNews results.
+        """
+        if not self.cfg.engine.gnews.search_cache.enabled:
+            return await asyncio.to_thread(self.search, query, day, limit)
+        key = self.search_key(query, day, limit)
+        ttl = self.search_ttl(day)
+
+        async def load() -> List[dict]:
+            collection = SearchResult.get_motor_collection()
+            now = datetime.now()
+            with t.span("mongo"):
+                stored = await collection.find_one({"key": key, "expires_at": {"$gt": now}})
+            metrics.cache_result("search_store", stored is not None)
+            if stored is not None:
+                return stored["results"]
+            results = await asyncio.to_thread(self.search, query, day, limit)
+            with t.span("mongo"):
+                await collection.update_one(
+                    {"key": key},
+                    {
+                        "$set": {
+                            "query": query,
+                            "day": day.isoformat(),
+                            "max_results": limit,
+                            "results": results,
+                            "fetched_at": now,
+                            "expires_at": now + timedelta(seconds=ttl),
+                        }
+                    },
+                    upsert=True,
+                )
+            return results
+
+        return await cache.get_or_set("search", key, load, ttl)
+
+    def scrape(self, url: str, html: Optional[str] = None) -> dict:
+        """Download (unless html is given), parse and summarize a single article."""
+        return scrape_article(url, self.config, html)
+
+    def classify(self, texts: List[str]) -> List[Sentiment]:
+        """
+        Classify sentiment of texts in batches.
+
+        Args:
+            texts (List[str]): Texts to classify.
+
+        Returns:
+            List[Sentiment]: Sentiment for each text.
+        """
+        if not texts:
+            return []
+        with metrics.timed("classify"), t.span("inference"), tracing.span(
+            "inference", batch=len(texts)
+        ):
+            results = self.sentiment_analyzer(
+                texts, batch_size=self.cfg.engine.model.batch_size, truncation=True
+            )
+        return [Sentiment[self.label[result["label"]]] for result in results]
+
+    async def classify_cached(self, texts: List[str]) -> List[Sentiment]:
+        """
+        Classify sentiment of texts, reusing sentiments cached by any worker.
+
+        Args:
+            texts (List[str]): Texts to classify.
+
+        Returns:
+            List[Sentiment]: Sentiment for each text.
+        """
+        keys = [
+            hashlib.sha1(f"{self.pretrained}\n{text}".encode()).hexdigest() for text in texts
+        ]
+        cached = await cache.get_many("sentiment", keys)
+        missing = [i for i, value in enumerate(cached) if value is None]
+        sentiments = self.classify([texts[i] for i in missing])
+        await cache.set_many(
+            "sentiment", {keys[i]: sentiment.value for i, sentiment in zip(missing, sentiments)}
+        )
+        for i, sentiment in zip(missing, sentiments):
+            cached[i] = sentiment.value
+        return [Sentiment(value) for value in cached]
+
+    def build(self, news: dict, article_dict: dict, sentiment: Sentiment) -> GoogleNews:
+        """
+        Build GoogleNews document from search result and scraped article.
+
+        The published date is parsed from the search result, see published_date.
+
+        Args:
+            news (dict): GNews result.
+            article_dict (dict): Scraped article fields.
+            sentiment (Sentiment): Article sentiment.
+
+        Returns:
+            GoogleNews: GoogleNews document (not inserted).
+        """
+        article = Article(**article_dict, sentiment=sentiment)
+        return GoogleNews(**{**news, "published_date": published_date(news, article_dict)}, article=article)
+
+    async def process(self, news: dict) -> GoogleNews:
+        """
+        Download (within the limits of its domain), scrape (in a worker
+        thread), classify and store a single search result.
+
+        Args:
+            news (dict): GNews result, or a result in the same shape (e.g. a feed entry).
+
+        Returns:
+            GoogleNews: stored document.
+
+        Raises:
+            ArticleException: if the article can not be downloaded or parsed.
+        """
+        html = await self.scheduler.download(news["url"])
+        article_dict = await asyncio.to_thread(self.scrape, news["url"], html)
+        sentiment = (await self.classify_cached([article_dict["summary"]]))[0]
+        news_obj = self.build(news, article_dict, sentiment)
+        await self.store([news_obj])
+        return news_obj
+
+    async def store(self, news_objs: List[GoogleNews]) -> None:
+        """
+        Insert GoogleNews documents in one round trip.
+
+        The inserted copies follow the configured storage layout, bodies
+        compressed (database.mongodb.body_compression) and / or stored in
+        ArticleBodies (database.mongodb.body_storage), in the monthly
+        partition of their published date (database.mongodb.partitioning).
+
+        Args:
+            news_objs (List[GoogleNews]): Documents to insert, ids are assigned.
+        """
+        if not news_objs:
+            return
+        for news_obj in news_objs:
+            if news_obj.id is None:
+                news_obj.id = PydanticObjectId()
+        with metrics.timed("store"), t.span("mongo"), tracing.span(
+            "write", documents=len(news_objs)
+        ):
+            stored = [article_bodies.split_news(news_obj) for news_obj in news_objs]
+            # bodies first, a news document never points to a missing body
+            bodies = [body for _, body in stored if body is not None]
+            if bodies:
+                await ArticleBody.insert_many(bodies)
+            await news_partitions.insert([news_obj for news_obj, _ in stored])
+
+    async def canonicalize(self, news_result: List[dict]) -> List[dict]:
+        """
+        Replace Google News redirect links of search results by canonical publisher urls.
+
+        Args:
+            news_result (List[dict]): GNews results.
+
+        Returns:
+            List[dict]: results with canonical urls, unresolved links are kept.
+        """
+        with tracing.span("resolve", urls=len(news_result)) as resolve_span:
+            resolved = await self.redirects.resolve([news.get("url") for news in news_result])
+            resolve_span.set(resolved=len(resolved))
+        return [
+            {**news, "url": resolved[news["url"]]} if news.get("url") in resolved else news
+            for news in news_result
+        ]
+
+    async def unstored(self, news_result: List[dict]) -> List[dict]:
+        """
+        Drop search results whose url is already stored (or repeated).
+
+        Args:
+            news_result (List[dict]): GNews results.
+
+        Returns:
+            List[dict]: results not stored yet.
+        """
+        urls = [news["url"] for news in news_result if news.get("url")]
+        with t.span("mongo"):
+            seen = await news_partitions.distinct("url", {"url": {"$in": urls}})
+        unstored = []
+        for news in news_result:
+            if news.get("url") and news["url"] not in seen:
+                seen.add(news["url"])
+                unstored.append(news)
+        return unstored
+
+    async def fetch_related_news(
+        self,
+        query: str,
+        limit_per_day: int,
+        start_date: date,
+        end_date: date,
+        job_id: Optional[str] = None,
+        skip_stored: bool = False,
+        deadline_seconds: Optional[float] = None,
+        skipped: Optional[List[dict]] = None,
+    ) -> List[GoogleNews]:
+        """
+        Fetch, classify and store news for each day in [start_date, end_date).
+
+        The job is traced (search per day, download/parse/nlp per article,
+        inference and write) and the trace is persisted when the job is
+        slower than engine.trace.threshold_ms. The articles of a day are
+        processed concurrently by the download scheduler (engine.scheduler),
+        round-robin across publishers and within per-domain limits.
+
+        With a deadline, articles still processing when it hits are cancelled
+        and skipped, days not searched yet are dropped, and the documents
+        stored so far are returned.
+
+        Args:
+            query (str): Search keyword.
+            limit_per_day (int): Maximum results per day.
+            start_date (date): First day.
+            end_date (date): Last day (exclusive).
+            job_id (str, optional): Trace id. Defaults to a new one.
+            skip_stored (bool, optional): Skip search results whose url is
+                already stored. Defaults to False.
+            deadline_seconds (float, optional): Time budget of the job. Defaults to no deadline.
+            skipped (List[dict], optional): Filled with the skipped articles
+                (url, domain, reason, error).
+
+        Returns:
+            List[GoogleNews]: Stored documents.
+        """
+        job_id = job_id or uuid4().hex
+        scrapped_news = []
+        skipped = [] if skipped is None else skipped
+        # same clock as the download scheduler
+        deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+        root = None
+        try:
+            with tracing.trace(
+                "fetch", job_id=job_id, query=query, limit_per_day=limit_per_day
+            ) as root:
+                day = start_date
+                while day < end_date:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    with tracing.span("search", day=day.isoformat()) as search_span:
+                        try:
+                            news_result = await asyncio.wait_for(
+                                self.search_cached(query, day, limit_per_day), remaining
+                            )
+                        except asyncio.TimeoutError:
+                            search_span.set(status="deadline")
+                            break
+                        search_span.set(results=len(news_result))
+                        if skip_stored:
+                            # documents stored before redirects were resolved keep the redirect link
+                            news_result = await self.unstored(news_result)
+                    news_result = await self.canonicalize(news_result)
+                    if skip_stored:
+                        news_result = await self.unstored(news_result)
+                        search_span.set(new=len(news_result))
+                    metrics.FETCH_QUEUE.inc(len(news_result))
+                    news_objs = await self.scheduler.map(
+                        news_result, lambda news: self.fetch_article(news, skipped), deadline
+                    )
+                    recorded = {item["url"] for item in skipped}
+                    unstarted = 0
+                    for news, news_obj in zip(news_result, news_objs):
+                        if isinstance(news_obj, GoogleNews):
+                            scrapped_news.append(news_obj)
+                        elif isinstance(news_obj, Exception):
+                            # e.g. a failed write, the other articles of the day are kept
+                            log.error(f"Cannot process {news['url']}: {news_obj!r}")
+                            skipped.append(skipped_article(news, "error", news_obj))
+                        elif news["url"] not in recorded:
+                            # cancelled before it started, fetch_article did not see it
+                            skipped.append(skipped_article(news, "deadline", "deadline exceeded"))
+                            unstarted += 1
+                    metrics.FETCH_QUEUE.dec(unstarted)
+                    day += timedelta(days=1)
+                if day < end_date:
+                    log.log(24, f"Fetch {job_id} hit its deadline, {(end_date - day).days} days not searched")
+                root.set(stored=len(scrapped_news), skipped=len(skipped), unsearched_days=(end_date - day).days)
+        finally:
+            await self.record_skipped(skipped, "fetch", job_id)
+            if root is not None:
+                await self.save_trace(root, query, limit_per_day, start_date, end_date)
+        return scrapped_news
+
+    async def fetch_article(self, news: dict, skipped: List[dict]) -> Optional[GoogleNews]:
+        """
+        Process a search result of a fetch job.
+
+        Args:
+            news (dict): GNews result.
+            skipped (List[dict]): skipped articles, appended to when the article is not stored.
+
+        Returns:
+            Optional[GoogleNews]: stored document, None when skipped.
+        """
+        try:
+            with tracing.span("article", url=news.get("url"), publisher=publisher_title(news)):
+                return await self.process(news)
+        except asyncio.CancelledError:
+            skipped.append(skipped_article(news, "deadline", "deadline exceeded"))
+            raise
+        except CircuitOpen as e:
+            skipped.append(skipped_article(news, "circuit_open", e))
+        except ArticleException as e:
+            skipped.append(skipped_article(news, "download", e))
+        except AttributeError as e:
+            log.error(str(e))
+            skipped.append(skipped_article(news, "parse", e))
+        finally:
+            metrics.FETCH_QUEUE.dec()
+        return None
+
+    async def record_skipped(self, skipped: List[dict], source: str, job_id: Optional[str] = None) -> None:
+        """
+        Persist skipped articles in SkippedArticles.
+
+        Args:
+            skipped (List[dict]): skipped articles (url, domain, reason, error).
+            source (str): fetch or rss.
+            job_id (str, optional): fetch job id.
+        """
+        if not skipped:
+            return
+        now = datetime.now()
+        try:
+            with t.span("mongo"):
+                await SkippedArticle.get_motor_collection().insert_many(
+                    [{**item, "source": source, "job_id": job_id, "skipped_at": now} for item in skipped]
+                )
+        except Exception as e:
+            log.error(f"Error saving skipped articles: {e}")
+
+    async def save_trace(
+        self, root: tracing.Span, query: str, limit_per_day: int, start_date: date, end_date: date
+    ) -> None:
+        """Persist the trace of a fetch job slower than the configured threshold."""
+        if root.duration_ms < self.cfg.engine.trace.threshold_ms:
+            return
+        try:
+            await FetchTrace(
+                job_id=root.attributes["job_id"],
+                query=query,
+                start_date=start_date,
+                end_date=end_date,
+                limit_per_day=limit_per_day,
+                started_at=root.started_at,
+                duration_ms=root.duration_ms,
+                status="error" if root.error else "success",
+                trace=root.to_dict(),
+            ).insert()
+            log.log(
+                24, f"Slow fetch trace saved: {root.attributes['job_id']} - {root.duration_ms}ms"
+            )
+        except Exception as e:
+            log.error(f"Error saving fetch trace: {e}")
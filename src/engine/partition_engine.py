@@ -0,0 +1,183 @@
+"""GoogleNews partition migration and archival engine."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import json
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import List
+
+from omegaconf import DictConfig
+from pymongo import DeleteOne, ReplaceOne
+
+import src.utils.timer as t
+from src.database.news_partitions import news_partitions, partition_month, partition_name
+from src.engine.compress_engine import CompressEngine, collection_stats
+from src.engine.split_engine import SplitEngine
+from src.schema.database.article_schema import GoogleNews
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+ARCHIVE_METHODS = ("compress", "detach")
+
+
+def next_month(month: date) -> date:
+    """First day of the next month."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class PartitionEngine:
+    """Move GoogleNews documents to monthly partitions and archive old article text."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        """
+        Initialize partition engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the partition group.
+        """
+        self.cfg = cfg
+        self.base = GoogleNews.get_motor_collection()
+
+    async def stats(self) -> dict:
+        """Get size statistics of GoogleNews and every partition."""
+        names = [self.base.name, *sorted(news_partitions.names)]
+        return {name: await collection_stats(self.base.database[name]) for name in names}
+
+    async def flush(self, batches: dict) -> None:
+        """Write documents to their partitions (idempotent upserts) before deleting them from GoogleNews."""
+        for name, docs in batches.items():
+            await news_partitions.ensure(name)
+            await self.base.database[name].bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs], ordered=False
+            )
+            await self.base.bulk_write([DeleteOne({"_id": doc["_id"]}) for doc in docs], ordered=False)
+        batches.clear()
+
+    async def backfill(self) -> int:
+        """
+        Set the missing published_date of GoogleNews documents to the date parsed from the article.
+
+        Documents fetched before the GNews published date was parsed were
+        stored without published_date, the list filters, the keyset order
+        and the partitions skip them until it is set.
+
+        Returns:
+            int: updated documents.
+        """
+        result = await self.base.update_many(
+            {"published_date": None, "article.publish_date": {"$ne": None}},
+            [{"$set": {"published_date": "$article.publish_date"}}],
+        )
+        return result.modified_count
+
+    async def partition(self) -> dict:
+        """
+        Backfill published dates, then move dated documents of GoogleNews to their monthly partitions.
+
+        Returns:
+            dict: backfilled documents and moved documents per partition.
+        """
+        backfilled = await self.backfill()
+        moved = defaultdict(int)
+        batches = defaultdict(list)
+        pending = 0
+        async for doc in self.base.find({"published_date": {"$ne": None}}):
+            name = partition_name(doc["published_date"])
+            batches[name].append(doc)
+            moved[name] += 1
+            pending += 1
+            if pending >= self.cfg.partition.batch_size:
+                await self.flush(batches)
+                pending = 0
+        await self.flush(batches)
+        return {"backfilled": backfilled, "moved": dict(moved), "documents": sum(moved.values())}
+
+    def archivable(self, today: date = None) -> List[str]:
+        """
+        Get partitions whose newest day is older than archive.after_days.
+
+        Args:
+            today (date, optional): Defaults to today.
+
+        Returns:
+            List[str]: partition names, oldest first.
+        """
+        cutoff = (today or date.today()) - timedelta(days=self.cfg.partition.archive.after_days)
+        return [
+            name
+            for name in sorted(news_partitions.names)
+            if next_month(partition_month(name)) <= cutoff
+        ]
+
+    async def archive(self) -> dict:
+        """
+        Compress or detach article text of old partitions.
+
+        Documents already archived are skipped, so the policy can run on a
+        schedule.
+
+        Returns:
+            dict: archived documents per partition.
+        """
+        method = self.cfg.partition.archive.method
+        if method not in ARCHIVE_METHODS:
+            raise ValueError(f"Unknown archive method: {method}, choose from {ARCHIVE_METHODS}")
+        archived = {}
+        for name in self.archivable():
+            collection = self.base.database[name]
+            if method == "compress":
+                result = await CompressEngine(self.cfg).compress(collection)
+            else:
+                result = await SplitEngine(self.cfg).split(collection)
+            archived[name] = result
+            log.log(22, f"Archived {name} ({method}): {result['documents']} documents, {result['skipped']} skipped")
+        return {
+            "method": method,
+            "archived": archived,
+            "documents": sum(result["documents"] for result in archived.values()),
+        }
+
+    async def run(self) -> dict:
+        """
+        Run the configured action and write the size report.
+
+        Returns:
+            dict: size report.
+        """
+        action = self.cfg.partition.action
+        start = t.monotonic()
+        report = {"action": action, "collections_before": await self.stats()}
+        if action == "partition":
+            report.update(await self.partition())
+        elif action == "backfill":
+            report["backfilled"] = await self.backfill()
+        elif action == "archive":
+            report.update(await self.archive())
+        elif action != "report":
+            raise ValueError(f"Unknown partition action: {action}, choose from partition, backfill, archive, report")
+        report["collections_after"] = await self.stats()
+        report["elapsed_ms"] = t.elapsed(start)
+
+        path = ROOT / self.cfg.partition.report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        before, after = report["collections_before"], report["collections_after"]
+        log.log(
+            22,
+            f"Partition {action}: {report.get('documents', 0)} documents, "
+            f"{len(after)} collections, "
+            f"data {sum(stats['size'] for stats in before.values())} -> "
+            f"{sum(stats['size'] for stats in after.values())} bytes, "
+            f"largest index {max(stats['total_index_size'] for stats in after.values())} bytes, "
+            f"report saved to {path}",
+        )
+        return report
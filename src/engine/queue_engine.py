@@ -0,0 +1,348 @@
+"""Lease-based distributed crawl queue engine (CrawlTasks collection)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import json
+import os
+import socket
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from uuid import uuid4
+
+from newspaper.article import ArticleException
+from omegaconf import DictConfig
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+import src.utils.timer as t
+from src.engine.download_scheduler import CircuitOpen
+from src.engine.news_engine import NewsEngine
+from src.schema.database.queue_schema import CrawlTask, TaskStatus, TaskType
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# duplicate key, the task is already queued
+DUPLICATE_KEY = 11000
+
+
+class LeaseLost(Exception):
+    """The lease of a task expired and another worker may have claimed it."""
+
+
+def query_task(query: str, day: date, limit: int) -> dict:
+    """Build a (query, day) task."""
+    return {
+        "key": f"query:{query}:{day.isoformat()}",
+        "type": TaskType.query.value,
+        "payload": {"query": query, "day": day.isoformat(), "limit": limit},
+    }
+
+
+def article_task(news: dict) -> dict:
+    """Build a per-article task from a GNews result."""
+    return {
+        "key": f"article:{news['url']}",
+        "type": TaskType.article.value,
+        "payload": {"news": news},
+    }
+
+
+class CrawlQueue:
+    """
+    Work queue stored in Mongo.
+
+    Workers claim tasks with find_one_and_update, which is atomic, so any
+    number of worker processes or nodes share the queue without a
+    coordinator. A claimed task is leased for lease_seconds and the lease is
+    extended by heartbeats; tasks of crashed workers become claimable again
+    once their lease expires.
+    """
+
+    def __init__(self, lease_seconds: float = 120, max_attempts: int = 5, retry_seconds: float = 60) -> None:
+        """
+        Initialize crawl queue.
+
+        Args:
+            lease_seconds (float, optional): lease of a claimed task. Defaults to 120.
+            max_attempts (int, optional): claims before a task is failed. Defaults to 5.
+            retry_seconds (float, optional): backoff before a failed task is retried,
+                doubled on every attempt. Defaults to 60.
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+
+    @property
+    def collection(self):
+        return CrawlTask.get_motor_collection()
+
+    async def enqueue(self, tasks: List[dict]) -> int:
+        """
+        Add tasks, tasks with a key already queued (or recently finished) are skipped.
+
+        Args:
+            tasks (List[dict]): tasks built by query_task or article_task.
+
+        Returns:
+            int: number of new tasks.
+        """
+        if not tasks:
+            return 0
+        now = datetime.now()
+        docs = [
+            {**task, "status": TaskStatus.pending.value, "owner": None, "lease_until": now,
+             "attempts": 0, "error": None, "created_at": now, "finished_at": None}
+            for task in tasks
+        ]
+        try:
+            result = await self.collection.insert_many(docs, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error["code"] != DUPLICATE_KEY for error in errors):
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def claim(self, owner: str) -> Optional[dict]:
+        """
+        Claim the next available task.
+
+        A task whose lease expired after max_attempts (its worker crashed or
+        hung on it every time) is failed instead of claimed again.
+
+        Args:
+            owner (str): worker id.
+
+        Returns:
+            Optional[dict]: leased task, None when nothing is available.
+        """
+        now = datetime.now()
+        await self.collection.update_many(
+            {
+                "status": TaskStatus.leased.value,
+                "lease_until": {"$lte": now},
+                "attempts": {"$gte": self.max_attempts},
+            },
+            {
+                "$set": {
+                    "status": TaskStatus.failed.value,
+                    "owner": None,
+                    "error": "lease expired on the last attempt",
+                    "finished_at": now,
+                }
+            },
+        )
+        return await self.collection.find_one_and_update(
+            {
+                "status": {"$in": [TaskStatus.pending.value, TaskStatus.leased.value]},
+                "lease_until": {"$lte": now},
+                "attempts": {"$lt": self.max_attempts},
+            },
+            {
+                "$set": {
+                    "status": TaskStatus.leased.value,
+                    "owner": owner,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("lease_until", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def heartbeat(self, task: dict, owner: str) -> None:
+        """
+        Extend the lease of a task.
+
+        Raises:
+            LeaseLost: the task is no longer leased by owner.
+        """
+        result = await self.collection.update_one(
+            {"_id": task["_id"], "owner": owner, "status": TaskStatus.leased.value},
+            {"$set": {"lease_until": datetime.now() + timedelta(seconds=self.lease_seconds)}},
+        )
+        if result.matched_count == 0:
+            raise LeaseLost(task["key"])
+
+    async def complete(self, task: dict, owner: str) -> None:
+        """Mark a task done, ignored when the lease was lost."""
+        await self.collection.update_one(
+            {"_id": task["_id"], "owner": owner},
+            {"$set": {"status": TaskStatus.done.value, "owner": None, "finished_at": datetime.now()}},
+        )
+
+    async def fail(self, task: dict, owner: str, error: str) -> None:
+        """Release a task for a retry with backoff, or fail it after max_attempts."""
+        now = datetime.now()
+        if task["attempts"] >= self.max_attempts:
+            update = {"status": TaskStatus.failed.value, "finished_at": now}
+        else:
+            backoff = self.retry_seconds * 2 ** (task["attempts"] - 1)
+            update = {"status": TaskStatus.pending.value, "lease_until": now + timedelta(seconds=backoff)}
+        await self.collection.update_one(
+            {"_id": task["_id"], "owner": owner},
+            {"$set": {**update, "owner": None, "error": error}},
+        )
+
+    async def stats(self) -> dict:
+        """Count tasks by type and status."""
+        counts = {}
+        async for row in self.collection.aggregate(
+            [{"$group": {"_id": {"type": "$type", "status": "$status"}, "count": {"$sum": 1}}}]
+        ):
+            counts.setdefault(row["_id"]["type"], {})[row["_id"]["status"]] = row["count"]
+        return counts
+
+
+class QueueEngine:
+    """
+    Queue a backfill as (query, day) tasks and work the shared queue.
+
+    A query task searches one day and queues an article task per new
+    result, an article task scrapes, classifies and stores one url. Workers
+    only talk to Mongo, so adding processes or nodes adds throughput.
+    """
+
+    def __init__(self, cfg: DictConfig, engine: Optional[NewsEngine] = None) -> None:
+        """
+        Initialize queue engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the queue and engine groups.
+            engine (NewsEngine, optional): news engine. Defaults to a new one
+                when working the queue.
+        """
+        self.cfg = cfg
+        self.engine = engine
+        self.queue = CrawlQueue(cfg.queue.lease_seconds, cfg.queue.max_attempts, cfg.queue.retry_seconds)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.processed = 0
+        self.failed = 0
+
+    async def enqueue(self) -> dict:
+        """
+        Queue a (query, day) task for every configured query and day in
+        [queue.start_date, queue.end_date).
+
+        Returns:
+            dict: queued tasks.
+        """
+        start_date = date.fromisoformat(str(self.cfg.queue.start_date))
+        end_date = date.fromisoformat(str(self.cfg.queue.end_date)) if self.cfg.queue.end_date else date.today() + timedelta(days=1)
+        tasks = []
+        for query in self.cfg.queue.queries:
+            day = start_date
+            while day < end_date:
+                tasks.append(query_task(query, day, self.cfg.queue.limit_per_day))
+                day += timedelta(days=1)
+        queued = await self.queue.enqueue(tasks)
+        log.log(24, f"Queued {queued} query tasks, {len(tasks) - queued} already queued")
+        return {"queued": queued, "duplicates": len(tasks) - queued}
+
+    async def process(self, task: dict) -> None:
+        """Run a claimed task."""
+        payload = task["payload"]
+        if task["type"] == TaskType.query.value:
+            news_result = await self.engine.search_cached(
+                payload["query"], date.fromisoformat(payload["day"]), payload["limit"]
+            )
+            news_result = await self.engine.unstored(news_result)
+            news_result = await self.engine.unstored(await self.engine.canonicalize(news_result))
+            queued = await self.queue.enqueue([article_task(news) for news in news_result])
+            log.log(24, f"Queued {queued} articles for {task['key']}")
+            return
+
+        news = payload["news"]
+        if await self.engine.unstored([news]):
+            await self.engine.process(news)
+
+    async def run_task(self, task: dict) -> None:
+        """Run a task while a heartbeat keeps its lease alive."""
+        work = asyncio.create_task(self.process(task))
+        try:
+            while True:
+                done, _ = await asyncio.wait({work}, timeout=self.cfg.queue.heartbeat_seconds)
+                if done:
+                    break
+                await self.queue.heartbeat(task, self.owner)
+            work.result()
+            await self.queue.complete(task, self.owner)
+            self.processed += 1
+        except LeaseLost:
+            log.error(f"Lease lost, task abandoned: {task['key']}")
+        except CircuitOpen as e:
+            # the publisher is failing, retry after the backoff
+            self.failed += 1
+            await self.queue.fail(task, self.owner, repr(e))
+        except ArticleException as e:
+            # the article can not be downloaded or parsed, retrying will not help
+            self.failed += 1
+            await self.queue.fail({**task, "attempts": self.queue.max_attempts}, self.owner, repr(e))
+        except Exception as e:
+            self.failed += 1
+            log.error(f"Task {task['key']} failed (attempt {task['attempts']}): {e}")
+            await self.queue.fail(task, self.owner, repr(e))
+        finally:
+            # the heartbeat failed or the lease was lost, the work must not go on unleased
+            work.cancel()
+
+    async def work(self) -> dict:
+        """
+        Claim and run tasks, queue.concurrency at a time, until the queue is
+        empty when queue.exit_when_empty is set.
+
+        Returns:
+            dict: processed and failed tasks.
+        """
+        self.engine = self.engine or NewsEngine(self.cfg)
+        log.log(24, f"Queue worker {self.owner} started")
+        running = set()
+        while True:
+            while len(running) < self.cfg.queue.concurrency:
+                task = await self.queue.claim(self.owner)
+                if task is None:
+                    break
+                running.add(asyncio.create_task(self.run_task(task)))
+            if running:
+                _, running = await asyncio.wait(
+                    running, timeout=self.cfg.queue.poll_seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+            elif self.cfg.queue.exit_when_empty:
+                break
+            else:
+                await asyncio.sleep(self.cfg.queue.poll_seconds)
+        return {"owner": self.owner, "processed": self.processed, "failed": self.failed}
+
+    async def run(self) -> dict:
+        """
+        Run the configured action and write the report.
+
+        Returns:
+            dict: report.
+        """
+        action = self.cfg.queue.action
+        start = t.monotonic()
+        report = {"action": action}
+        if action == "enqueue":
+            report.update(await self.enqueue())
+        elif action == "work":
+            report.update(await self.work())
+        elif action != "report":
+            raise ValueError(f"Unknown queue action: {action}, choose from enqueue, work, report")
+        report["tasks"] = await self.queue.stats()
+        report["elapsed_ms"] = t.elapsed(start)
+
+        path = ROOT / self.cfg.queue.report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        log.log(24, f"Queue {action}: {report['tasks']} - {report['elapsed_ms']}ms, report saved to {path}")
+        return report
@@ -0,0 +1,169 @@
+"""Google News redirect resolution with a persistent redirect -> canonical url mapping."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import requests
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+import src.utils.metrics as metrics
+import src.utils.timer as t
+from src.database.cache import cache
+from src.engine.download_scheduler import domain_of
+from src.schema.database.redirect_schema import ResolvedUrl
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# duplicate key, the link is already stored
+DUPLICATE_KEY = 11000
+
+
+def resolve_redirect(session: requests.Session, url: str, timeout: float) -> str:
+    """
+    Follow the redirects of an url without downloading the final page.
+
+    Args:
+        session (requests.Session): http session.
+        url (str): redirect link.
+        timeout (float): timeout in seconds per request.
+
+    Returns:
+        str: final url.
+
+    Raises:
+        requests.RequestException: the url can not be resolved.
+    """
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    if response.status_code in (403, 405, 501):
+        # servers refusing HEAD, stream so only the headers are read
+        response = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+        response.close()
+    response.raise_for_status()
+    return response.url
+
+
+class RedirectResolver:
+    """
+    Resolve redirect links (news.google.com) to canonical publisher urls once.
+
+    Mappings are read from the shared cache, then from ResolvedUrls, and
+    only unknown links pay the redirect hops. Links of other hosts and
+    links that fail to resolve, or resolve to another Google page, are
+    returned unchanged; failed links are kept in the redirect_failed cache
+    namespace and not tried again until it expires.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        hosts: List[str] = None,
+        user_agent: str = None,
+        timeout: float = 5,
+        concurrency: int = 8,
+    ) -> None:
+        """
+        Initialize redirect resolver.
+
+        Args:
+            enabled (bool, optional): resolve redirect links. Defaults to True.
+            hosts (List[str], optional): hosts of redirect links. Defaults to news.google.com.
+            user_agent (str, optional): browser user agent.
+            timeout (float, optional): timeout in seconds per request. Defaults to 5.
+            concurrency (int, optional): links resolved at the same time. Defaults to 8.
+        """
+        self.enabled = enabled
+        self.hosts = set(hosts or ["news.google.com"])
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.session = requests.Session()
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+    def is_redirect(self, url: str) -> bool:
+        return urlparse(url).netloc in self.hosts
+
+    def is_canonical(self, url: str) -> bool:
+        """Check whether a resolved url left Google (e.g. not a consent page or another redirect link)."""
+        return urlparse(url).netloc.lower() not in self.hosts and not domain_of(url).startswith("google.")
+
+    async def resolve_one(self, url: str) -> str:
+        async with self.semaphore:
+            try:
+                canonical = await asyncio.to_thread(resolve_redirect, self.session, url, self.timeout)
+            except requests.RequestException as e:
+                log.error(f"Cannot resolve {url}: {e}")
+                return url
+        if not self.is_canonical(canonical):
+            # not cached nor stored, the link is resolved again next time
+            log.error(f"Cannot resolve {url}: redirected to {canonical}")
+            return url
+        return canonical
+
+    async def resolve(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Map redirect links to canonical urls.
+
+        Args:
+            urls (List[str]): urls, links of other hosts are skipped.
+
+        Returns:
+            Dict[str, str]: canonical url of every resolved redirect link.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url and self.is_redirect(url)))
+        if not self.enabled or not urls:
+            return {}
+        cached = await cache.get_many("redirect", urls)
+        resolved = {url: canonical for url, canonical in zip(urls, cached) if canonical is not None}
+
+        missing = [url for url in urls if url not in resolved]
+        if missing:
+            with t.span("mongo"):
+                async for doc in ResolvedUrl.get_motor_collection().find(
+                    {"url": {"$in": missing}}, {"url": 1, "canonical": 1}
+                ):
+                    resolved[doc["url"]] = doc["canonical"]
+            found = {url: resolved[url] for url in missing if url in resolved}
+            await cache.set_many("redirect", found)
+
+        missing = [url for url in urls if url not in resolved]
+        if missing:
+            failed = await cache.get_many("redirect_failed", missing)
+            missing = [url for url, failure in zip(missing, failed) if failure is None]
+        if missing:
+            with metrics.timed("resolve"):
+                canonicals = await asyncio.gather(*[self.resolve_one(url) for url in missing])
+            new = {url: canonical for url, canonical in zip(missing, canonicals) if canonical != url}
+            await cache.set_many("redirect_failed", {url: True for url in missing if url not in new})
+            if new:
+                now = datetime.now()
+                writes = [
+                    UpdateOne(
+                        {"url": url},
+                        {"$setOnInsert": {"canonical": canonical, "resolved_at": now}},
+                        upsert=True,
+                    )
+                    for url, canonical in new.items()
+                ]
+                with t.span("mongo"):
+                    try:
+                        await ResolvedUrl.get_motor_collection().bulk_write(writes, ordered=False)
+                    except BulkWriteError as e:
+                        # another worker resolved the same link first
+                        if any(error["code"] != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+                            raise
+                await cache.set_many("redirect", new)
+                resolved.update(new)
+        return resolved
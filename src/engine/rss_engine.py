@@ -0,0 +1,229 @@
+"""RSS / Atom ingestion engine (publisher feeds with conditional GET)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import re
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import urlparse
+
+import feedparser
+import requests
+from bs4 import BeautifulSoup
+from newspaper.article import ArticleException
+from omegaconf import DictConfig
+
+import src.utils.metrics as metrics
+import src.utils.timer as t
+from src.engine.download_scheduler import CircuitOpen
+from src.engine.news_engine import NewsEngine, skipped_article
+from src.schema.database.feed_schema import RssFeed
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+# skipped entries worth downloading again on the next poll
+RETRY_REASONS = ("circuit_open", "download")
+
+
+def keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """
+    Build a case insensitive whole word pattern of keywords.
+
+    Examples:
+        >>> bool(keyword_pattern(["anies", "cak imin"]).search("Cak Imin kampanye di Jateng"))
+        True
+    """
+    words = sorted({" ".join(keyword.lower().split()) for keyword in keywords}, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(word) for word in words) + r")\b", re.IGNORECASE)
+
+
+def fetch_feed(url: str, etag: Optional[str], modified: Optional[str], user_agent: str, timeout: float) -> dict:
+    """
+    Download a feed with a conditional GET.
+
+    Args:
+        url (str): feed url.
+        etag (str, optional): ETag of the last download.
+        modified (str, optional): Last-Modified of the last download.
+        user_agent (str): browser user agent.
+        timeout (float): timeout in seconds.
+
+    Returns:
+        dict: status, etag, modified and parsed feed (None when not modified).
+
+    Raises:
+        requests.RequestException: the feed can not be downloaded.
+    """
+    headers = {"User-Agent": user_agent}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return {"status": 304, "etag": etag, "modified": modified, "feed": None}
+    response.raise_for_status()
+    return {
+        "status": response.status_code,
+        "etag": response.headers.get("ETag"),
+        "modified": response.headers.get("Last-Modified"),
+        "feed": feedparser.parse(response.content),
+    }
+
+
+def entry_news(entry: dict, feed: dict, publisher: Optional[str] = None) -> dict:
+    """
+    Map a feed entry to the GNews result shape.
+
+    Args:
+        entry (dict): feedparser entry.
+        feed (dict): feedparser feed (channel) fields.
+        publisher (str, optional): publisher title. Defaults to the feed title.
+
+    Returns:
+        dict: title, description, published_date, url and publisher.
+    """
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    link = feed.get("link") or entry["link"]
+    site = urlparse(link)
+    return {
+        "title": entry.get("title", ""),
+        "description": BeautifulSoup(entry.get("summary", ""), "html.parser").get_text(" ", strip=True),
+        "published_date": datetime(*parsed[:6]) if parsed else None,
+        "url": entry["link"],
+        "publisher": {
+            "href": f"{site.scheme}://{site.netloc}",
+            "title": publisher or feed.get("title") or site.netloc,
+        },
+    }
+
+
+class RssEngine:
+    """
+    Poll publisher feeds and ingest entries mentioning a keyword.
+
+    Feeds are downloaded with a conditional GET, an unchanged feed costs a
+    304 and nothing else. Matching entries go through the scrape, classify
+    and store pipeline of the news engine, already stored urls are skipped.
+    """
+
+    def __init__(self, cfg: DictConfig, engine: Optional[NewsEngine] = None) -> None:
+        """
+        Initialize rss engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the rss and engine groups.
+            engine (NewsEngine, optional): news engine. Defaults to a new one.
+        """
+        self.cfg = cfg
+        self.engine = engine or NewsEngine(cfg)
+        self.pattern = keyword_pattern(cfg.rss.keywords)
+        self.semaphore = asyncio.Semaphore(cfg.rss.concurrency)
+
+    def matches(self, news: dict) -> bool:
+        """Check whether the title or description of an entry mentions a keyword."""
+        return bool(self.pattern.search(f"{news['title']}\n{news['description']}"))
+
+    async def poll(self, feed: RssFeed) -> int:
+        """
+        Poll a feed and ingest its new matching entries.
+
+        Args:
+            feed (RssFeed): registered feed.
+
+        Returns:
+            int: number of stored documents.
+        """
+        async with self.semaphore:
+            start = t.monotonic()
+            stored = 0
+            feed.last_polled_at = datetime.now()
+            try:
+                with metrics.timed("feed"):
+                    result = await asyncio.to_thread(
+                        fetch_feed,
+                        feed.url,
+                        feed.etag,
+                        feed.modified,
+                        self.cfg.engine.user_agent,
+                        self.cfg.rss.timeout,
+                    )
+                feed.last_status = result["status"]
+                feed.last_error = None
+                metrics.cache_result("feed", result["feed"] is None)
+                if result["feed"] is None:
+                    await feed.save()
+                    return 0
+
+                entries = [entry for entry in result["feed"].entries if entry.get("link")]
+                news_result = [entry_news(entry, result["feed"].feed, feed.publisher) for entry in entries]
+                news_result = [news for news in news_result if self.matches(news)]
+                feed.last_entries, feed.last_matched = len(entries), len(news_result)
+                metrics.FETCH_QUEUE.inc(len(news_result))
+                news_result = await self.engine.unstored(news_result)
+                metrics.FETCH_QUEUE.dec(feed.last_matched - len(news_result))
+                skipped = []
+                for news in news_result:
+                    try:
+                        await self.engine.process(news)
+                        stored += 1
+                    except CircuitOpen as e:
+                        skipped.append(skipped_article(news, "circuit_open", e))
+                    except (ArticleException, AttributeError) as e:
+                        log.error(f"Cannot ingest {news['url']}: {e}")
+                        reason = "download" if isinstance(e, ArticleException) else "parse"
+                        skipped.append(skipped_article(news, reason, e))
+                    finally:
+                        metrics.FETCH_QUEUE.dec()
+                await self.engine.record_skipped(skipped, "rss")
+                # keep the old validators while entries can be retried, the next poll
+                # downloads the feed again instead of getting a 304
+                if not any(item["reason"] in RETRY_REASONS for item in skipped):
+                    feed.etag, feed.modified = result["etag"], result["modified"]
+            except Exception as e:
+                log.error(f"Feed {feed.url} failed: {e}")
+                feed.last_error = repr(e)
+            feed.last_stored = stored
+            await feed.save()
+            log.log(
+                24,
+                f"Polled {feed.url}: {feed.last_matched}/{feed.last_entries} entries matched, "
+                f"{stored} new documents - {t.elapsed(start)}ms",
+            )
+            return stored
+
+    async def register(self) -> List[RssFeed]:
+        """Register configured feeds, validators of known feeds are kept."""
+        feeds = []
+        for item in self.cfg.rss.feeds:
+            url = item if isinstance(item, str) else item.url
+            publisher = None if isinstance(item, str) else item.get("publisher")
+            feed = await RssFeed.find_one(RssFeed.url == url) or RssFeed(url=url)
+            feed.publisher = publisher
+            await feed.save()
+            feeds.append(feed)
+        return feeds
+
+    async def run(self) -> None:
+        """Register configured feeds then poll them every rss.interval_minutes."""
+        feeds = await self.register()
+        if not feeds:
+            log.error("No feeds configured, set rss.feeds")
+            return
+        while True:
+            start = t.monotonic()
+            stored = sum(await asyncio.gather(*[self.poll(feed) for feed in feeds]))
+            if self.cfg.rss.once:
+                break
+            wait = max(0.0, self.cfg.rss.interval_minutes * 60 - t.elapsed(start) / 1000)
+            log.log(24, f"Feed poll stored {stored} documents, next poll in {wait:.0f}s")
+            await asyncio.sleep(wait)
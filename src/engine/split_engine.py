@@ -0,0 +1,186 @@
+"""Article body layout migration engine (inline <-> ArticleBodies collection)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import json
+
+from omegaconf import DictConfig
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+import src.utils.compression as compression
+import src.utils.timer as t
+from src.database.article_body import article_bodies
+from src.engine.compress_engine import BODY_PROJECTION, body_size, collection_stats
+from src.schema.database.article_schema import ArticleBody, GoogleNews
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+SPLIT_PROJECTION = {**BODY_PROJECTION, "article.detached": 1}
+
+
+class SplitEngine:
+    """Move article bodies of existing GoogleNews documents to ArticleBodies and back."""
+
+    def __init__(self, cfg: DictConfig) -> None:
+        """
+        Initialize split engine.
+
+        Args:
+            cfg (DictConfig): main config, uses the split group and
+                database.mongodb.body_storage.
+        """
+        self.cfg = cfg
+        self.news = GoogleNews.get_motor_collection()
+        self.bodies = ArticleBody.get_motor_collection()
+
+    async def stats(self) -> dict:
+        """Get size statistics of the GoogleNews and ArticleBodies collections."""
+        return {
+            "news": await collection_stats(self.news),
+            "bodies": await collection_stats(self.bodies),
+        }
+
+    async def flush(self, body_requests: list, news_requests: list, collection=None) -> None:
+        """Write bodies before the news documents, a news document never points to a missing body."""
+        if body_requests:
+            await self.bodies.bulk_write(body_requests, ordered=False)
+        if news_requests:
+            await (collection if collection is not None else self.news).bulk_write(news_requests, ordered=False)
+        body_requests.clear()
+        news_requests.clear()
+
+    async def split(self, collection=None) -> dict:
+        """
+        Move bodies of inline documents to ArticleBodies.
+
+        Inline compressed bodies are decompressed first and compressed again
+        in the body document when body compression is enabled.
+
+        Args:
+            collection (AsyncIOMotorCollection, optional): GoogleNews or a partition.
+                Defaults to GoogleNews.
+
+        Returns:
+            dict: documents, skipped and news body bytes before and after.
+        """
+        collection = collection if collection is not None else self.news
+        report = {"documents": 0, "skipped": 0, "body_bytes_before": 0, "body_bytes_after": 0}
+        body_requests, news_requests = [], []
+        async for doc in collection.find({"article.detached": None}, SPLIT_PROJECTION):
+            await compression.bodies.prepare([doc])
+            try:
+                plain = compression.bodies.expand(doc.get("article") or {})
+            except KeyError:
+                report["skipped"] += 1
+                continue
+            article, body = article_bodies.split_article(plain, separate=True)
+            report["documents"] += 1
+            report["body_bytes_before"] += body_size(doc.get("article") or {})
+            report["body_bytes_after"] += body_size(article)
+            body_requests.append(ReplaceOne({"_id": doc["_id"]}, {"_id": doc["_id"], **body}, upsert=True))
+            news_requests.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {
+                            "article.text": article["text"],
+                            "article.summary": article.get("summary") or "",
+                            "article.detached": article["detached"],
+                        },
+                        "$unset": {"article.compressed": ""},
+                    },
+                )
+            )
+            if len(news_requests) >= self.cfg.split.batch_size:
+                await self.flush(body_requests, news_requests, collection)
+        await self.flush(body_requests, news_requests, collection)
+        return report
+
+    async def join(self) -> dict:
+        """
+        Move bodies from ArticleBodies back into their GoogleNews documents.
+
+        Bodies are restored plain, run mode=compress afterwards to compress
+        them inline.
+
+        Returns:
+            dict: documents, skipped and news body bytes before and after.
+        """
+        report = {"documents": 0, "skipped": 0, "body_bytes_before": 0, "body_bytes_after": 0}
+        news_requests, delete_requests = [], []
+        async for doc in self.news.find({"article.detached": {"$ne": None}}, SPLIT_PROJECTION):
+            before = body_size(doc["article"])
+            await article_bodies.attach([doc])
+            try:
+                article = compression.bodies.expand(doc["article"])
+            except KeyError:
+                report["skipped"] += 1
+                continue
+            report["documents"] += 1
+            report["body_bytes_before"] += before
+            report["body_bytes_after"] += body_size(article)
+            news_requests.append(
+                UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {"article.text": article["text"], "article.summary": article["summary"]},
+                        "$unset": {"article.detached": "", "article.compressed": ""},
+                    },
+                )
+            )
+            delete_requests.append(DeleteOne({"_id": doc["_id"]}))
+            if len(news_requests) >= self.cfg.split.batch_size:
+                await self.flush_join(news_requests, delete_requests)
+        await self.flush_join(news_requests, delete_requests)
+        return report
+
+    async def flush_join(self, news_requests: list, delete_requests: list) -> None:
+        """Write the news documents before dropping bodies, a body is only dropped once it is back inline."""
+        if news_requests:
+            await self.news.bulk_write(news_requests, ordered=False)
+            await self.bodies.bulk_write(delete_requests, ordered=False)
+        news_requests.clear()
+        delete_requests.clear()
+
+    async def run(self) -> dict:
+        """
+        Run the configured action and write the size report.
+
+        Returns:
+            dict: size report.
+        """
+        action = self.cfg.split.action
+        start = t.monotonic()
+        report = {"action": action, "fields": article_bodies.fields, "collections_before": await self.stats()}
+        if action == "split":
+            if not article_bodies.separate:
+                raise ValueError("Enable database.mongodb.body_storage.separate before splitting bodies")
+            report.update(await self.split())
+        elif action == "join":
+            report.update(await self.join())
+        elif action != "report":
+            raise ValueError(f"Unknown split action: {action}, choose from split, join, report")
+        report["collections_after"] = await self.stats()
+        report["elapsed_ms"] = t.elapsed(start)
+
+        path = ROOT / self.cfg.split.report
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        before, after = report["collections_before"], report["collections_after"]
+        log.log(
+            22,
+            f"Split {action}: {report.get('documents', 0)} documents, "
+            f"news avg document {before['news']['avg_obj_size']} -> {after['news']['avg_obj_size']} bytes, "
+            f"news size {before['news']['size']} -> {after['news']['size']} bytes, "
+            f"bodies size {before['bodies']['size']} -> {after['bodies']['size']} bytes, "
+            f"report saved to {path}",
+        )
+        return report
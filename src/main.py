@@ -16,6 +16,13 @@ from omegaconf import DictConfig
 
 from src.utils.logger import get_logger
 from src.api.main_api import main_api
+from src.engine.main_ingest import main_ingest
+from src.engine.main_crawler import main_crawler
+from src.engine.main_compress import main_compress
+from src.engine.main_split import main_split
+from src.engine.main_partition import main_partition
+from src.engine.main_queue import main_queue
+from src.engine.main_rss import main_rss
 log = get_logger()
 
 
@@ -26,5 +33,19 @@ if __name__ == "__main__":
         """Main function."""
         if cfg.mode == "api":
             main_api(cfg)
+        elif cfg.mode == "ingest":
+            main_ingest(cfg)
+        elif cfg.mode == "crawler":
+            main_crawler(cfg)
+        elif cfg.mode == "queue":
+            main_queue(cfg)
+        elif cfg.mode == "rss":
+            main_rss(cfg)
+        elif cfg.mode == "compress":
+            main_compress(cfg)
+        elif cfg.mode == "split":
+            main_split(cfg)
+        elif cfg.mode == "partition":
+            main_partition(cfg)
 
     main()
\ No newline at end of file
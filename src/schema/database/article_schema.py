@@ -11,6 +11,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from enum import Enum
 from typing import Any, List, Optional
 
@@ -22,6 +23,14 @@ class Sentiment(str, Enum):
     neutral = "neutral"
     unknown = "unknown"
 
+class CompressedBody(BaseModel):
+    """Compressed article text and summary, see src.utils.compression."""
+
+    codec: str = Field(...)
+    dict_id: Optional[str] = Field(None)
+    text: bytes = Field(...)
+    summary: Optional[bytes] = Field(None)
+
 class Article(BaseModel):
     title: str = Field(...)
     text: str = Field(...)
@@ -29,6 +38,20 @@ class Article(BaseModel):
     publish_date: Optional[datetime] = Field(None)
     keywords: List[str] = Field(None)
     sentiment: Sentiment = Field(Sentiment.unknown)
+    # text and summary are empty when the body is stored compressed
+    compressed: Optional[CompressedBody] = Field(None)
+    # body fields stored in the ArticleBodies collection, see src.database.article_body
+    detached: Optional[List[str]] = Field(None)
+
+class ArticleBody(Document):
+    """Article text (and optionally summary) stored apart from GoogleNews, same _id."""
+
+    text: Optional[str] = Field(None)
+    summary: Optional[str] = Field(None)
+    compressed: Optional[CompressedBody] = Field(None)
+
+    class Settings:
+        name = "ArticleBodies"
 
 class GoogleNews(Document):
     title: str = Field(...)
@@ -38,5 +61,16 @@ class GoogleNews(Document):
     publisher: Optional[Any] = Field(None)
     article: Article = Field(...)
 
+    class Settings:
+        # keyset pagination of /api/news/list sorts on (published_date, _id),
+        # equality filters lead so filtered pages walk the index in order
+        indexes = [
+            IndexModel([("published_date", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("article.sentiment", ASCENDING), ("published_date", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("publisher.title", ASCENDING), ("published_date", DESCENDING), ("_id", DESCENDING)]),
+            # stored url lookups (unstored) of every fetch, crawl, queue task and feed poll
+            IndexModel("url"),
+        ]
+
     class Config:
         arbitrary_types_allowed = True
\ No newline at end of file
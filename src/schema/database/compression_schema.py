@@ -0,0 +1,29 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+
+class CompressionDictionary(Document):
+    """Compression dictionary trained on article bodies, shared by every worker."""
+
+    dict_id: str = Field(...)
+    codec: str = Field(...)
+    data: bytes = Field(...)
+    samples: int = Field(...)
+    created_at: datetime = Field(...)
+
+    class Settings:
+        name = "CompressionDictionaries"
+        indexes = ["dict_id"]
+
+    class Config:
+        arbitrary_types_allowed = True
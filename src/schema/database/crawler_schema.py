@@ -0,0 +1,36 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import date, datetime
+from typing import Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class CrawlQuery(Document):
+    """Query crawled by the scheduler, watermark is the last day fully fetched."""
+
+    query: str = Field(...)
+    limit_per_day: int = Field(20)
+    start_date: Optional[date] = Field(None)
+    watermark: Optional[date] = Field(None)
+    enabled: bool = Field(True)
+    last_run_at: Optional[datetime] = Field(None)
+    last_status: Optional[str] = Field(None)
+    last_error: Optional[str] = Field(None)
+    last_stored: int = Field(0)
+
+    class Settings:
+        name = "CrawlQueries"
+        indexes = [IndexModel("query", unique=True)]
+        bson_encoders = {date: lambda d: d.isoformat()}
+
+    class Config:
+        arbitrary_types_allowed = True
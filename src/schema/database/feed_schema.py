@@ -0,0 +1,36 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class RssFeed(Document):
+    """Publisher feed polled by the RSS ingestion, etag and modified are its conditional GET validators."""
+
+    url: str = Field(...)
+    publisher: Optional[str] = Field(None)
+    etag: Optional[str] = Field(None)
+    modified: Optional[str] = Field(None)
+    last_polled_at: Optional[datetime] = Field(None)
+    last_status: Optional[int] = Field(None)
+    last_error: Optional[str] = Field(None)
+    last_entries: int = Field(0)
+    last_matched: int = Field(0)
+    last_stored: int = Field(0)
+
+    class Settings:
+        name = "RssFeeds"
+        indexes = [IndexModel("url", unique=True)]
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -0,0 +1,37 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+from typing import List, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class FetchFlight(Document):
+    """Shared lock of a running fetch, waiters on other workers read the result ids from it."""
+
+    key: str = Field(...)
+    job_id: str = Field(...)
+    owner: str = Field(...)
+    status: str = Field(...)
+    lease_until: datetime = Field(...)
+    result_ids: List[str] = Field([])
+    error: Optional[str] = Field(None)
+    expires_at: datetime = Field(...)
+
+    class Settings:
+        name = "FetchFlights"
+        indexes = [
+            IndexModel("key", unique=True),
+            IndexModel("expires_at", expireAfterSeconds=0),
+        ]
+
+    class Config:
+        arbitrary_types_allowed = True
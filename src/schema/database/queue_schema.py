@@ -0,0 +1,54 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+class TaskType(str, Enum):
+    query = "query"
+    article = "article"
+
+class TaskStatus(str, Enum):
+    pending = "pending"
+    leased = "leased"
+    done = "done"
+    failed = "failed"
+
+class CrawlTask(Document):
+    """Crawl work unit, claimed by queue workers with an expiring lease."""
+
+    key: str = Field(...)
+    type: TaskType = Field(...)
+    payload: Dict[str, Any] = Field(...)
+    status: TaskStatus = Field(TaskStatus.pending)
+    owner: Optional[str] = Field(None)
+    # leased: lease expiry, pending: earliest claim time (retry backoff)
+    lease_until: datetime = Field(...)
+    attempts: int = Field(0)
+    error: Optional[str] = Field(None)
+    created_at: datetime = Field(...)
+    finished_at: Optional[datetime] = Field(None)
+
+    class Settings:
+        name = "CrawlTasks"
+        indexes = [
+            IndexModel("key", unique=True),
+            # claim: pending or expired leased tasks, by lease_until
+            IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)]),
+            # finished tasks are kept a week, long enough to dedupe re-enqueued backfills
+            IndexModel("finished_at", expireAfterSeconds=7 * 24 * 3600),
+        ]
+
+    class Config:
+        arbitrary_types_allowed = True
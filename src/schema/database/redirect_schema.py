@@ -0,0 +1,28 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class ResolvedUrl(Document):
+    """Canonical publisher url of a Google News redirect link."""
+
+    url: str = Field(...)
+    canonical: str = Field(...)
+    resolved_at: datetime = Field(...)
+
+    class Settings:
+        name = "ResolvedUrls"
+        indexes = [IndexModel("url", unique=True)]
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -0,0 +1,37 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class SearchResult(Document):
+    """Google News results of a query for one day, reused until expires_at."""
+
+    key: str = Field(...)
+    query: str = Field(...)
+    day: date = Field(...)
+    max_results: int = Field(...)
+    results: List[Dict[str, Any]] = Field([])
+    fetched_at: datetime = Field(...)
+    expires_at: datetime = Field(...)
+
+    class Settings:
+        name = "SearchResults"
+        indexes = [
+            IndexModel("key", unique=True),
+            IndexModel("expires_at", expireAfterSeconds=0),
+        ]
+        bson_encoders = {date: lambda d: d.isoformat()}
+
+    class Config:
+        arbitrary_types_allowed = True
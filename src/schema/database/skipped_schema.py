@@ -0,0 +1,38 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+class SkippedArticle(Document):
+    """Search result a fetch did not store, with the reason (circuit_open, download, parse, deadline, error)."""
+
+    url: str = Field(...)
+    domain: str = Field(...)
+    reason: str = Field(...)
+    error: Optional[str] = Field(None)
+    source: str = Field(...)
+    job_id: Optional[str] = Field(None)
+    skipped_at: datetime = Field(...)
+
+    class Settings:
+        name = "SkippedArticles"
+        indexes = [
+            "job_id",
+            IndexModel([("domain", 1), ("skipped_at", -1)]),
+            # kept a month, long enough to review failing publishers
+            IndexModel("skipped_at", expireAfterSeconds=30 * 24 * 3600),
+        ]
+
+    class Config:
+        arbitrary_types_allowed = True
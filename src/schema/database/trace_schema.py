@@ -0,0 +1,35 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from beanie import Document
+from pydantic import Field
+
+class FetchTrace(Document):
+    """Trace tree of a slow fetch job, stored in a capped collection."""
+
+    job_id: str = Field(...)
+    query: str = Field(...)
+    start_date: Optional[date] = Field(None)
+    end_date: Optional[date] = Field(None)
+    limit_per_day: Optional[int] = Field(None)
+    started_at: datetime = Field(...)
+    duration_ms: float = Field(...)
+    status: str = Field(...)
+    trace: Dict[str, Any] = Field(...)
+
+    class Settings:
+        name = "FetchTraces"
+        indexes = ["job_id"]
+        bson_encoders = {date: lambda d: d.isoformat()}
+
+    class Config:
+        arbitrary_types_allowed = True
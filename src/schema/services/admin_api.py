@@ -0,0 +1,78 @@
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import date, datetime
+from enum import Enum
+from typing import List, Optional
+
+from fastapi import Form
+from pydantic import BaseModel, Field
+
+from src.schema.database.crawler_schema import CrawlQuery
+
+__all__ = [
+    "ProfilerMode",
+    "StartProfilerRequest",
+    "ProfilerStatus",
+    "ProfilerStatusResponse",
+    "RegisterCrawlQueryRequest",
+    "CrawlQueryResponse",
+    "CrawlQueryListResponse",
+]
+
+class ProfilerMode(str, Enum):
+    sampling = "sampling"
+    cprofile = "cprofile"
+
+class StartProfilerRequest(BaseModel):
+    mode: ProfilerMode = Form(default=ProfilerMode.sampling)
+    seconds: float = Form(default=30)
+    interval: float = Form(default=0.005)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class ProfilerStatus(BaseModel):
+    pid: int = Field(...)
+    running: bool = Field(...)
+    mode: Optional[ProfilerMode] = Field(None)
+    started_at: Optional[str] = Field(None)
+    seconds: float = Field(0)
+    samples: Optional[int] = Field(None)
+    result_bytes: int = Field(0)
+
+class ProfilerStatusResponse(BaseModel):
+    received_at: datetime = Field(datetime.now())
+    result: ProfilerStatus = Field(...)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class RegisterCrawlQueryRequest(BaseModel):
+    query: str = Form(...)
+    limit_per_day: Optional[int] = Form(default=None)
+    start_date: Optional[date] = Form(default=None)
+    enabled: bool = Form(default=True)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class CrawlQueryResponse(BaseModel):
+    received_at: datetime = Field(datetime.now())
+    result: CrawlQuery = Field(...)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class CrawlQueryListResponse(BaseModel):
+    received_at: datetime = Field(datetime.now())
+    result: List[CrawlQuery] = Field([])
+
+    class Config:
+        arbitrary_types_allowed = True
@@ -18,7 +18,8 @@ from typing import List, Union, Optional
 from typing_extensions import Annotated
 import src.utils.timer as t
 
-from src.schema.database.article_schema import GoogleNews
+from src.schema.database.article_schema import GoogleNews, Sentiment
+from src.schema.database.trace_schema import FetchTrace
 
 __all__ = [
     "FetchNewsRequest",
@@ -27,7 +28,10 @@ __all__ = [
     "GetListNewsResponse",
     "GetNewsDetailsRequest",
     "GetNewsDetailsResponse",
-    "NewsResult"
+    "GetFetchTraceRequest",
+    "GetFetchTraceResponse",
+    "NewsResult",
+    "SkippedNews"
 ]
 
 class FetchNewsRequest(BaseModel):
@@ -35,6 +39,7 @@ class FetchNewsRequest(BaseModel):
     limit_per_day: int = Form(default=20)
     start_date: date = Form(...)
     end_date: date = Form(default=date.today())
+    deadline_seconds: Optional[float] = Form(default=None, gt=0)
 
     class Config:
         arbitrary_types_allowed = True
@@ -42,22 +47,38 @@ class FetchNewsRequest(BaseModel):
 class NewsResult(GoogleNews):
     id: str = Field(...)
 
+class SkippedNews(BaseModel):
+    url: str = Field(...)
+    domain: str = Field(...)
+    reason: str = Field(...)
+    error: Optional[str] = Field(None)
+
 class FetchNewsResponse(BaseModel):
     received_at: datetime = Field(datetime.now())
+    job_id: Optional[str] = Field(None)
+    coalesced: bool = Field(False)
+    partial: bool = Field(False)
+    skipped: List[SkippedNews] = Field([])
     result: List[NewsResult] = Field([])
      
     class Config:
         arbitrary_types_allowed = True
 
 class GetListNewsRequest(BaseModel):
-    start_date: date = Form(...)
-    end_date: date = Form(default=None)
+    start_date: Optional[date] = Form(default=None)
+    end_date: Optional[date] = Form(default=None)
+    sentiment: Optional[Sentiment] = Form(default=None)
+    publisher: Optional[str] = Form(default=None)
+    limit: int = Form(default=100, ge=1, le=1000)
+    cursor: Optional[str] = Form(default=None)
+    include_body: bool = Form(default=False)
 
     class Config:
         arbitrary_types_allowed = True
 
 class GetListNewsResponse(BaseModel):
     received_at: datetime = Field(datetime.now())
+    next_cursor: Optional[str] = Field(None)
     result: List[NewsResult] = Field([])
 
     class Config:
@@ -71,7 +92,20 @@ class GetNewsDetailsRequest(BaseModel):
 
 class GetNewsDetailsResponse(BaseModel):
     received_at: datetime = Field(datetime.now())
-    result: GoogleNews = Field(None)
+    result: NewsResult = Field(None)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class GetFetchTraceRequest(BaseModel):
+    job_id: str = Form(...)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class GetFetchTraceResponse(BaseModel):
+    received_at: datetime = Field(datetime.now())
+    result: FetchTrace = Field(None)
 
     class Config:
-        arbitrary_types_allowed = True
\ No newline at end of file
+        arbitrary_types_allowed = True
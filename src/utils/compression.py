@@ -0,0 +1,288 @@
+"""Article body compression utils (zstd or zlib with a dictionary trained on the corpus)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import hashlib
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import zstandard
+
+from src.schema.database.article_schema import CompressedBody, GoogleNews
+from src.schema.database.compression_schema import CompressionDictionary
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+CODECS = ("zstd", "zlib")
+# zlib only looks back 32KB, a larger preset dictionary is wasted
+ZLIB_MAX_DICTIONARY = 32768
+BODY_FIELDS = ("text", "summary")
+
+
+def train_dictionary(codec: str, samples: List[bytes], size: int) -> bytes:
+    """
+    Train a compression dictionary on sample bodies.
+
+    zstd uses its own trainer (COVER). zlib takes raw bytes as preset
+    dictionary, so the most common word trigrams are concatenated with the
+    most common ones last, closest to the data.
+
+    Args:
+        codec (str): zstd or zlib.
+        samples (List[bytes]): sample bodies.
+        size (int): dictionary size in bytes.
+
+    Raises:
+        ValueError: unknown codec or not enough samples.
+
+    Returns:
+        bytes: dictionary.
+    """
+    if codec == "zstd":
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Cannot train zstd dictionary on {len(samples)} samples: {e}")
+    if codec == "zlib":
+        size = min(size, ZLIB_MAX_DICTIONARY)
+        trigrams = Counter()
+        for sample in samples:
+            words = sample.split()
+            trigrams.update(b" ".join(words[i : i + 3]) + b" " for i in range(len(words) - 2))
+        chunks, length = [], 0
+        for trigram, count in trigrams.most_common():
+            if count < 2 or length + len(trigram) > size:
+                break
+            chunks.append(trigram)
+            length += len(trigram)
+        return b"".join(reversed(chunks))
+    raise ValueError(f"Unknown codec: {codec}, choose from {CODECS}")
+
+
+def dictionary_id(codec: str, dictionary: Optional[bytes]) -> Optional[str]:
+    """Content hash of a dictionary, None without dictionary."""
+    if not dictionary:
+        return None
+    return hashlib.sha1(codec.encode() + dictionary).hexdigest()[:16]
+
+
+class BodyCodec:
+    """Compress and decompress text with one codec and dictionary."""
+
+    def __init__(self, codec: str = "zstd", level: int = 3, dictionary: Optional[bytes] = None) -> None:
+        """
+        Initialize body codec.
+
+        Args:
+            codec (str, optional): zstd or zlib. Defaults to "zstd".
+            level (int, optional): compression level. Defaults to 3.
+            dictionary (bytes, optional): trained dictionary.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}, choose from {CODECS}")
+        self.codec = codec
+        self.level = level
+        self.dictionary = dictionary or None
+        self.dict_id = dictionary_id(codec, self.dictionary)
+        if codec == "zstd":
+            dict_data = zstandard.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+            self._compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    def compress(self, text: str) -> bytes:
+        data = text.encode()
+        if self.codec == "zstd":
+            return self._compressor.compress(data)
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> str:
+        if self.codec == "zstd":
+            return self._decompressor.decompress(data).decode()
+        if self.dictionary:
+            return zlib.decompressobj(zdict=self.dictionary).decompress(bytes(data)).decode()
+        return zlib.decompress(data).decode()
+
+
+class BodyCompression:
+    """
+    Compression of article text and summary in GoogleNews documents.
+
+    Writes use the active codec (newest dictionary of the configured codec),
+    reads pick the codec by the dict_id stored in the document, so documents
+    compressed with older dictionaries stay readable.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.codec = "zstd"
+        self.level = 3
+        self.min_length = 256
+        self.active: Optional[BodyCodec] = None
+        self.codecs: Dict[tuple, BodyCodec] = {}
+
+    async def configure(
+        self,
+        enabled: bool = False,
+        codec: str = "zstd",
+        level: int = 3,
+        min_length: int = 256,
+        **kwargs,
+    ) -> None:
+        """
+        Configure compression of new documents, call after init_beanie.
+
+        Args:
+            enabled (bool, optional): compress bodies of new documents. Defaults to False.
+            codec (str, optional): zstd or zlib. Defaults to "zstd".
+            level (int, optional): compression level. Defaults to 3.
+            min_length (int, optional): keep shorter bodies (bytes) uncompressed. Defaults to 256.
+            **kwargs: training options used by the compress mode.
+        """
+        self.enabled = enabled
+        self.codec = codec
+        self.level = level
+        self.min_length = min_length
+        self.active = await self.load_active()
+        if enabled:
+            log.log(22, f"Article body compression: {codec} level {level}, dictionary {self.active.dict_id}")
+
+    async def load_active(self) -> BodyCodec:
+        """Load the newest dictionary of the configured codec, plain codec without one."""
+        dictionary = await CompressionDictionary.find(
+            CompressionDictionary.codec == self.codec
+        ).sort("-created_at").first_or_none()
+        codec = BodyCodec(self.codec, self.level, dictionary.data if dictionary else None)
+        self.codecs[(codec.codec, codec.dict_id)] = codec
+        return codec
+
+    async def add_dictionary(self, codec: str, data: bytes, samples: int) -> CompressionDictionary:
+        """
+        Save a trained dictionary and make it the active one.
+
+        Args:
+            codec (str): zstd or zlib.
+            data (bytes): dictionary.
+            samples (int): number of sample bodies it was trained on.
+
+        Returns:
+            CompressionDictionary: saved dictionary.
+        """
+        dictionary = CompressionDictionary(
+            dict_id=dictionary_id(codec, data),
+            codec=codec,
+            data=data,
+            samples=samples,
+            created_at=datetime.now(),
+        )
+        await dictionary.insert()
+        self.codec = codec
+        self.active = BodyCodec(codec, self.level, data)
+        self.codecs[(codec, self.active.dict_id)] = self.active
+        return dictionary
+
+    async def prepare(self, docs: Iterable[dict]) -> None:
+        """
+        Load codecs of compressed documents not seen by this worker yet.
+
+        Args:
+            docs (Iterable[dict]): raw GoogleNews documents.
+        """
+        missing = set()
+        for doc in docs:
+            compressed = (doc.get("article") or {}).get("compressed")
+            if compressed and (compressed["codec"], compressed.get("dict_id")) not in self.codecs:
+                missing.add((compressed["codec"], compressed.get("dict_id")))
+        for codec, dict_id in missing:
+            dictionary = None
+            if dict_id is not None:
+                dictionary = await CompressionDictionary.find_one(CompressionDictionary.dict_id == dict_id)
+                if dictionary is None:
+                    log.error(f"Compression dictionary not found: {dict_id}")
+                    continue
+            self.codecs[(codec, dict_id)] = BodyCodec(codec, self.level, dictionary.data if dictionary else None)
+
+    def compress_article(self, article: dict, codec: Optional[BodyCodec] = None) -> Optional[dict]:
+        """
+        Build the compressed form of a raw article.
+
+        Args:
+            article (dict): raw article with text and optionally summary,
+                only the fields present are compressed.
+            codec (BodyCodec, optional): defaults to the active codec.
+
+        Returns:
+            Optional[dict]: compressed sub document, None when the body is
+                already compressed or shorter than min_length.
+        """
+        codec = codec or self.active
+        if article.get("compressed") or codec is None:
+            return None
+        body = {field: article[field] or "" for field in BODY_FIELDS if field in article}
+        if len(body.get("text", "").encode()) < self.min_length:
+            return None
+        return {
+            "codec": codec.codec,
+            "dict_id": codec.dict_id,
+            **{field: codec.compress(value) for field, value in body.items()},
+        }
+
+    def compress_news(self, news: GoogleNews) -> GoogleNews:
+        """
+        Copy of a GoogleNews document with its body compressed, for inserts.
+
+        The in memory document keeps the plain text so responses built from
+        it do not need to decompress.
+
+        Args:
+            news (GoogleNews): GoogleNews document.
+
+        Returns:
+            GoogleNews: compressed copy, or the document itself when disabled.
+        """
+        if not self.enabled:
+            return news
+        compressed = self.compress_article(news.article.dict())
+        if compressed is None:
+            return news
+        article = news.article.copy(update={"text": "", "summary": "", "compressed": CompressedBody(**compressed)})
+        return news.copy(update={"article": article})
+
+    def expand(self, article: dict) -> dict:
+        """
+        Decompress the body of a raw article, plain articles are returned as is.
+
+        Args:
+            article (dict): raw article.
+
+        Raises:
+            KeyError: the codec of the document was not loaded by prepare().
+
+        Returns:
+            dict: article with text and summary.
+        """
+        compressed = article.get("compressed")
+        if not compressed:
+            return article
+        codec = self.codecs[(compressed["codec"], compressed.get("dict_id"))]
+        article = {key: value for key, value in article.items() if key != "compressed"}
+        for field in BODY_FIELDS:
+            if compressed.get(field) is not None:
+                article[field] = codec.decompress(compressed[field])
+        return article
+
+
+bodies = BodyCompression()
@@ -0,0 +1,161 @@
+"""Prometheus metrics utils (multiprocess safe for gunicorn workers)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import os
+import time
+from contextlib import contextmanager
+
+# multiprocess mode must be selected before prometheus_client is imported,
+# every worker writes its samples to mmap files in this directory
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(ROOT / "tmp/prometheus"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_LATENCY = Histogram(
+    "pilpres_stage_seconds",
+    "Latency of each fetch pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_FAILURES = Counter(
+    "pilpres_stage_failures_total",
+    "Failures of each fetch pipeline stage by exception type",
+    ["stage", "exception"],
+)
+FETCH_QUEUE = Gauge(
+    "pilpres_fetch_queue_depth",
+    "Articles found by search and waiting to be processed",
+    multiprocess_mode="livesum",
+)
+HTTP_LATENCY = Histogram(
+    "pilpres_http_request_seconds",
+    "Latency of each route",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "pilpres_http_requests_in_progress",
+    "Requests being handled for each route",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "pilpres_cache_requests_total",
+    "Cache lookups by cache and result (hit, miss)",
+    ["cache", "result"],
+)
+BREAKER_REJECTIONS = Counter(
+    "pilpres_breaker_rejections_total",
+    "Downloads skipped because the circuit breaker of the domain is open",
+    ["domain"],
+)
+HEDGED_DOWNLOADS = Counter(
+    "pilpres_hedged_downloads_total",
+    "Second download attempts started for downloads slower than the domain latency percentile",
+    ["domain"],
+)
+
+MONGO_LATENCY = Histogram(
+    "pilpres_mongo_command_seconds",
+    "Latency of mongo commands",
+    ["command", "collection"],
+    buckets=STAGE_BUCKETS,
+)
+MONGO_DOCUMENTS = Counter(
+    "pilpres_mongo_documents_returned_total",
+    "Documents returned by mongo commands",
+    ["command", "collection"],
+)
+MONGO_BYTES = Counter(
+    "pilpres_mongo_reply_bytes_total",
+    "Reply bytes of mongo commands",
+    ["command", "collection"],
+)
+MONGO_FAILURES = Counter(
+    "pilpres_mongo_command_failures_total",
+    "Failed mongo commands",
+    ["command", "collection"],
+)
+MONGO_SCANS = Counter(
+    "pilpres_mongo_collection_scans_total",
+    "Queries that most likely scan the whole collection",
+    ["collection"],
+)
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Observe the latency of a pipeline stage and count its failures.
+
+    Args:
+        stage (str): stage name, e.g. search, download, parse, nlp, classify, store.
+
+    Examples:
+        >>> with metrics.timed("download"):
+        ...     article.download()
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        STAGE_FAILURES.labels(stage=stage, exception=type(e).__name__).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    """Count a cache lookup as hit or miss."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def reset() -> None:
+    """
+    Clear samples of previous runs from the multiprocess directory.
+
+    Called once in the parent process before the workers start. Files of the
+    current process are kept, its metrics were created at import and still
+    write to them.
+    """
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    suffix = f"_{os.getpid()}.db"
+    for name in os.listdir(path):
+        if not name.endswith(suffix):
+            os.remove(os.path.join(path, name))
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited process (gunicorn child_exit hook, uvicorn shutdown)."""
+    multiprocess.mark_process_dead(pid)
+
+
+def render() -> tuple:
+    """
+    Render metrics of every worker in Prometheus text format.
+
+    Returns:
+        tuple: (payload bytes, content type)
+    """
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
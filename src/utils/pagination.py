@@ -0,0 +1,105 @@
+"""Keyset (search-after) pagination on (published_date, _id), newest first."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import base64
+import binascii
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+import src.utils.exceptions as exceptions
+
+# sort order of the list, matches the compound index of GoogleNews
+NEWS_SORT = [("published_date", DESCENDING), ("_id", DESCENDING)]
+
+
+def encode_cursor(doc: dict) -> str:
+    """
+    Encode the sort key of the last document of a page as an opaque cursor.
+
+    Args:
+        doc (dict): raw motor document with published_date and _id.
+
+    Returns:
+        str: url safe cursor.
+    """
+    published_date = doc.get("published_date")
+    key = [published_date.isoformat() if published_date else None, str(doc["_id"])]
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Args:
+        cursor (str): url safe cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+
+    Returns:
+        Tuple[Optional[datetime], ObjectId]: published_date and _id of the last document.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_date, news_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        published_date = datetime.fromisoformat(published_date) if published_date else None
+        return published_date, ObjectId(news_id)
+    except (binascii.Error, orjson.JSONDecodeError, InvalidId, TypeError, ValueError):
+        raise exceptions.BadRequest(f"Invalid cursor: {cursor}")
+
+
+def after_filter(cursor: str) -> dict:
+    """
+    Build the filter of documents sorted after a cursor in NEWS_SORT order.
+
+    Documents without published_date sort last (null is the lowest value).
+
+    Args:
+        cursor (str): url safe cursor.
+
+    Returns:
+        dict: mongo filter.
+    """
+    published_date, news_id = decode_cursor(cursor)
+    if published_date is None:
+        return {"published_date": None, "_id": {"$lt": news_id}}
+    return {
+        "$or": [
+            {"published_date": {"$lt": published_date}},
+            {"published_date": published_date, "_id": {"$lt": news_id}},
+            {"published_date": None},
+        ]
+    }
+
+
+def date_filter(start_date: Optional[date], end_date: Optional[date]) -> dict:
+    """
+    Build a published_date filter for an inclusive date range.
+
+    Args:
+        start_date (date, optional): first day.
+        end_date (date, optional): last day.
+
+    Returns:
+        dict: mongo filter, empty without dates.
+    """
+    published_date = {}
+    if start_date:
+        published_date["$gte"] = datetime.combine(start_date, time.min)
+    if end_date:
+        published_date["$lt"] = datetime.combine(end_date + timedelta(days=1), time.min)
+    return {"published_date": published_date} if published_date else {}
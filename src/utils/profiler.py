@@ -0,0 +1,172 @@
+"""On-demand profiler utils (sampling and cProfile)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+import asyncio
+import cProfile
+import marshal
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+import src.utils.timer as t
+from src.utils.logger import get_logger
+
+log = get_logger()
+
+
+class SamplingProfiler:
+    """
+    Low overhead sampling profiler.
+
+    A background thread snapshots the stack of every other thread at a fixed
+    interval and counts identical stacks, rendered as flamegraph collapsed
+    stacks ("frame;frame;frame count").
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """
+        Initialize sampling profiler.
+
+        Args:
+            interval (float, optional): seconds between samples. Defaults to 0.005.
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {th.ident: th.name for th in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def result(self) -> bytes:
+        """Render collapsed stacks, one "stack count" per line."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()).encode()
+
+
+class CProfiler:
+    """Deterministic cProfile of the thread that starts it (the event loop)."""
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def result(self) -> bytes:
+        """Render a pstats compatible dump (same format as Profile.dump_stats)."""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+class ProfilerSession:
+    """
+    Single profiler session of this worker process.
+
+    Must be driven from the event loop thread: cProfile only profiles the
+    thread that enables it, so the automatic stop is scheduled on the loop.
+    """
+
+    MODES = {"sampling": "collapsed", "cprofile": "prof"}
+
+    def __init__(self) -> None:
+        self.profiler = None
+        self.mode: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.seconds: float = 0.0
+        self.data: Optional[bytes] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    def start(self, mode: str, seconds: float, interval: float) -> None:
+        """
+        Start profiling for a number of seconds.
+
+        Args:
+            mode (str): sampling or cprofile.
+            seconds (float): stop automatically after this many seconds.
+            interval (float): sampling interval (sampling mode only).
+
+        Raises:
+            ValueError: if a session is running or mode is unknown.
+        """
+        if self.running:
+            raise ValueError("Profiler is already running")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}, choose from {list(self.MODES)}")
+        self.profiler = SamplingProfiler(interval) if mode == "sampling" else CProfiler()
+        self.mode = mode
+        self.seconds = seconds
+        self.started_at = t.now()
+        self.data = None
+        self.profiler.start()
+        self._timer = asyncio.get_running_loop().call_later(seconds, self.stop)
+        log.log(25, f"Profiler started: {mode} for {seconds}s on pid {os.getpid()}")
+
+    def stop(self) -> None:
+        """Stop the running session and keep its result."""
+        if not self.running:
+            return
+        self._timer.cancel()
+        self._timer = None
+        self.profiler.stop()
+        self.data = self.profiler.result()
+        log.log(25, f"Profiler stopped: {self.mode} on pid {os.getpid()}")
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "running": self.running,
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "samples": getattr(self.profiler, "samples", None),
+            "result_bytes": len(self.data) if self.data is not None else 0,
+        }
+
+    def filename(self) -> str:
+        return f"profile-{os.getpid()}.{self.MODES[self.mode]}"
+
+
+session = ProfilerSession()
@@ -0,0 +1,105 @@
+"""Fast JSON serialization of news documents (raw motor documents to bytes)."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+
+import src.utils.compression as compression
+from src.schema.database.article_schema import Sentiment
+
+# precomputed field mappings, same shape as NewsResult (id serialized as _id)
+NEWS_FIELDS = ("title", "description", "published_date", "url", "publisher")
+ARTICLE_FIELDS = ("title", "text", "summary", "publish_date", "keywords", "sentiment")
+ARTICLE_DEFAULTS = {"publish_date": None, "keywords": None, "sentiment": Sentiment.unknown.value}
+
+# mongo projection of the fields in the response
+NEWS_PROJECTION = {field: 1 for field in NEWS_FIELDS}
+NEWS_PROJECTION.update({f"article.{field}": 1 for field in ARTICLE_FIELDS})
+NEWS_PROJECTION["article.compressed"] = 1
+NEWS_PROJECTION["article.detached"] = 1
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not support natively."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def news_result(doc: dict) -> dict:
+    """
+    Map a raw GoogleNews document to the NewsResult shape.
+
+    Compressed bodies are decompressed here, codecs (and detached bodies)
+    must be loaded with article_bodies.attach() or compression.bodies.prepare() first.
+
+    Args:
+        doc (dict): raw motor document.
+
+    Returns:
+        dict: _id, news fields and article fields.
+    """
+    article = compression.bodies.expand(doc.get("article") or {})
+    result = {"_id": str(doc["_id"])}
+    for field in NEWS_FIELDS:
+        result[field] = doc.get(field)
+    result["article"] = {
+        field: article.get(field, ARTICLE_DEFAULTS.get(field)) for field in ARTICLE_FIELDS
+    }
+    return result
+
+
+def news_result_from_model(news) -> dict:
+    """
+    Map a GoogleNews model to the NewsResult shape without validation.
+
+    Args:
+        news (GoogleNews): GoogleNews document model.
+
+    Returns:
+        dict: _id, news fields and article fields.
+    """
+    result = {"_id": str(news.id)}
+    for field in NEWS_FIELDS:
+        result[field] = getattr(news, field)
+    result["article"] = {field: getattr(news.article, field) for field in ARTICLE_FIELDS}
+    return result
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to JSON bytes (datetimes as ISO 8601, ObjectId as str)."""
+    return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def news_response(
+    result: Any, received_at: Optional[datetime] = None, status_code: int = 200, **extra
+) -> Response:
+    """
+    Build a JSON response in the shape {received_at, **extra, result}.
+
+    Args:
+        result (Any): mapped news result(s).
+        received_at (datetime, optional): defaults to now.
+        status_code (int, optional): HTTP status code. Defaults to 200.
+        **extra: other top level fields, e.g. job_id.
+
+    Returns:
+        Response: application/json response.
+    """
+    payload = {"received_at": received_at or datetime.now(), **extra, "result": result}
+    return Response(content=dumps(payload), media_type="application/json", status_code=status_code)
@@ -9,7 +9,11 @@ ROOT = pyrootutils.setup_root(
     dotenv=True,
 )
 
+import time as _time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Optional
 
 import src.utils.exceptions as exceptions
 
@@ -53,9 +57,25 @@ def today() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
+def monotonic() -> float:
+    """
+    Get a monotonic high resolution timestamp (seconds) for measuring durations.
+
+    Returns:
+        float: Monotonic timestamp, only meaningful compared to another one.
+
+    Examples:
+        >>> start = t.monotonic()
+        >>> t.elapsed(start)
+        0.42
+    """
+    return _time.perf_counter()
+
+
 def elapsed(start: datetime, end: datetime = None) -> float:
     """
-    Get elapsed time between two datetime objects.
+    Get elapsed time in milliseconds between two datetime objects,
+    or since a monotonic timestamp from t.monotonic().
 
     Args:
         start (datetime): start time
@@ -69,7 +89,12 @@ def elapsed(start: datetime, end: datetime = None) -> float:
         >>> end = start + timedelta(seconds=1)
         >>> t.elapsed(start, end)
         420.69
+        >>> t.elapsed(t.monotonic())
+        0.01
     """
+    if isinstance(start, float):
+        end = monotonic() if end is None else end
+        return round((end - start) * 1000, 2)
     if not end:
         end = datetime.now()
     if not isinstance(start, datetime):
@@ -193,6 +218,83 @@ def convert_sec_to_time(seconds: int) -> time:
     )
 
 
+class Timing:
+    """Named sub-span durations of a single request (Server-Timing)."""
+
+    def __init__(self) -> None:
+        self.start = monotonic()
+        self.spans: Dict[str, float] = {}
+        self.opened: Dict[str, float] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """Add duration (ms) to a span, repeated spans are summed."""
+        self.spans[name] = self.spans.get(name, 0.0) + duration
+
+    def begin(self, name: str) -> None:
+        """Open a span which is closed by end()."""
+        self.opened[name] = monotonic()
+
+    def end(self, name: str) -> None:
+        """Close a span opened by begin(), no-op when it is not open."""
+        start = self.opened.pop(name, None)
+        if start is not None:
+            self.add(name, (monotonic() - start) * 1000)
+
+    def total(self) -> float:
+        """Elapsed time (ms) since the request started."""
+        return (monotonic() - self.start) * 1000
+
+    def header(self) -> str:
+        """
+        Render as Server-Timing header value.
+
+        Examples:
+            >>> timing.header()
+            'auth;dur=1.20, mongo;dur=4.51, total;dur=7.03'
+        """
+        items = [f"{name};dur={duration:.2f}" for name, duration in self.spans.items()]
+        items.append(f"total;dur={self.total():.2f}")
+        return ", ".join(items)
+
+
+_timing: ContextVar[Optional[Timing]] = ContextVar("timing", default=None)
+
+
+def start_timing() -> Timing:
+    """Start collecting spans for the current request context."""
+    timing = Timing()
+    _timing.set(timing)
+    return timing
+
+
+def current_timing() -> Optional[Timing]:
+    """Get the timing of the current request, None outside a request."""
+    return _timing.get()
+
+
+@contextmanager
+def span(name: str):
+    """
+    Measure a named sub-span of the current request (no-op outside a request).
+
+    Args:
+        name (str): span name, e.g. auth, mongo, inference.
+
+    Examples:
+        >>> with t.span("mongo"):
+        ...     user = await User.find_one(User.username == username)
+    """
+    timing = _timing.get()
+    if timing is None:
+        yield
+        return
+    start = monotonic()
+    try:
+        yield
+    finally:
+        timing.add(name, (monotonic() - start) * 1000)
+
+
 if __name__ == "__main__":
     """Debugging."""
     start_datetime = datetime.now()
@@ -0,0 +1,120 @@
+"""Lightweight trace span utils for the fetch pipeline."""
+
+import pyrootutils
+
+ROOT = pyrootutils.setup_root(
+    search_from=__file__,
+    indicator=[".git"],
+    pythonpath=True,
+    dotenv=True,
+)
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+import src.utils.timer as t
+
+
+class Span:
+    """Single timed operation with attributes, error and child spans."""
+
+    __slots__ = ("name", "attributes", "children", "started_at", "start", "duration_ms", "error")
+
+    def __init__(self, name: str, attributes: Optional[dict] = None) -> None:
+        self.name = name
+        self.attributes = attributes or {}
+        self.children = []
+        self.started_at = datetime.utcnow()
+        self.start = t.monotonic()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[dict] = None
+
+    def finish(self) -> None:
+        self.duration_ms = t.elapsed(self.start)
+
+    def set(self, **attributes) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def record_error(self, e: BaseException) -> None:
+        self.error = {"type": type(e).__name__, "message": str(e)[:500]}
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost active span, None outside a trace."""
+    return _current.get()
+
+
+@contextmanager
+def trace(name: str, **attributes):
+    """
+    Start a new trace (root span) for the current context.
+
+    Args:
+        name (str): root span name, e.g. fetch.
+        **attributes: root span attributes.
+
+    Examples:
+        >>> with tracing.trace("fetch", query="anies") as root:
+        ...     with tracing.span("search", day="2024-01-01"):
+        ...         ...
+        >>> root.to_dict()
+    """
+    root = Span(name, attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.record_error(e)
+        raise
+    finally:
+        root.finish()
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Record a child span of the current span (no-op outside a trace).
+
+    Args:
+        name (str): span name, e.g. search, article, download, inference, write.
+        **attributes: span attributes.
+
+    Yields:
+        Span: the child span, or a detached span (not recorded) outside a trace.
+
+    Examples:
+        >>> with tracing.span("resolve") as resolve_span:  # no trace, e.g. a queue worker
+        ...     resolve_span.set(resolved=0)
+    """
+    parent = _current.get()
+    if parent is None:
+        yield Span(name, attributes)
+        return
+    child = Span(name, attributes)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_error(e)
+        raise
+    finally:
+        child.finish()
+        _current.reset(token)